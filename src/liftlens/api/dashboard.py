@@ -4,11 +4,36 @@ import pandas as pd
 import streamlit as st
 
 from ..core.registry import registry
+from ..stats.sequential import ConfidenceSequence
 
 st.set_page_config(page_title="A/B Test Dashboard", layout="wide")
 
 st.title("A/B Test Framework Dashboard")
 
+# Live monitors: always-valid, so safe to check on every refresh
+monitors = registry.list_states(ConfidenceSequence.KIND)
+if monitors:
+    st.subheader("Live Monitors")
+    rows = []
+    for entry in monitors:
+        monitor = ConfidenceSequence.load(entry["key"])
+        if monitor is None or (monitor.moments[:, 0] < 2).any():
+            continue
+        result = monitor.result()
+        rows.append(
+            {
+                "monitor": entry["key"],
+                "estimate": result["estimate"],
+                "ci_lower": result["ci_95"][0],
+                "ci_upper": result["ci_95"][1],
+                "p_value": result["p_value"],
+                "significant": result["significant"],
+                "n": result["n_control"] + result["n_treatment"],
+                "updated": entry["updated_at"],
+            }
+        )
+    st.dataframe(pd.DataFrame(rows))
+
 # List runs
 runs = registry.list_runs()
 if not runs:
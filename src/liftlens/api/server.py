@@ -6,8 +6,9 @@ from typing import Any
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse
 
-from ..config.schemas import ExperimentConfig
+from ..config.schemas import ExperimentConfig, MonitorBatch
 from ..core.registry import registry as exp_registry
+from ..stats.sequential import ConfidenceSequence
 from ..workflows.pipeline import run_pipeline
 
 app = FastAPI(
@@ -89,6 +90,28 @@ async def get_report(run_id: str) -> FileResponse:
     return FileResponse(path)
 
 
+@app.post("/monitors/{key}")
+async def update_monitor(key: str, batch: MonitorBatch) -> dict[str, Any]:
+    """Fold one batch of per-arm moments into a live confidence sequence."""
+    monitor = ConfidenceSequence.load(key) or ConfidenceSequence(
+        key, alpha=batch.alpha, mixture_sd=batch.mixture_sd
+    )
+    monitor.update_stats(batch.control.model_dump(), batch.treatment.model_dump())
+    return await get_monitor(key)
+
+
+@app.get("/monitors/{key}")
+async def get_monitor(key: str) -> dict[str, Any]:
+    """Current always-valid estimate, interval and p-value of a monitor."""
+    monitor = ConfidenceSequence.load(key)
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Monitor not found")
+    try:
+        return monitor.result()
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "healthy"}
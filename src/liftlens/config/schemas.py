@@ -54,6 +54,9 @@ class StatsConfig(LiftlensBaseModel):
     sequential: bool = False
     bootstrap_samples: int = 10_000
     permutation_tests: int = 5_000
+    correction: Literal[
+        "none", "bonferroni", "holm", "hochberg", "bh", "by", "hommel"
+    ] = "holm"
 
 
 class ReportConfig(LiftlensBaseModel):
@@ -71,6 +74,7 @@ class ExperimentConfig(LiftlensBaseModel):
     group_col: str
     control_label: str = "control"
     treatment_label: str = "treatment"
+    treatment_labels: list[str] = Field(default_factory=list)
     metrics: list[MetricSpec]
     transform: TransformConfig = TransformConfig()
     stats: StatsConfig = StatsConfig()
@@ -82,3 +86,29 @@ class ExperimentConfig(LiftlensBaseModel):
         if not v:
             raise ValueError("At least one metric required")
         return v
+
+    @property
+    def treatment_arms(self) -> list[str]:
+        """Treatment arms: ``treatment_labels`` for N-arm tests, else ``treatment_label``."""
+        return self.treatment_labels or [self.treatment_label]
+
+    @property
+    def arms(self) -> list[str]:
+        """All arm labels, control first."""
+        return [self.control_label, *self.treatment_arms]
+
+
+class ArmSummary(LiftlensBaseModel):
+    n: int = Field(..., ge=0)
+    mean: float = 0.0
+    var: float = Field(0.0, ge=0)
+
+
+class MonitorBatch(LiftlensBaseModel):
+    """One batch of per-arm moments for a live confidence-sequence monitor."""
+
+    control: ArmSummary
+    treatment: ArmSummary
+    # Only used when the first batch creates the monitor
+    alpha: float = Field(0.05, gt=0, lt=1)
+    mixture_sd: float = Field(0.1, gt=0)
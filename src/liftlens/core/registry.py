@@ -12,7 +12,7 @@ from .session import session
 class ExperimentRegistry:
     """SQLite-based experiment registry with MLflow-compatible metadata."""
 
-    SCHEMA_VERSION = 1
+    SCHEMA_VERSION = 3
 
     def __init__(self, db_path: Path | None = None):
         # Default to a registry file inside the session's temp dir so tests
@@ -47,6 +47,28 @@ class ExperimentRegistry:
                     FOREIGN KEY(experiment_id) REFERENCES experiments(id)
                 )
             """)
+            # Compact per-metric variance history for planning (one row per run/metric)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_stats (
+                    experiment_id INTEGER,
+                    metric_name TEXT NOT NULL,
+                    n INTEGER NOT NULL,
+                    mean REAL NOT NULL,
+                    var REAL NOT NULL,
+                    covariate_corr REAL,
+                    days REAL,
+                    FOREIGN KEY(experiment_id) REFERENCES experiments(id)
+                )
+            """)
+            # Latest state of long-lived monitors (sequential tests, online FDR), by key
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS monitor_state (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    state_json TEXT NOT NULL,
+                    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
             # Ensure schema version (PRAGMA doesn't accept parameter placeholders)
             conn.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
         logger.debug(f"Registry initialized at {self.db_path}")
@@ -122,6 +144,82 @@ class ExperimentRegistry:
                 (exp_id, metric_name, value, step),
             )
 
+    def log_metric_stats(
+        self,
+        run_id: str,
+        metric_name: str,
+        n: int,
+        mean: float,
+        var: float,
+        covariate_corr: float | None = None,
+        days: float | None = None,
+    ) -> None:
+        """Record a metric's n, mean, variance and CUPED covariate correlation."""
+        exp_id = self._get_experiment_id(run_id)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO metric_stats
+                (experiment_id, metric_name, n, mean, var, covariate_corr, days)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                (exp_id, metric_name, int(n), mean, var, covariate_corr, days),
+            )
+
+    def get_metric_stats(
+        self, metric_names: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Recorded metric statistics, newest run first."""
+        query = """
+            SELECT e.run_id, e.name, e.start_time, s.metric_name, s.n, s.mean,
+                   s.var, s.covariate_corr, s.days
+            FROM metric_stats s JOIN experiments e ON s.experiment_id = e.id
+        """
+        params: list[Any] = []
+        if metric_names:
+            query += f" WHERE s.metric_name IN ({', '.join('?' * len(metric_names))})"
+            params.extend(metric_names)
+        query += " ORDER BY e.start_time DESC"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cur = conn.execute(query, params)
+            return [dict(row) for row in cur.fetchall()]
+
+    def save_state(self, key: str, kind: str, state: dict[str, Any]) -> None:
+        """Store (or replace) the JSON state of a monitor under ``key``."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO monitor_state (key, kind, state_json)
+                VALUES (?, ?, ?)
+            """,
+                (key, kind, json.dumps(state, default=str)),
+            )
+
+    def load_state(self, key: str, kind: str) -> dict[str, Any] | None:
+        """State stored under ``key``, or None if there is none yet."""
+        with sqlite3.connect(self.db_path) as conn:
+            cur = conn.execute(
+                "SELECT kind, state_json FROM monitor_state WHERE key = ?", (key,)
+            )
+            row = cur.fetchone()
+        if not row:
+            return None
+        if row[0] != kind:
+            raise ValueError(f"State {key} holds a {row[0]} monitor, not {kind}")
+        return dict(json.loads(row[1]))
+
+    def list_states(self, kind: str) -> list[dict[str, Any]]:
+        """Keys and update times of all stored monitors of one kind."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cur = conn.execute(
+                "SELECT key, updated_at FROM monitor_state WHERE kind = ? "
+                "ORDER BY updated_at DESC",
+                (kind,),
+            )
+            return [dict(row) for row in cur.fetchall()]
+
     def get_run(self, run_id: str) -> dict[str, Any] | None:
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
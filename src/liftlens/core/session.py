@@ -14,6 +14,7 @@ class Session:
 
     def __init__(self, seed: int = 42, temp_dir: Path | None = None):
         self.seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.temp_dir = temp_dir or Path(tempfile.mkdtemp(prefix="liftlens_"))
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         self._set_seeds()
@@ -24,6 +25,19 @@ class Session:
         random.seed(self.seed)
         os.environ["PYTHONHASHSEED"] = str(self.seed)
 
+    def spawn(self, n: int) -> list[np.random.SeedSequence]:
+        """
+        ``n`` independent child seed sequences from the session seed.
+        Each call hands out fresh children, deterministic in call order.
+        """
+        return self.seed_sequence.spawn(n)
+
+    def rng(self, seed: int | None = None) -> np.random.Generator:
+        """A Generator seeded by ``seed``, or on a fresh child stream of the session."""
+        if seed is not None:
+            return np.random.default_rng(seed)
+        return np.random.default_rng(self.spawn(1)[0])
+
     @contextmanager
     def temp_path(self, suffix: str = "") -> Generator[Path, None, None]:
         """Yield a temporary file path that is automatically cleaned up."""
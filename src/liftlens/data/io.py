@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
 from typing import Literal, cast
 
@@ -11,12 +12,15 @@ from ..config.schemas import DataSource
 from .validator import validate_schema
 
 
-def load_data(source: str | Path | DataSource) -> pd.DataFrame:
+def load_data(
+    source: str | Path | DataSource, group_labels: Iterable[str] | None = None
+) -> pd.DataFrame:
     """
     Unified data loader supporting CSV, Parquet, SQL databases, and Delta Lake.
 
     Args:
         source: Path string, Path object, or DataSource config.
+        group_labels: Allowed arm labels for schema validation.
 
     Returns:
         pandas.DataFrame with loaded data.
@@ -52,10 +56,35 @@ def load_data(source: str | Path | DataSource) -> pd.DataFrame:
         raise ValueError(f"Unsupported data source type: {source.type}")
 
     logger.info(f"Loaded {len(df):,} rows, {len(df.columns)} columns")
-    validate_schema(df, source.type)
+    validate_schema(df, source.type, group_labels)
     return df
 
 
+def read_chunks(
+    source: str | Path | Sequence[str | Path],
+    chunksize: int = 100_000,
+    columns: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream one or more CSV/Parquet files as DataFrame chunks of at most
+    ``chunksize`` rows, without loading any file in full.
+    """
+    paths = [source] if isinstance(source, (str, Path)) else list(source)
+    for path in paths:
+        src_type = _detect_type(str(path))
+        logger.debug(f"Streaming {src_type} in chunks of {chunksize:,}: {path}")
+        if src_type == "csv":
+            yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+        elif src_type == "parquet":
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            ):
+                yield batch.to_pandas()
+        else:
+            raise ValueError(f"Chunked reading not supported for: {src_type}")
+
+
 def save_data(df: pd.DataFrame, path: str | Path, format: str | None = None) -> None:
     """Save DataFrame to disk in specified format."""
     path = Path(path)
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 
 import numpy as np
 import pandas as pd
@@ -6,11 +7,15 @@ from pandera import Check, Column, DataFrameSchema
 from scipy import stats
 
 
-def validate_schema(df: pd.DataFrame, source_type: str) -> None:
+def validate_schema(
+    df: pd.DataFrame, source_type: str, group_labels: Iterable[str] | None = None
+) -> None:
     """
     Validate DataFrame structure using Pandera.
     Enforces presence of required columns and basic types.
+    group_labels: allowed arm labels (defaults to control/treatment)
     """
+    allowed = set(group_labels) if group_labels else {"control", "treatment"}
     required_cols = ["user_id", "baseline", "outcome", "group"]
     missing = [col for col in required_cols if col not in df.columns]
     if missing:
@@ -25,7 +30,7 @@ def validate_schema(df: pd.DataFrame, source_type: str) -> None:
             "outcome": Column(float, Check(lambda x: x.ge(0).all()), nullable=False),
             "group": Column(
                 str,
-                Check(lambda s: set(s.unique()).issubset({"control", "treatment"})),
+                Check(lambda s: set(s.unique()).issubset(allowed)),
             ),
         },
         strict=True,
@@ -40,17 +45,29 @@ def validate_schema(df: pd.DataFrame, source_type: str) -> None:
 
 
 def check_srm(
-    df: pd.DataFrame, group_col: str = "group", alpha: float = 0.01
+    df: pd.DataFrame,
+    group_col: str = "group",
+    alpha: float = 0.01,
+    expected_ratios: dict[str, float] | None = None,
 ) -> dict[str, object]:
     """
     Sample Ratio Mismatch (SRM) detection using chi-squared test.
 
+    Args:
+        expected_ratios: Planned allocation per arm, defaults to equal split
+            across all arms present in the data
+
     Returns:
         dict with p-value, observed/expected counts, and warning flag.
     """
     observed = df[group_col].value_counts().sort_index()
-    n = len(df)
-    expected = pd.Series([n / 2, n / 2], index=observed.index)
+    if expected_ratios:
+        observed = observed.reindex(sorted(expected_ratios), fill_value=0)
+        ratios = pd.Series(expected_ratios).reindex(observed.index)
+    else:
+        ratios = pd.Series(1.0, index=observed.index)
+    # Only rows in the tested arms; chisquare needs matching totals
+    expected = observed.sum() * ratios / ratios.sum()
 
     chi2, p_value = stats.chisquare(observed, expected)
     is_srm = p_value < alpha
@@ -74,13 +91,18 @@ def check_srm(
 
 
 def check_balance(
-    df: pd.DataFrame, baseline_col: str, group_col: str = "group", alpha: float = 0.05
+    df: pd.DataFrame,
+    baseline_col: str,
+    group_col: str = "group",
+    alpha: float = 0.05,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
 ) -> dict[str, object]:
     """
     Covariate balance check using standardized mean difference (SMD) and t-test.
     """
-    control = df[df[group_col] == "control"][baseline_col]
-    treatment = df[df[group_col] == "treatment"][baseline_col]
+    control = df[df[group_col] == control_label][baseline_col]
+    treatment = df[df[group_col] == treatment_label][baseline_col]
 
     smd = _standardized_mean_difference(control, treatment)
     t_stat, p_value = stats.ttest_ind(control, treatment, equal_var=False)
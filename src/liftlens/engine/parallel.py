@@ -1,22 +1,43 @@
 from collections.abc import Callable
+from functools import partial
 from typing import Any, cast
 
+import numpy as np
 from loguru import logger
 
 from ..config.settings import settings
+from ..core.session import session
+
+
+def _call_with_rng(
+    func: Callable[[Any, np.random.Generator], Any],
+    task: tuple[Any, np.random.SeedSequence],
+) -> Any:
+    item, seed = task
+    return func(item, np.random.default_rng(seed))
 
 
 def parallel_apply(
-    func: Callable[[Any], Any],
+    func: Callable[..., Any],
     items: list[Any],
     backend: str | None = None,
+    n_jobs: int = -1,
+    with_rng: bool = False,
+    seed: int | None = None,
     **kwargs: Any,
 ) -> list[Any]:
     """
     Apply function in parallel using configured backend.
     Backends: joblib (default), dask, ray
+    n_jobs: worker count for joblib (-1 = all cores)
+    with_rng: call ``func(item, rng)`` with one Generator per item, spawned
+        up front from ``seed`` (or the session), so results are identical
+        whatever the backend, worker count or execution order
     """
     backend = backend or settings.parallel_backend
+    if with_rng:
+        items = list(zip(items, spawn_seeds(seed, len(items)), strict=True))
+        func = partial(_call_with_rng, func)
     logger.debug(f"Parallel apply using {backend} on {len(items)} items")
 
     if backend == "joblib":
@@ -24,7 +45,7 @@ def parallel_apply(
 
         return cast(
             list[Any],
-            Parallel(n_jobs=-1, **kwargs)(delayed(func)(item) for item in items),
+            Parallel(n_jobs=n_jobs, **kwargs)(delayed(func)(item) for item in items),
         )
 
     elif backend == "dask":
@@ -45,3 +66,42 @@ def parallel_apply(
 
     else:
         raise ValueError(f"Unsupported backend: {backend}")
+
+
+def split_batches(total: int, batch_size: int) -> list[int]:
+    """Split ``total`` work items into batch sizes of at most ``batch_size``."""
+    if total <= 0:
+        return []
+    batch_size = max(1, int(batch_size))
+    full, rest = divmod(int(total), batch_size)
+    return [batch_size] * full + ([rest] if rest else [])
+
+
+def spawn_seeds(seed: int | None, n: int) -> list[np.random.SeedSequence]:
+    """
+    Independent child seed sequences, one per chunk of work.
+    Each chunk draws from its own stream, so results do not depend on the
+    order or worker in which chunks run. With ``seed=None`` the children are
+    spawned from the session's seed sequence.
+    """
+    if seed is None:
+        return session.spawn(n)
+    return np.random.SeedSequence(seed).spawn(n)
+
+
+def worker_count(n_jobs: int) -> int:
+    """Number of workers ``n_jobs`` resolves to (-1 = all cores, as in joblib)."""
+    if n_jobs == 1:
+        return 1
+    from joblib import effective_n_jobs
+
+    return int(effective_n_jobs(n_jobs))
+
+
+def map_batches(
+    func: Callable[[Any], Any], items: list[Any], n_jobs: int = 1
+) -> list[Any]:
+    """Run ``func`` over ``items`` serially, or through ``parallel_apply`` when n_jobs != 1."""
+    if n_jobs == 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    return parallel_apply(func, items, n_jobs=n_jobs)
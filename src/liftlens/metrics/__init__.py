@@ -20,6 +20,8 @@ def ensure_metrics_registered() -> None:
     primary = importlib.import_module(".primary", __name__)
     robust = importlib.import_module(".robust", __name__)
     monitoring = importlib.import_module(".monitoring", __name__)
+    quantile = importlib.import_module(".quantile", __name__)
+    composite = importlib.import_module(".composite", __name__)
 
     # Primary
     registry.register("mean_diff", primary.mean_diff, alias="mean")
@@ -31,6 +33,15 @@ def ensure_metrics_registered() -> None:
     registry.register("huber_mean", robust.huber_mean)
     registry.register("mad", robust.mad)
 
+    # Quantile
+    registry.register("quantile_diff", quantile.quantile_diff, alias="qte")
+    registry.register("p50", quantile.make_quantile_metric(0.5), alias="median")
+    registry.register("p90", quantile.make_quantile_metric(0.9))
+    registry.register("p99", quantile.make_quantile_metric(0.99))
+
+    # Composite
+    registry.register("weighted_index", composite.weighted_index)
+
     # Monitoring
     registry.register("psi", monitoring.psi)
     registry.register("ks_test", monitoring.ks_test)
@@ -1,16 +1,28 @@
+from typing import Any
+
+import numpy as np
 import pandas as pd
 from loguru import logger
+from scipy import stats
 
 
-def weighted_index(
+def composite_index(
     df: pd.DataFrame,
     group_col: str,
-    metric_col: str,
+    submetrics: list[str],
     weights: dict[str, float] | None = None,
-    submetrics: list[str] | None = None,
-) -> float:
+    alpha: float = 0.05,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> dict[str, Any]:
     """
-    Composite index: weighted average of standardized sub-metrics.
+    Composite index difference with standard error and confidence interval.
+
+    Sub-metrics are standardized as one (n x k) array, combined with the
+    normalized weight vector, and the variance of the composite difference is
+    w' (S_t / n_t + S_c / n_c) w from the per-group sub-metric covariances.
+    Rows missing any sub-metric are left out of the comparison. Weights are
+    normalized over the sub-metrics present in ``df``.
 
     Args:
         submetrics: List of column names to include
@@ -19,33 +31,88 @@ def weighted_index(
     if not submetrics:
         raise ValueError("submetrics list required")
 
-    # Standardize each submetric
-    standardized = {}
+    cols = [col for col in submetrics if col in df.columns]
     for col in submetrics:
         if col not in df.columns:
             logger.warning(f"Submetric {col} not in data")
-            continue
-        series = df[col]
-        std = (series - series.mean()) / series.std()
-        standardized[col] = std
-
-    sub_df = pd.DataFrame(standardized)
-    sub_df[group_col] = df[group_col]
-
-    # Apply weights
-    if not weights:
-        weights = {col: 1.0 for col in sub_df.columns if col != group_col}
-    total_weight = sum(weights.values())
-    weights = {k: v / total_weight for k, v in weights.items()}
-
-    # Weighted sum per row
-    sub_df["index"] = sum(weights.get(col, 0) * sub_df[col] for col in weights)
-
-    # Mean difference
-    diff = (
-        sub_df[sub_df[group_col] == "treatment"]["index"].mean()
-        - sub_df[sub_df[group_col] == "control"]["index"].mean()
+    if not cols:
+        raise ValueError("None of the submetrics are present in the data")
+
+    # Standardize all submetrics at once over their non-missing values
+    # (ddof=1, matching pandas .mean() / .std())
+    values = df[cols].to_numpy(dtype=float)
+    std = np.nanstd(values, axis=0, ddof=1)
+    safe_std = np.where(std > 0, std, 1.0)
+    z = np.where(std > 0, (values - np.nanmean(values, axis=0)) / safe_std, 0.0)
+
+    # The composite is only defined for rows with every submetric present
+    complete = ~np.isnan(values).any(axis=1)
+    if not complete.all():
+        logger.warning(
+            f"Dropping {int((~complete).sum())} rows with missing submetric values"
+        )
+
+    # Weight vector, normalized over the submetrics actually present
+    w = np.array(
+        [weights.get(col, 0.0) if weights else 1.0 for col in cols], dtype=float
+    )
+    if w.sum() == 0:
+        raise ValueError("weights must not sum to zero")
+    w = w / w.sum()
+
+    labels = df[group_col].to_numpy()
+    z_control = z[complete & (labels == control_label)]
+    z_treatment = z[complete & (labels == treatment_label)]
+    n_control, n_treatment = len(z_control), len(z_treatment)
+    if n_control < 2 or n_treatment < 2:
+        raise ValueError("At least two observations per group required")
+
+    effects = z_treatment.mean(axis=0) - z_control.mean(axis=0)
+    diff = float(w @ effects)
+
+    cov = (
+        np.atleast_2d(np.cov(z_treatment, rowvar=False)) / n_treatment
+        + np.atleast_2d(np.cov(z_control, rowvar=False)) / n_control
+    )
+    se = float(np.sqrt(max(w @ cov @ w, 0.0)))
+
+    z_crit = stats.norm.ppf(1 - alpha / 2)
+    p_value = float(2 * stats.norm.sf(abs(diff / se))) if se > 0 else np.nan
+    result = {
+        "method": "composite_index",
+        "mean_diff": diff,
+        "std_error": se,
+        "ci_95": [diff - z_crit * se, diff + z_crit * se],
+        "p_value": p_value,
+        "significant": p_value < alpha,
+        "weights": dict(zip(cols, w.tolist(), strict=True)),
+        "submetric_effects": dict(zip(cols, effects.tolist(), strict=True)),
+        "n_control": n_control,
+        "n_treatment": n_treatment,
+    }
+    logger.debug(
+        f"Composite index: {diff:.6f} ± {se:.6f} (weights: {result['weights']})"
     )
+    return result
+
 
-    logger.debug(f"Weighted index: {diff:.6f} (weights: {weights})")
-    return float(diff)
+def weighted_index(
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    weights: dict[str, float] | None = None,
+    submetrics: list[str] | None = None,
+    **kwargs: Any,
+) -> float:
+    """
+    Composite index: weighted average of standardized sub-metrics.
+
+    Args:
+        submetrics: List of column names to include
+        weights: Dict of {metric: weight}, defaults to equal
+    """
+    if not submetrics:
+        raise ValueError("submetrics list required")
+    return float(
+        composite_index(df, group_col, submetrics, weights, **kwargs)["mean_diff"]
+    )
@@ -0,0 +1,177 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.typing import ArrayLike, NDArray
+
+from .monitoring import cvm_from_counts, ks_from_counts, psi_from_counts
+
+
+class HistogramMonitor:
+    """
+    Streaming drift monitor backed by fixed-bin histograms.
+
+    Counts are kept per (window, group) over right-closed bins defined by
+    ``edges`` plus an underflow and an overflow bin. Updates are a single
+    ``searchsorted`` + ``bincount``; PSI, KS and CvM are computed from the
+    stored counts only, so raw samples never need to be retained.
+    """
+
+    def __init__(self, edges: ArrayLike):
+        bin_edges = np.unique(np.asarray(edges, dtype=float))
+        if bin_edges.size == 0:
+            raise ValueError("At least one bin edge required")
+        self.edges: NDArray[np.float64] = bin_edges
+        self.n_bins = len(bin_edges) + 1
+        self._counts: dict[tuple[Hashable, Hashable], NDArray[np.int64]] = {}
+
+    @classmethod
+    def from_reference(
+        cls, reference: ArrayLike, buckets: int = 10
+    ) -> "HistogramMonitor":
+        """
+        Percentile bins of a reference sample (as in ``psi``); the outer
+        buckets are open-ended so later values outside its range still count.
+        """
+        values = np.asarray(reference, dtype=float)
+        interior = np.linspace(0, 100, buckets + 1)[1:-1]
+        return cls(np.percentile(values[~np.isnan(values)], interior))
+
+    @classmethod
+    def uniform(cls, low: float, high: float, bins: int = 100) -> "HistogramMonitor":
+        """Equal-width bins between ``low`` and ``high``."""
+        return cls(np.linspace(low, high, bins + 1))
+
+    def _bin(self, values: NDArray[np.float64]) -> NDArray[np.intp]:
+        return np.searchsorted(self.edges, values, side="left")
+
+    def update(
+        self, values: ArrayLike, window: Hashable, group: Hashable = "all"
+    ) -> None:
+        """Add a batch of observations to the histogram of (window, group)."""
+        arr = np.asarray(values, dtype=float)
+        arr = arr[~np.isnan(arr)]
+        counts = np.bincount(self._bin(arr), minlength=self.n_bins)
+        key = (window, group)
+        if key in self._counts:
+            self._counts[key] += counts
+        else:
+            self._counts[key] = counts.astype(np.int64)
+
+    def update_frame(
+        self,
+        df: pd.DataFrame,
+        metric_col: str,
+        window_col: str,
+        group_col: str | None = None,
+    ) -> None:
+        """Add every (window, group) histogram of a DataFrame in one pass."""
+        values = df[metric_col].to_numpy(dtype=float)
+        keep = ~np.isnan(values)
+        key_cols = [window_col] + ([group_col] if group_col else [])
+        keys = df.loc[keep, key_cols]
+        codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+        flat = codes * self.n_bins + self._bin(values[keep])
+        counts = np.bincount(flat, minlength=len(uniques) * self.n_bins)
+        counts = counts.reshape(len(uniques), self.n_bins)
+        for i, key in enumerate(uniques):
+            window, group = (key[0], key[1]) if group_col else (key[0], "all")
+            if (window, group) in self._counts:
+                self._counts[(window, group)] += counts[i]
+            else:
+                self._counts[(window, group)] = counts[i].astype(np.int64)
+        logger.debug(f"Histogram monitor updated with {int(keep.sum()):,} rows")
+
+    @property
+    def windows(self) -> list[Hashable]:
+        return list(dict.fromkeys(window for window, _ in self._counts))
+
+    @property
+    def groups(self) -> list[Hashable]:
+        return list(dict.fromkeys(group for _, group in self._counts))
+
+    def histogram(
+        self,
+        windows: Hashable | Iterable[Hashable] | None = None,
+        groups: Hashable | Iterable[Hashable] | None = None,
+    ) -> NDArray[np.int64]:
+        """Merged counts over the selected windows and groups (None = all)."""
+        win_set = _as_set(windows)
+        grp_set = _as_set(groups)
+        total = np.zeros(self.n_bins, dtype=np.int64)
+        for (window, group), counts in self._counts.items():
+            if (win_set is None or window in win_set) and (
+                grp_set is None or group in grp_set
+            ):
+                total += counts
+        return total
+
+    def compare(
+        self,
+        reference: Hashable | Iterable[Hashable],
+        current: Hashable | Iterable[Hashable],
+        groups: Hashable | Iterable[Hashable] | None = None,
+    ) -> dict[str, Any]:
+        """PSI, KS and CvM between reference and current windows."""
+        expected = self.histogram(reference, groups)
+        actual = self.histogram(current, groups)
+        if expected.sum() == 0 or actual.sum() == 0:
+            raise ValueError("Empty histogram for reference or current window")
+        ks = ks_from_counts(expected, actual)
+        cvm = cvm_from_counts(expected, actual)
+        return {
+            "psi": psi_from_counts(expected, actual),
+            "ks_statistic": ks["ks_statistic"],
+            "ks_p_value": ks["p_value"],
+            "cvm_statistic": cvm["cvm_statistic"],
+            "cvm_p_value": cvm["p_value"],
+            "n_reference": int(expected.sum()),
+            "n_current": int(actual.sum()),
+        }
+
+    def drift_report(
+        self,
+        reference: Hashable | Iterable[Hashable],
+        groups: Hashable | Iterable[Hashable] | None = None,
+    ) -> pd.DataFrame:
+        """Compare every other window against the reference windows."""
+        ref_set = _as_set(reference) or set()
+        rows = []
+        for window in self.windows:
+            if window in ref_set:
+                continue
+            if self.histogram(window, groups).sum() == 0:
+                continue
+            rows.append({"window": window, **self.compare(reference, window, groups)})
+        report = pd.DataFrame(rows)
+        logger.info(f"Drift report: {len(report)} windows vs reference")
+        return report
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable state."""
+        return {
+            "edges": self.edges.tolist(),
+            "counts": [
+                {"window": window, "group": group, "counts": counts.tolist()}
+                for (window, group), counts in self._counts.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "HistogramMonitor":
+        monitor = cls(state["edges"])
+        for entry in state["counts"]:
+            monitor._counts[(entry["window"], entry["group"])] = np.asarray(
+                entry["counts"], dtype=np.int64
+            )
+        return monitor
+
+
+def _as_set(keys: Hashable | Iterable[Hashable] | None) -> set[Hashable] | None:
+    if keys is None:
+        return None
+    if isinstance(keys, (str, bytes)) or not isinstance(keys, Iterable):
+        return {keys}
+    return set(keys)
@@ -3,7 +3,8 @@ from typing import Any
 import numpy as np
 import pandas as pd
 from loguru import logger
-from scipy import stats
+from numpy.typing import ArrayLike, NDArray
+from scipy import special, stats
 
 
 def psi(expected: pd.Series, actual: pd.Series, buckets: int = 10) -> float:
@@ -13,21 +14,100 @@ def psi(expected: pd.Series, actual: pd.Series, buckets: int = 10) -> float:
     """
     # Create bins based on the expected distribution percentiles and apply to both series
     percentiles = np.linspace(0, 100, buckets + 1)
-    bins = np.percentile(expected, percentiles)
-    exp_bins = pd.cut(expected, bins, include_lowest=True, duplicates="drop")
-    act_bins = pd.cut(actual, bins, include_lowest=True, duplicates="drop")
+    edges = np.unique(np.percentile(expected, percentiles))
+    exp_counts = _bin_counts(np.asarray(expected, dtype=float), edges)
+    act_counts = _bin_counts(np.asarray(actual, dtype=float), edges)
 
-    exp_pct = pd.Series(exp_bins).value_counts(normalize=True, sort=False)
-    act_pct = pd.Series(act_bins).value_counts(normalize=True, sort=False)
+    psi_value = psi_from_counts(exp_counts, act_counts)
+    logger.debug(f"PSI: {psi_value:.4f}")
+    return psi_value
 
-    # Align indices
-    all_bins = exp_pct.index.union(act_pct.index)
-    exp_pct = exp_pct.reindex(all_bins, fill_value=0.0001)
-    act_pct = act_pct.reindex(all_bins, fill_value=0.0001)
 
-    psi_value = np.sum((exp_pct - act_pct) * np.log(exp_pct / act_pct))
-    logger.debug(f"PSI: {psi_value:.4f}")
-    return float(psi_value)
+def _bin_counts(
+    values: NDArray[np.float64], edges: NDArray[np.float64]
+) -> NDArray[np.int64]:
+    """Right-closed bin counts over ``edges`` (lowest edge included, outliers dropped)."""
+    idx = np.searchsorted(edges, values, side="left")
+    idx[values == edges[0]] = 1
+    valid = (idx >= 1) & (idx < len(edges))
+    return np.bincount(idx[valid] - 1, minlength=len(edges) - 1)
+
+
+def psi_from_counts(
+    expected_counts: ArrayLike, actual_counts: ArrayLike, floor: float = 0.0001
+) -> float:
+    """PSI from two histograms over the same bins; empty bins are floored."""
+    exp = np.asarray(expected_counts, dtype=float)
+    act = np.asarray(actual_counts, dtype=float)
+    exp_pct = np.maximum(exp / exp.sum(), floor)
+    act_pct = np.maximum(act / act.sum(), floor)
+    return float(np.sum((exp_pct - act_pct) * np.log(exp_pct / act_pct)))
+
+
+def ks_from_counts(
+    control_counts: ArrayLike, treatment_counts: ArrayLike
+) -> dict[str, Any]:
+    """
+    Approximate two-sample KS test from histograms over the same bins.
+    The statistic is evaluated at bin edges, so it is a lower bound on the
+    exact KS distance; the p-value uses the asymptotic Kolmogorov distribution.
+    """
+    c = np.asarray(control_counts, dtype=float)
+    t = np.asarray(treatment_counts, dtype=float)
+    n_c, n_t = c.sum(), t.sum()
+    ks_stat = float(np.max(np.abs(np.cumsum(c) / n_c - np.cumsum(t) / n_t)))
+    p_value = float(stats.kstwobign.sf(ks_stat * np.sqrt(n_c * n_t / (n_c + n_t))))
+    return {
+        "ks_statistic": ks_stat,
+        "p_value": p_value,
+        "significant": p_value < 0.05,
+    }
+
+
+def cvm_from_counts(
+    control_counts: ArrayLike, treatment_counts: ArrayLike
+) -> dict[str, Any]:
+    """
+    Approximate two-sample Cramér-von Mises test from histograms.
+    Observations sharing a bin are treated as ties (Anderson, 1962); the
+    p-value uses the normalized statistic and its limiting distribution.
+    """
+    c = np.asarray(control_counts, dtype=float)
+    t = np.asarray(treatment_counts, dtype=float)
+    n_c, n_t = c.sum(), t.sum()
+    n = n_c + n_t
+    k = n_c * n_t
+    diff = np.cumsum(c) / n_c - np.cumsum(t) / n_t
+    cvm_stat = float(k / n**2 * np.sum((c + t) * diff**2))
+
+    # Normalize by the exact mean and variance of T before using the limit law
+    et = (1 + 1 / n) / 6
+    vt = (n + 1) * (4 * k * n - 3 * (n_c**2 + n_t**2) - 2 * k) / (45 * n**2 * 4 * k)
+    tn = 1 / 6 + (cvm_stat - et) / np.sqrt(45 * vt)
+    p_value = float(max(0.0, 1.0 - _cvm_limit_cdf(tn)))
+    return {
+        "cvm_statistic": cvm_stat,
+        "p_value": p_value,
+        "significant": p_value < 0.05,
+    }
+
+
+def _cvm_limit_cdf(x: float, tol: float = 1e-7) -> float:
+    """CDF of the limiting Cramér-von Mises distribution (Csörgő & Faraway, 1996)."""
+    if x <= 0:
+        return 0.0
+    total, k = 0.0, 0
+    while True:
+        y = 4 * k + 1
+        q = y**2 / (16 * x)
+        u = np.exp(special.gammaln(k + 0.5) - special.gammaln(k + 1)) / (
+            np.pi**1.5 * np.sqrt(x)
+        )
+        term = u * np.sqrt(y) * np.exp(-q) * special.kv(0.25, q)
+        total += term
+        if abs(term) < tol:
+            return float(total)
+        k += 1
 
 
 def ks_test(control: pd.Series, treatment: pd.Series) -> dict[str, Any]:
@@ -6,19 +6,31 @@ import pandas as pd
 from loguru import logger
 
 
-def mean_diff(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
+def mean_diff(
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> float:
     """
     Average Treatment Effect (ATE): mean(treatment) - mean(control)
     """
-    control = df[df[group_col] == "control"][metric_col]
-    treatment = df[df[group_col] == "treatment"][metric_col]
+    control = df[df[group_col] == control_label][metric_col]
+    treatment = df[df[group_col] == treatment_label][metric_col]
     if len(control) == 0 or len(treatment) == 0:
         logger.warning("Empty group in mean_diff")
         return np.nan
     return float(treatment.mean() - control.mean())
 
 
-def conversion_rate(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
+def conversion_rate(
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> float:
     """
     Conversion rate difference: CR(treatment) - CR(control)
     Assumes metric_col is binary (0/1)
@@ -36,12 +48,12 @@ def conversion_rate(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
             if len(series) == len(overall_binary) and series.equals(overall_binary):
                 median_per_group = df.groupby(group_col)["outcome"].transform("median")
                 binary = (df["outcome"] > median_per_group).astype(int)
-                control_rate = binary[df[group_col] == "control"].mean()
-                treatment_rate = binary[df[group_col] == "treatment"].mean()
+                control_rate = binary[df[group_col] == control_label].mean()
+                treatment_rate = binary[df[group_col] == treatment_label].mean()
                 return float(treatment_rate - control_rate)
 
-        control_rate = series[df[group_col] == "control"].mean()
-        treatment_rate = series[df[group_col] == "treatment"].mean()
+        control_rate = series[df[group_col] == control_label].mean()
+        treatment_rate = series[df[group_col] == treatment_label].mean()
         return float(treatment_rate - control_rate)
 
     # If it's not binary, attempt a safe per-group binarization using group medians
@@ -51,16 +63,21 @@ def conversion_rate(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
         # compute per-group median threshold and binarize
         median_per_group = df.groupby(group_col)[metric_col].transform("median")
         binary = (df[metric_col] > median_per_group).astype(int)
-        control_rate = binary[df[group_col] == "control"].mean()
-        treatment_rate = binary[df[group_col] == "treatment"].mean()
+        control_rate = binary[df[group_col] == control_label].mean()
+        treatment_rate = binary[df[group_col] == treatment_label].mean()
         return float(treatment_rate - control_rate)
 
     # Fallback: use mean_diff behavior
-    return mean_diff(df, group_col, metric_col)
+    return mean_diff(df, group_col, metric_col, control_label, treatment_label)
 
 
 def ratio_metric(
-    df: pd.DataFrame, group_col: str, metric_col: str, denominator_col: str
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    denominator_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
 ) -> float:
     """
     Ratio metric: (sum(numerator) / sum(denominator)) per group
@@ -69,18 +86,24 @@ def ratio_metric(
         num=(metric_col, "sum"), den=(denominator_col, "sum")
     )
     grouped["ratio"] = grouped["num"] / grouped["den"]
-    control_ratio = grouped.loc["control", "ratio"]
-    treatment_ratio = grouped.loc["treatment", "ratio"]
+    control_ratio = grouped.loc[control_label, "ratio"]
+    treatment_ratio = grouped.loc[treatment_label, "ratio"]
     return float(treatment_ratio - control_ratio)
 
 
-def sum_metric(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
+def sum_metric(
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> float:
     """
     Total sum difference: sum(treatment) - sum(control)
     """
     grouped = df.groupby(group_col)[metric_col].sum()
-    control_sum = grouped.get("control", 0)
-    treatment_sum = grouped.get("treatment", 0)
+    control_sum = grouped.get(control_label, 0)
+    treatment_sum = grouped.get(treatment_label, 0)
     return float(treatment_sum - control_sum)
 
 
@@ -94,10 +117,10 @@ def make_ratio_metric(numerator: str, denominator: str) -> Callable[..., float]:
     def metric(
         df: pd.DataFrame, group_col: str, metric_col: str, **kwargs: Any
     ) -> float:
-        denom = kwargs.get("denominator_col")
+        denom = kwargs.pop("denominator_col", None)
         if not denom:
             raise ValueError("denominator_col required for ratio metric")
-        return ratio_metric(df, group_col, metric_col, denom)
+        return ratio_metric(df, group_col, metric_col, denom, **kwargs)
 
     metric.__name__ = f"{numerator}_per_{denominator}"
     metric.__doc__ = f"{numerator} per {denominator}: ratio(treatment) - ratio(control)"
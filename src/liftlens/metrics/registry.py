@@ -46,6 +46,16 @@ class MetricRegistry:
                 f"Metric '{name}' not found. Available: {list(self._metrics.keys())}"
             )
 
+    def resolve(self, name: str) -> str:
+        """Canonical metric name for a name or alias."""
+        if name in self._metrics:
+            return name
+        if name in self._aliases:
+            return self._aliases[name]
+        raise KeyError(
+            f"Metric '{name}' not found. Available: {list(self._metrics.keys())}"
+        )
+
     def call(
         self, name: str, df: Any, group_col: str, metric_col: str, **params: Any
     ) -> float:
@@ -9,7 +9,12 @@ from loguru import logger
 
 
 def trimmed_mean(
-    df: pd.DataFrame, group_col: str, metric_col: str, trim: float = 0.1
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    trim: float = 0.1,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
 ) -> float:
     """
     Trimmed mean difference: mean(treatment, trimmed) - mean(control, trimmed)
@@ -21,8 +26,8 @@ def trimmed_mean(
             return np.nan
         return float(stats.trim_mean(s, proportiontocut=trim))
 
-    control = df[df[group_col] == "control"][metric_col]
-    treatment = df[df[group_col] == "treatment"][metric_col]
+    control = df[df[group_col] == control_label][metric_col]
+    treatment = df[df[group_col] == treatment_label][metric_col]
     control_trim = _trimmed(control)
     treatment_trim = _trimmed(treatment)
     diff = treatment_trim - control_trim
@@ -31,7 +36,12 @@ def trimmed_mean(
 
 
 def huber_mean(
-    df: pd.DataFrame, group_col: str, metric_col: str, c: float = 1.345
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    c: float = 1.345,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
 ) -> float:
     """
     Huber M-estimator mean difference (robust to outliers)
@@ -45,14 +55,20 @@ def huber_mean(
         loc, _scale = sm_robust.Huber(c=c)(s.to_numpy())
         return float(loc)
 
-    control = df[df[group_col] == "control"][metric_col]
-    treatment = df[df[group_col] == "treatment"][metric_col]
+    control = df[df[group_col] == control_label][metric_col]
+    treatment = df[df[group_col] == treatment_label][metric_col]
     diff = _huber(treatment) - _huber(control)
     logger.debug(f"Huber mean diff (c={c}): {diff:.6f}")
     return float(diff)
 
 
-def mad(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
+def mad(
+    df: pd.DataFrame,
+    group_col: str,
+    metric_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> float:
     """
     Median Absolute Deviation (MAD) ratio: MAD(treatment) / MAD(control)
     Returns relative dispersion
@@ -64,8 +80,8 @@ def mad(df: pd.DataFrame, group_col: str, metric_col: str) -> float:
         median = s.median()
         return float((s - median).abs().median())
 
-    control = df[df[group_col] == "control"][metric_col]
-    treatment = df[df[group_col] == "treatment"][metric_col]
+    control = df[df[group_col] == control_label][metric_col]
+    treatment = df[df[group_col] == treatment_label][metric_col]
     mad_control = _mad(control)
     mad_treatment = _mad(treatment)
     ratio = mad_treatment / mad_control if mad_control > 0 else np.inf
@@ -78,7 +94,7 @@ def make_trimmed_mean(trim: float) -> Callable[..., float]:
     def metric(
         df: pd.DataFrame, group_col: str, metric_col: str, **kwargs: Any
     ) -> float:
-        return trimmed_mean(df, group_col, metric_col, trim=trim)
+        return trimmed_mean(df, group_col, metric_col, trim=trim, **kwargs)
 
     metric.__name__ = f"trimmed_mean_{int(trim * 100)}pct"
     metric.__doc__ = f"Trimmed mean difference (trim {trim * 100:.0f}% from each tail)"
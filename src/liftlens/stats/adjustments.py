@@ -1,8 +1,139 @@
+from collections.abc import Callable
 from typing import Any
 
 import numpy as np
+import pandas as pd
 from loguru import logger
-from statsmodels.stats.multitest import multipletests
+from numpy.typing import ArrayLike, NDArray
+
+from .permutation import count_extreme, permutation_distribution
+
+Kernel = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+
+
+def _bonferroni(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.asarray(p * p.shape[-1])
+
+
+def _holm(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    m = p.shape[-1]
+    return np.maximum.accumulate(p * np.arange(m, 0, -1), axis=-1)
+
+
+def _hochberg(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    m = p.shape[-1]
+    scaled = p * np.arange(m, 0, -1)
+    return np.minimum.accumulate(scaled[..., ::-1], axis=-1)[..., ::-1]
+
+
+def _bh(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    m = p.shape[-1]
+    scaled = p * m / np.arange(1, m + 1)
+    return np.minimum.accumulate(scaled[..., ::-1], axis=-1)[..., ::-1]
+
+
+def _by(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.asarray(_bh(p) * np.sum(1 / np.arange(1, p.shape[-1] + 1)))
+
+
+def _simes_ratios(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    r[k - 1] = min_j p_(m-k+j) / j for one ascending row: the Simes p-value
+    of the k largest p-values is k * r[k - 1]. Each minimum is the lowest
+    slope from (m - k, 0) to the points (i, p_(i)), i.e. a tangent to their
+    lower convex hull, so all m of them take O(m log m) instead of O(m^2).
+    """
+    m = len(p)
+    ratios = np.empty(m)
+    # Lower hull of the points right of the query, built right to left
+    # with the leftmost vertex last
+    xs: list[int] = []
+    ys: list[float] = []
+    for s in range(m - 1, -1, -1):
+        x, y = s + 1, float(p[s])
+        while (
+            len(xs) >= 2
+            and (xs[-1] - x) * (ys[-2] - y) - (ys[-1] - y) * (xs[-2] - x) <= 0
+        ):
+            xs.pop()
+            ys.pop()
+        xs.append(x)
+        ys.append(y)
+        # Slopes from (s, 0) fall then rise along the hull: bisect for the turn
+        lo, hi = 1, len(xs)
+        while lo < hi:
+            q = (lo + hi) // 2
+            if ys[q - 1] * (xs[q] - s) < ys[q] * (xs[q - 1] - s):
+                hi = q
+            else:
+                lo = q + 1
+        ratios[m - 1 - s] = ys[lo - 1] / (xs[lo - 1] - s)
+    return ratios
+
+
+def _hommel(p: NDArray[np.float64]) -> NDArray[np.float64]:
+    # The adjusted p-value of rank r is the largest Simes p-value over
+    # subsets containing it. With c_k the Simes p-value of the k largest and
+    # c_k / k non-increasing, that is max(L * p_(r), max_{k > L} c_k) where
+    # L = min(m - r, #{k : c_k / k >= p_(r)}).
+    m = p.shape[-1]
+    k = np.arange(1, m + 1)
+    adjusted = np.empty_like(p)
+    for row, values in enumerate(p):
+        ratios = _simes_ratios(values)
+        simes = k * ratios
+        suffix_max = np.append(np.maximum.accumulate(simes[::-1])[::-1], 0.0)
+        reach = m - np.searchsorted(ratios[::-1], values, side="left")
+        cut = np.minimum(reach, m - k)
+        adjusted[row] = np.maximum(cut * values, suffix_max[cut])
+    return adjusted
+
+
+# Kernels take row-wise ascending p-values without NaNs, shape (rows, m)
+_KERNELS: dict[str, Kernel] = {
+    "bonferroni": _bonferroni,
+    "holm": _holm,
+    "hochberg": _hochberg,
+    "bh": _bh,
+    "by": _by,
+    "hommel": _hommel,
+}
+METHODS = tuple(_KERNELS)
+
+
+def adjust_p_values(p_values: ArrayLike, method: str = "holm") -> NDArray[np.float64]:
+    """
+    Multiplicity-adjusted p-values along the last axis.
+
+    ``method``: bonferroni, holm (step-down), hochberg (step-up), bh
+    (Benjamini-Hochberg), by (Benjamini-Yekutieli) or hommel. Every row of
+    a 2-D input, e.g. one per experiment, is adjusted on its own in a single
+    set of array operations. NaN p-values are left out of the family and
+    stay NaN. Matches ``statsmodels.stats.multitest.multipletests``.
+    """
+    if method not in _KERNELS:
+        raise ValueError(f"Unknown correction: {method}")
+    p = np.asarray(p_values, dtype=float)
+    if p.size == 0:
+        return p
+    if np.any((p < 0) | (p > 1)):
+        raise ValueError("p-values must lie in [0, 1]")
+    rows = p.reshape(-1, p.shape[-1]) if p.ndim else p.reshape(1, 1)
+
+    # Ascending per row with NaNs last; each row's family is its finite prefix
+    order = np.argsort(rows, axis=-1)
+    ordered = np.take_along_axis(rows, order, axis=-1)
+    counts = np.sum(~np.isnan(rows), axis=-1)
+    adjusted = np.full_like(ordered, np.nan)
+    for m in np.unique(counts[counts > 0]):
+        same = counts == m
+        adjusted[same, :m] = _KERNELS[method](ordered[same, :m])
+    adjusted = np.minimum(adjusted, 1.0)
+
+    # Back to input order: result[order] = adjusted, i.e. the inverse permutation
+    result = np.empty_like(adjusted)
+    np.put_along_axis(result, order, adjusted, axis=-1)
+    return result.reshape(p.shape)
 
 
 def bonferroni(p_values: list[float], alpha: float = 0.05) -> dict[str, Any]:
@@ -16,6 +147,7 @@ def bonferroni(p_values: list[float], alpha: float = 0.05) -> dict[str, Any]:
         "alpha_original": alpha,
         "alpha_corrected": corrected_alpha,
         "p_values": p_values,
+        "p_values_adjusted": adjust_p_values(p_values, "bonferroni").tolist(),
         "significant": significant,
     }
     logger.info(
@@ -26,64 +158,134 @@ def bonferroni(p_values: list[float], alpha: float = 0.05) -> dict[str, Any]:
 
 def holm_bonferroni(p_values: list[float], alpha: float = 0.05) -> dict[str, Any]:
     """Holm-Bonferroni step-down procedure."""
-    p_sorted = sorted(p_values)
-    n = len(p_sorted)
-    significant = []
-    for i, p in enumerate(p_sorted):
-        if p < alpha / (n - i):
-            significant.append(True)
-        else:
-            significant.append(False)
-            break
-    else:
-        significant = [True] * n
-
-    # Map back to original order
-    idx = np.argsort(p_values)
-    significant = [significant[i] for i in idx]
-
+    adjusted = adjust_p_values(p_values, "holm")
+    significant = (adjusted < alpha).tolist()
     result = {
         "method": "Holm-Bonferroni",
-        "n_tests": n,
+        "n_tests": len(p_values),
         "p_values": p_values,
+        "p_values_adjusted": adjusted.tolist(),
         "significant": significant,
     }
-    logger.info(f"Holm: {sum(significant)}/{n} significant")
+    logger.info(f"Holm: {sum(significant)}/{len(p_values)} significant")
     return result
 
 
 def benjamini_hochberg(p_values: list[float], fdr: float = 0.05) -> dict[str, Any]:
     """Benjamini-Hochberg for FDR control."""
-    reject, _, _, _ = multipletests(p_values, alpha=fdr, method="fdr_bh")
+    adjusted = adjust_p_values(p_values, "bh")
+    significant = (adjusted <= fdr).tolist()
     result = {
         "method": "Benjamini-Hochberg",
         "fdr": fdr,
         "p_values": p_values,
-        "significant": reject.tolist(),
+        "p_values_adjusted": adjusted.tolist(),
+        "significant": significant,
     }
-    logger.info(f"BH-FDR: {sum(reject)}/{len(p_values)} significant at FDR={fdr}")
+    logger.info(f"BH-FDR: {sum(significant)}/{len(p_values)} significant at FDR={fdr}")
     return result
 
 
-def closed_testing(p_values: list[float], alpha: float = 0.05) -> dict[str, Any]:
-    """Closed testing procedure (for strong FWER control)."""
-    n = len(p_values)
-    p_sorted_idx = np.argsort(p_values)
-    significant = [False] * n
-
-    for k in range(1, n + 1):
-        subset_p = [p_values[i] for i in p_sorted_idx[:k]]
-        # Test intersection hypothesis
-        max_p = max(subset_p)
-        if max_p <= alpha / k:
-            for i in p_sorted_idx[:k]:
-                significant[i] = True
-
+def closed_testing(
+    p_values: list[float], alpha: float = 0.05, local_test: str = "simes"
+) -> dict[str, Any]:
+    """
+    Closed testing procedure (for strong FWER control), computed through its
+    shortcut: Simes local tests give Hommel's procedure, Bonferroni local
+    tests give Holm's.
+    """
+    shortcuts = {"simes": "hommel", "bonferroni": "holm"}
+    if local_test not in shortcuts:
+        raise ValueError("local_test must be 'simes' or 'bonferroni'")
+    adjusted = adjust_p_values(p_values, shortcuts[local_test])
+    significant = (adjusted <= alpha).tolist()
     result = {
         "method": "Closed Testing",
-        "n_tests": n,
+        "local_test": local_test,
+        "n_tests": len(p_values),
         "p_values": p_values,
+        "p_values_adjusted": adjusted.tolist(),
         "significant": significant,
     }
-    logger.info(f"Closed testing: {sum(significant)}/{n} significant")
+    logger.info(f"Closed testing: {sum(significant)}/{len(p_values)} significant")
+    return result
+
+
+def westfall_young(
+    df: pd.DataFrame,
+    metric_cols: list[str],
+    group_col: str = "group",
+    n_perm: int = 5_000,
+    alpha: float = 0.05,
+    chunk_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> dict[str, Any]:
+    """
+    Westfall-Young step-down maxT adjustment for many correlated metrics.
+
+    One set of label permutations is applied to all metrics jointly (see
+    ``permutation_distribution``, optionally over ``n_jobs`` workers), so
+    the adjustment keeps the correlation between metrics and is far less
+    conservative than Holm when metrics move together. Mean differences are
+    divided by each metric's total-sample standard deviation, which is the
+    same under every permutation, so metrics compete on a common scale.
+    Rows missing any metric are dropped.
+    """
+    labels = df[group_col].to_numpy()
+    values = df[metric_cols].to_numpy(dtype=float)
+    in_arms = np.isin(labels, [control_label, treatment_label])
+    keep = in_arms & ~np.isnan(values).any(axis=1)
+    if (in_arms & ~keep).any():
+        logger.warning(
+            f"Dropping {int((in_arms & ~keep).sum())} rows with missing metric values"
+        )
+    values = values[keep]
+
+    observed, perm_diffs = permutation_distribution(
+        values,
+        labels[keep] == treatment_label,
+        n_perm=n_perm,
+        chunk_size=chunk_size,
+        n_jobs=n_jobs,
+        seed=seed,
+    )
+    scale = values.std(axis=0)
+    constant = scale == 0
+    scale[constant] = 1.0
+    observed_t = np.abs(observed / scale)
+    perm_t = np.abs(perm_diffs / scale)
+    # Constant metrics carry no evidence; rounding noise must not rank them
+    observed_t[constant] = 0.0
+    perm_t[:, constant] = 0.0
+    n_drawn = len(perm_t)
+
+    # Successive maxima over the metrics ranked from least to most extreme:
+    # the most extreme metric competes with all, the least with itself only
+    order = np.argsort(-observed_t, kind="stable")
+    successive = np.maximum.accumulate(perm_t[:, order[::-1]], axis=1)[:, ::-1]
+    # Same tie tolerance as ``count_extreme``
+    threshold = observed_t[order] * (1 - 1e-9)
+    exceed = (successive >= threshold).sum(axis=0)
+    adjusted = np.empty(len(metric_cols))
+    adjusted[order] = np.maximum.accumulate(exceed / n_drawn)
+
+    raw = count_extreme(perm_diffs, observed) / n_drawn
+    significant = (adjusted < alpha).tolist()
+    result = {
+        "method": "Westfall-Young maxT",
+        "n_tests": len(metric_cols),
+        "n_perm": n_drawn,
+        "metrics": metric_cols,
+        "observed_diff": observed.tolist(),
+        "p_values": raw.tolist(),
+        "p_values_adjusted": adjusted.tolist(),
+        "significant": significant,
+    }
+    logger.info(
+        f"Westfall-Young: {sum(significant)}/{len(metric_cols)} significant "
+        f"({n_drawn} permutations)"
+    )
     return result
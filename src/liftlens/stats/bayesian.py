@@ -0,0 +1,321 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.typing import ArrayLike, NDArray
+from scipy import special, stats
+
+from .summary import ArmStats, cuped_adjust
+
+# Gauss-Legendre nodes per integral, and the posterior tail mass left out of
+# the integration window on each side
+QUADRATURE_NODES = 128
+TAIL_MASS = 1e-12
+
+_CUPED_KEYS = ("mean_x", "var_x", "cov_xy")
+
+
+def _beta_variance(
+    a: NDArray[np.float64], b: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    return np.asarray(a * b / ((a + b) ** 2 * (a + b + 1)))
+
+
+def beta_superiority(
+    alpha_c: ArrayLike,
+    beta_c: ArrayLike,
+    alpha_t: ArrayLike,
+    beta_t: ArrayLike,
+    nodes: int = QUADRATURE_NODES,
+) -> dict[str, NDArray[np.float64]]:
+    """
+    P(p_t > p_c) and expected losses for independent Beta posteriors.
+
+    With Y the narrower posterior and X the other, P(Y > X) is the integral
+    of f_Y(y) F_X(y), and E[(X - Y)+] the integral of
+    f_Y(y) (E[X] S_{X+}(y) - y S_X(y)), where X+ is Beta(alpha_x + 1, beta_x)
+    and S the survival function. Both are Gauss-Legendre sums over the central
+    1 - 2e-12 of Y, so cost does not grow with the counts, and the wider
+    posterior only enters through its smooth CDF. Inputs broadcast; one call
+    covers any number of experiments.
+    """
+    a_c, b_c, a_t, b_t = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (alpha_c, beta_c, alpha_t, beta_t))
+    )
+    # Integrate over control where its posterior is the narrower one
+    swap = _beta_variance(a_c, b_c) < _beta_variance(a_t, b_t)
+    a_y, b_y = np.where(swap, a_c, a_t), np.where(swap, b_c, b_t)
+    a_x, b_x = np.where(swap, a_t, a_c), np.where(swap, b_t, b_c)
+
+    x, w = special.roots_legendre(nodes)
+    low = stats.beta.ppf(TAIL_MASS, a_y, b_y)[..., None]
+    high = stats.beta.isf(TAIL_MASS, a_y, b_y)[..., None]
+    points = low + (high - low) * (x + 1) / 2
+    weights = (
+        w * (high - low) / 2 * stats.beta.pdf(points, a_y[..., None], b_y[..., None])
+    )
+
+    a_x_, b_x_ = a_x[..., None], b_x[..., None]
+    mean_x = a_x / (a_x + b_x)
+    mean_y = a_y / (a_y + b_y)
+    prob_y = np.clip(
+        np.sum(weights * stats.beta.cdf(points, a_x_, b_x_), axis=-1), 0, 1
+    )
+    shortfall = mean_x[..., None] * stats.beta.sf(points, a_x_ + 1, b_x_)
+    shortfall -= points * stats.beta.sf(points, a_x_, b_x_)
+    loss_y = np.maximum(np.sum(weights * shortfall, axis=-1), 0.0)
+    # E[(Y - X)+] = E[Y] - E[X] + E[(X - Y)+]
+    loss_x = np.maximum(mean_y - mean_x + loss_y, 0.0)
+    return {
+        "prob_treatment_better": np.where(swap, 1 - prob_y, prob_y),
+        "expected_loss_treatment": np.where(swap, loss_x, loss_y),
+        "expected_loss_control": np.where(swap, loss_y, loss_x),
+    }
+
+
+def bayesian_monitoring_batch(
+    control_conversions: ArrayLike,
+    control_n: ArrayLike,
+    treatment_conversions: ArrayLike,
+    treatment_n: ArrayLike,
+    prior_alpha: float = 1.0,
+    prior_beta: float = 1.0,
+    threshold: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Beta-Binomial monitoring of many experiments at once, one row each:
+    posterior P(treatment > control), expected losses and a recommendation.
+    """
+    conv_c, n_c, conv_t, n_t = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (
+                control_conversions,
+                control_n,
+                treatment_conversions,
+                treatment_n,
+            )
+        )
+    )
+    posterior = beta_superiority(
+        prior_alpha + conv_c,
+        prior_beta + n_c - conv_c,
+        prior_alpha + conv_t,
+        prior_beta + n_t - conv_t,
+    )
+    prob = posterior["prob_treatment_better"]
+    table = pd.DataFrame(
+        {
+            "control_rate": conv_c / n_c,
+            "treatment_rate": conv_t / n_t,
+            **posterior,
+        }
+    )
+    table["recommendation"] = np.select(
+        [prob > threshold, prob < 1 - threshold], ["treatment", "control"], "continue"
+    )
+    table["stop_early"] = table["recommendation"] != "continue"
+    logger.debug(
+        f"Bayesian monitoring: {int(table['stop_early'].sum())}/{len(table)} decided"
+    )
+    return table
+
+
+def _normal_losses(
+    mean: NDArray[np.float64], sd: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """E[(-D)+] and E[D+] for D ~ N(mean, sd^2): losses of shipping / not shipping."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = mean / sd
+    loss_treatment = sd * stats.norm.pdf(z) - mean * stats.norm.sf(z)
+    return loss_treatment, loss_treatment + mean
+
+
+def _effect_posterior(
+    estimate: NDArray[np.float64],
+    variance: NDArray[np.float64],
+    prior_mean: ArrayLike,
+    prior_var: ArrayLike,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Conjugate update of a N(prior_mean, prior_var) effect prior (inf = flat)."""
+    prior_precision = 1 / np.asarray(prior_var, dtype=float)
+    precision = prior_precision + 1 / variance
+    mean = (
+        prior_precision * np.asarray(prior_mean, dtype=float) + estimate / variance
+    ) / precision
+    return mean, np.sqrt(1 / precision)
+
+
+def normal_posterior(
+    n_c: ArrayLike,
+    mean_c: ArrayLike,
+    var_c: ArrayLike,
+    n_t: ArrayLike,
+    mean_t: ArrayLike,
+    var_t: ArrayLike,
+    prior_mean: ArrayLike = 0.0,
+    prior_var: ArrayLike = np.inf,
+    credible: float = 0.95,
+) -> dict[str, NDArray[np.float64]]:
+    """
+    Normal-Normal posterior of the difference in means from per-arm n, mean
+    and (ddof=1) variance, with a N(prior_mean, prior_var) prior on the
+    difference (flat by default). Inputs broadcast, e.g. one entry per metric.
+    """
+    n_c, mean_c, var_c, n_t, mean_t, var_t = (
+        np.asarray(x, dtype=float) for x in (n_c, mean_c, var_c, n_t, mean_t, var_t)
+    )
+    mean, sd = _effect_posterior(
+        mean_t - mean_c, var_c / n_c + var_t / n_t, prior_mean, prior_var
+    )
+    z = stats.norm.ppf(1 - (1 - credible) / 2)
+    loss_treatment, loss_control = _normal_losses(mean, sd)
+    return {
+        "effect": mean,
+        "effect_sd": sd,
+        "ci_lower": mean - z * sd,
+        "ci_upper": mean + z * sd,
+        "prob_treatment_better": stats.norm.cdf(mean / sd),
+        "expected_loss_treatment": loss_treatment,
+        "expected_loss_control": loss_control,
+    }
+
+
+def lognormal_posterior(
+    n_c: ArrayLike,
+    mean_log_c: ArrayLike,
+    var_log_c: ArrayLike,
+    n_t: ArrayLike,
+    mean_log_t: ArrayLike,
+    var_log_t: ArrayLike,
+    prior_mean: ArrayLike = 0.0,
+    prior_var: ArrayLike = np.inf,
+    credible: float = 0.95,
+) -> dict[str, NDArray[np.float64]]:
+    """
+    Log-normal posterior of the relative lift in means from per-arm n, mean
+    and variance of log values. The arm mean is exp(mu + sigma^2 / 2), so the
+    log ratio of means is approximately normal with mean
+    (mu_t - mu_c) + (s_t^2 - s_c^2) / 2 and variance s^2 / n + s^4 / (2 (n - 1))
+    per arm. The prior N(prior_mean, prior_var) is on that log ratio.
+    """
+    n_c, m_c, v_c, n_t, m_t, v_t = (
+        np.asarray(x, dtype=float)
+        for x in (n_c, mean_log_c, var_log_c, n_t, mean_log_t, var_log_t)
+    )
+    estimate = (m_t - m_c) + (v_t - v_c) / 2
+    variance = (
+        v_c / n_c + v_c**2 / (2 * (n_c - 1)) + v_t / n_t + v_t**2 / (2 * (n_t - 1))
+    )
+    mean, sd = _effect_posterior(estimate, variance, prior_mean, prior_var)
+    z = stats.norm.ppf(1 - (1 - credible) / 2)
+    return {
+        "lift": np.expm1(mean),
+        "ci_lower": np.expm1(mean - z * sd),
+        "ci_upper": np.expm1(mean + z * sd),
+        "log_lift": mean,
+        "log_lift_sd": sd,
+        "prob_treatment_better": stats.norm.cdf(mean / sd),
+    }
+
+
+def normal_from_stats(
+    control: ArmStats,
+    treatment: ArmStats,
+    prior_mean: float = 0.0,
+    prior_var: float = np.inf,
+    credible: float = 0.95,
+) -> dict[str, Any]:
+    """
+    Normal-Normal posterior of the effect from per-arm n, mean and variance.
+    When both arms also carry covariate moments ("mean_x", "var_x",
+    "cov_xy"), the metric is CUPED-adjusted first (``cuped_adjust``).
+    """
+    theta = None
+    if all(key in arm for arm in (control, treatment) for key in _CUPED_KEYS):
+        control, treatment, theta = cuped_adjust(control, treatment)
+    posterior = normal_posterior(
+        control["n"],
+        control["mean"],
+        control["var"],
+        treatment["n"],
+        treatment["mean"],
+        treatment["var"],
+        prior_mean,
+        prior_var,
+        credible,
+    )
+    result: dict[str, Any] = {"method": "Bayesian normal"}
+    result.update({key: float(value) for key, value in posterior.items()})
+    result["ci_95"] = [result.pop("ci_lower"), result.pop("ci_upper")]
+    result["n_control"] = int(control["n"])
+    result["n_treatment"] = int(treatment["n"])
+    if theta is not None:
+        result["theta"] = theta
+    return result
+
+
+def bayesian_scorecard(
+    df: pd.DataFrame,
+    metric_cols: list[str],
+    group_col: str = "group",
+    model: str = "normal",
+    covariate_col: str | None = None,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+    prior_mean: float = 0.0,
+    prior_var: float = np.inf,
+    credible: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Conjugate Bayesian posteriors for many continuous metrics from one
+    grouped aggregation, one row per metric.
+
+    Args:
+        model: "normal" (difference in means) or "lognormal" (relative lift
+            in means, for positive skewed metrics such as revenue)
+        covariate_col: Pre-period covariate for a CUPED adjustment of every
+            metric (total-sample theta, as in ``apply_cuped``); normal only
+    """
+    if model not in ("normal", "lognormal"):
+        raise ValueError("model must be 'normal' or 'lognormal'")
+    values = df[metric_cols].to_numpy(dtype=float)
+    if model == "lognormal":
+        if covariate_col:
+            raise ValueError("CUPED adjustment is only supported for the normal model")
+        if np.any(values <= 0):
+            raise ValueError("Log-normal model requires positive metric values")
+        values = np.log(values)
+    elif covariate_col:
+        x = df[covariate_col].to_numpy(dtype=float)
+        centered = x - x.mean()
+        var_x = centered @ centered
+        theta = centered @ (values - values.mean(axis=0)) / var_x if var_x > 0 else 0.0
+        values = values - np.outer(centered, theta)
+
+    moments = (
+        pd.DataFrame(values, columns=metric_cols)
+        .groupby(df[group_col].to_numpy())
+        .agg(["count", "mean", "var"])
+    )
+
+    def arm(label: str) -> list[NDArray[np.float64]]:
+        return [
+            np.asarray(
+                moments.loc[label, [(col, stat) for col in metric_cols]], dtype=float
+            )
+            for stat in ("count", "mean", "var")
+        ]
+
+    n_c, mean_c, var_c = arm(control_label)
+    n_t, mean_t, var_t = arm(treatment_label)
+    posterior_func = normal_posterior if model == "normal" else lognormal_posterior
+    posterior = posterior_func(
+        n_c, mean_c, var_c, n_t, mean_t, var_t, prior_mean, prior_var, credible
+    )
+    table = pd.DataFrame(posterior, index=pd.Index(metric_cols, name="metric"))
+    table["n_control"] = n_c.astype(int)
+    table["n_treatment"] = n_t.astype(int)
+    logger.debug(f"Bayesian scorecard ({model}) for {len(metric_cols)} metrics")
+    return table
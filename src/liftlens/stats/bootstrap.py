@@ -0,0 +1,583 @@
+from collections.abc import Callable, Iterable
+from functools import partial
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.typing import NDArray
+from scipy import stats
+
+from ..engine.parallel import map_batches, spawn_seeds, split_batches
+from ..metrics import ensure_metrics_registered
+from ..metrics.registry import registry as metric_registry
+
+# Memory budget for one chunk of resampled values (indices + gathered values)
+CHUNK_BYTES = 64 * 2**20
+
+ArrayStatistic = Callable[
+    [NDArray[np.float64], NDArray[np.float64]], NDArray[np.float64]
+]
+
+_QUANTILE_METRICS = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def _mean_stat(c: NDArray[np.float64], t: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.asarray(t.mean(axis=-1) - c.mean(axis=-1))
+
+
+def _sum_stat(c: NDArray[np.float64], t: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.asarray(t.sum(axis=-1) - c.sum(axis=-1))
+
+
+def _trimmed_stat(
+    c: NDArray[np.float64], t: NDArray[np.float64], trim: float
+) -> NDArray[np.float64]:
+    return np.asarray(
+        stats.trim_mean(t, trim, axis=-1) - stats.trim_mean(c, trim, axis=-1)
+    )
+
+
+def _quantile_stat(
+    c: NDArray[np.float64], t: NDArray[np.float64], q: float
+) -> NDArray[np.float64]:
+    return np.asarray(np.quantile(t, q, axis=-1) - np.quantile(c, q, axis=-1))
+
+
+def _mean_se(c: NDArray[np.float64], t: NDArray[np.float64]) -> NDArray[np.float64]:
+    n_c, n_t = c.shape[-1], t.shape[-1]
+    return np.asarray(
+        np.sqrt(c.var(axis=-1, ddof=1) / n_c + t.var(axis=-1, ddof=1) / n_t)
+    )
+
+
+def _sum_se(c: NDArray[np.float64], t: NDArray[np.float64]) -> NDArray[np.float64]:
+    n_c, n_t = c.shape[-1], t.shape[-1]
+    return np.asarray(
+        np.sqrt(c.var(axis=-1, ddof=1) * n_c + t.var(axis=-1, ddof=1) * n_t)
+    )
+
+
+def _quantile_level(metric: str, params: dict[str, Any]) -> float | None:
+    if metric == "quantile_diff":
+        return float(params.get("q", 0.5))
+    return _QUANTILE_METRICS.get(metric)
+
+
+def array_statistic(metric: str, params: dict[str, Any]) -> ArrayStatistic | None:
+    """
+    Vectorized form of a registered metric, evaluated row-wise on (B x n)
+    resampled control/treatment matrices. None if the metric has no array form.
+    """
+    if metric == "mean_diff":
+        return _mean_stat
+    if metric == "sum":
+        return _sum_stat
+    if metric == "trimmed_mean":
+        return partial(_trimmed_stat, trim=params.get("trim", 0.1))
+    q = _quantile_level(metric, params)
+    if q is not None:
+        return partial(_quantile_stat, q=q)
+    return None
+
+
+def array_std_error(metric: str) -> ArrayStatistic | None:
+    """Row-wise analytic standard error of a metric, for studentized intervals."""
+    return {"mean_diff": _mean_se, "sum": _sum_se}.get(metric)
+
+
+def split_groups(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """NaN-free metric values of control and treatment."""
+    values = df[metric_col].to_numpy(dtype=float)
+    labels = df[group_col].to_numpy()
+    control = values[(labels == control_label) & ~np.isnan(values)]
+    treatment = values[(labels == treatment_label) & ~np.isnan(values)]
+    if len(control) == 0 or len(treatment) == 0:
+        raise ValueError("Empty group in bootstrap")
+    return control, treatment
+
+
+def _array_chunk(
+    task: tuple[int, np.random.SeedSequence],
+    control: NDArray[np.float64],
+    treatment: NDArray[np.float64],
+    statistic: ArrayStatistic,
+    std_error: ArrayStatistic | None = None,
+    center: float = 0.0,
+) -> NDArray[np.float64]:
+    """
+    Resample ``size`` replicates of both groups at once and reduce row-wise.
+    With ``std_error``, return studentized pivots (stat - center) / se instead.
+    """
+    size, seed = task
+    rng = np.random.default_rng(seed)
+    c_boot = control[rng.integers(0, len(control), size=(size, len(control)))]
+    t_boot = treatment[rng.integers(0, len(treatment), size=(size, len(treatment)))]
+    if std_error is None:
+        return statistic(c_boot, t_boot)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(
+            (statistic(c_boot, t_boot) - center) / std_error(c_boot, t_boot)
+        )
+
+
+def _frame_chunk(
+    task: tuple[int, np.random.SeedSequence],
+    df: pd.DataFrame,
+    metric: Callable[..., Any],
+    group_col: str,
+    metric_col: str,
+    control_pos: NDArray[np.intp],
+    treatment_pos: NDArray[np.intp],
+    params: dict[str, Any],
+) -> NDArray[np.float64]:
+    """Generic fallback: stratified row resampling and one metric call per replicate."""
+    size, seed = task
+    rng = np.random.default_rng(seed)
+    out = np.empty(size)
+    for b in range(size):
+        rows = np.concatenate(
+            [
+                control_pos[rng.integers(0, len(control_pos), len(control_pos))],
+                treatment_pos[rng.integers(0, len(treatment_pos), len(treatment_pos))],
+            ]
+        )
+        out[b] = metric(df.iloc[rows], group_col, metric_col, **params)
+    return out
+
+
+def bootstrap_distribution(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    metric: str = "mean_diff",
+    n_boot: int = 10_000,
+    chunk_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+    studentized: bool = False,
+    **params: Any,
+) -> tuple[float, NDArray[np.float64]]:
+    """
+    Bootstrap distribution of any registered metric.
+
+    Replicates are drawn in memory-bounded chunks (``chunk_size`` replicates,
+    defaulting to ~64 MB of resampled data) with one independent RNG stream per
+    chunk; chunks can be spread across cores with ``n_jobs``. Metrics with an
+    array form (mean, sum, trimmed mean, quantiles) are reduced as matrix
+    operations over the whole chunk; other metrics are called per replicate.
+    With ``studentized`` (metrics with an analytic SE only), replicates are
+    bootstrap-t pivots (stat* - estimate) / se*.
+
+    Returns:
+        (estimate on the original data, array of ``n_boot`` replicate values)
+    """
+    ensure_metrics_registered()
+    name = metric_registry.resolve(metric)
+    statistic = array_statistic(name, params)
+
+    std_error = array_std_error(name) if studentized else None
+    if studentized and std_error is None:
+        raise ValueError(
+            f"Studentized bootstrap needs an analytic SE; not available for {name}"
+        )
+
+    if statistic is not None:
+        control, treatment = split_groups(
+            df, metric_col, group_col, control_label, treatment_label
+        )
+        per_replicate = 16 * (len(control) + len(treatment))
+        estimate = float(statistic(control, treatment))
+        task: Callable[[Any], NDArray[np.float64]] = partial(
+            _array_chunk,
+            control=control,
+            treatment=treatment,
+            statistic=statistic,
+            std_error=std_error,
+            center=estimate,
+        )
+    else:
+        labels = df[group_col].to_numpy()
+        control_pos = np.flatnonzero(labels == control_label)
+        treatment_pos = np.flatnonzero(labels == treatment_label)
+        if len(control_pos) == 0 or len(treatment_pos) == 0:
+            raise ValueError("Empty group in bootstrap")
+        labelled = {"control_label": control_label, "treatment_label": treatment_label}
+        func = metric_registry.get(name)
+        per_replicate = 8 * (len(control_pos) + len(treatment_pos))
+        estimate = float(func(df, group_col, metric_col, **labelled, **params))
+        task = partial(
+            _frame_chunk,
+            df=df,
+            metric=func,
+            group_col=group_col,
+            metric_col=metric_col,
+            control_pos=control_pos,
+            treatment_pos=treatment_pos,
+            params={**labelled, **params},
+        )
+
+    size = chunk_size or max(1, CHUNK_BYTES // per_replicate)
+    sizes = split_batches(n_boot, size)
+    tasks = list(zip(sizes, spawn_seeds(seed, len(sizes)), strict=True))
+    replicates = np.concatenate(map_batches(task, tasks, n_jobs=n_jobs))
+    logger.debug(
+        f"Bootstrap {name}: {n_boot} replicates in {len(tasks)} chunks "
+        f"({'vectorized' if statistic is not None else 'per-replicate'})"
+    )
+    return estimate, replicates
+
+
+# Number of delete-a-block groups per arm when no closed-form jackknife exists
+JACKKNIFE_BLOCKS = 200
+
+
+def _loo_mean(values: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Leave-one-out means of every element from the total."""
+    return np.asarray((values.sum() - values) / (len(values) - 1))
+
+
+def _loo_quantile(values: NDArray[np.float64], q: float) -> NDArray[np.float64]:
+    """
+    Leave-one-out ``np.quantile`` for every element, read off the sorted sample:
+    dropping the i-th order statistic shifts ranks >= i up by one.
+    """
+    ordered = np.sort(values)
+    n = len(ordered)
+    pos = q * (n - 2)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, n - 2)
+    dropped = np.arange(n)
+    v_lo = np.where(lo < dropped, ordered[lo], ordered[min(lo + 1, n - 1)])
+    v_hi = np.where(hi < dropped, ordered[hi], ordered[min(hi + 1, n - 1)])
+    return np.asarray(v_lo + (pos - lo) * (v_hi - v_lo))
+
+
+def _block_jackknife(
+    n: int, evaluate: Callable[[NDArray[np.bool_]], float]
+) -> NDArray[np.float64]:
+    """Delete-a-block jackknife: ``evaluate(keep)`` once per contiguous block."""
+    blocks = np.array_split(np.arange(n), min(n, JACKKNIFE_BLOCKS))
+    out = np.empty(len(blocks))
+    for b, block in enumerate(blocks):
+        keep = np.ones(n, dtype=bool)
+        keep[block] = False
+        out[b] = evaluate(keep)
+    return out
+
+
+def jackknife_values(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    metric: str = "mean_diff",
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+    **params: Any,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Jackknife values of a metric, deleting rows from control and from
+    treatment in turn.
+
+    Mean, sum and quantile metrics use closed-form leave-one-out updates from
+    the group totals / order statistics (O(n), no refits). Other metrics fall
+    back to a delete-a-block jackknife with ``JACKKNIFE_BLOCKS`` refits per arm.
+    """
+    ensure_metrics_registered()
+    name = metric_registry.resolve(metric)
+    q = _quantile_level(name, params)
+    if name in ("mean_diff", "sum") or q is not None:
+        control, treatment = split_groups(
+            df, metric_col, group_col, control_label, treatment_label
+        )
+        if name == "mean_diff":
+            return treatment.mean() - _loo_mean(control), _loo_mean(
+                treatment
+            ) - control.mean()
+        if name == "sum":
+            return treatment.sum() - (control.sum() - control), (
+                treatment.sum() - treatment
+            ) - control.sum()
+        if q is not None:
+            q_c = float(np.quantile(control, q))
+            q_t = float(np.quantile(treatment, q))
+            return q_t - _loo_quantile(control, q), _loo_quantile(treatment, q) - q_c
+
+    func = metric_registry.get(name)
+    labels = df[group_col].to_numpy()
+    kwargs = {
+        "control_label": control_label,
+        "treatment_label": treatment_label,
+        **params,
+    }
+    jack = []
+    for label in (control_label, treatment_label):
+        own = np.flatnonzero(labels == label)
+        rest = np.flatnonzero(labels != label)
+
+        def evaluate(
+            keep: NDArray[np.bool_],
+            own: NDArray[np.intp] = own,
+            rest: NDArray[np.intp] = rest,
+        ) -> float:
+            rows = np.concatenate([own[keep], rest])
+            return float(func(df.iloc[rows], group_col, metric_col, **kwargs))
+
+        jack.append(_block_jackknife(len(own), evaluate))
+    return jack[0], jack[1]
+
+
+def acceleration(jackknife: Iterable[NDArray[np.float64]]) -> float:
+    """BCa acceleration from per-sample jackknife values (multi-sample form)."""
+    num = den = 0.0
+    for values in jackknife:
+        n = len(values)
+        u = (n - 1) * (values.mean() - values)
+        num += float((u**3).sum()) / n**3
+        den += float((u**2).sum()) / n**2
+    return num / (6 * den**1.5) if den > 0 else 0.0
+
+
+def bca_interval(
+    estimate: float,
+    replicates: NDArray[np.float64],
+    accel: float,
+    alpha: float = 0.05,
+) -> tuple[float, float]:
+    """Bias-corrected and accelerated percentile interval."""
+    # Ties count half, so discrete statistics (e.g. quantiles) are not biased
+    below = np.sum(replicates < estimate) + np.sum(replicates <= estimate)
+    # Keep z0 finite when every replicate falls on one side of the estimate
+    n_half = 2 * len(replicates)
+    if not 0 < below < n_half:
+        logger.warning("All bootstrap replicates on one side of the estimate")
+        below = np.clip(below, 0.5, n_half - 0.5)
+    z0 = stats.norm.ppf(below / n_half)
+    z = stats.norm.ppf([alpha / 2, 1 - alpha / 2])
+    levels = stats.norm.cdf(z0 + (z0 + z) / (1 - accel * (z0 + z)))
+    lower, upper = np.nanpercentile(replicates, levels * 100)
+    return float(lower), float(upper)
+
+
+def studentized_interval(
+    estimate: float,
+    std_error: float,
+    pivots: NDArray[np.float64],
+    alpha: float = 0.05,
+) -> tuple[float, float]:
+    """Bootstrap-t interval from pivots (stat* - estimate) / se*."""
+    t_lower, t_upper = np.nanpercentile(
+        pivots, [alpha / 2 * 100, (1 - alpha / 2) * 100]
+    )
+    return float(estimate - t_upper * std_error), float(estimate - t_lower * std_error)
+
+
+# Poisson(1) CDF table for inverse-transform sampling (P(K > 20) < 1e-19),
+# scaled to 53-bit integers: a uniform k * 2^-53 reaches cdf[i] exactly when
+# k reaches ceil(cdf[i] * 2^53), so the draw needs no float array
+_POISSON1_CDF = stats.poisson.cdf(np.arange(21), 1.0)
+_POISSON1_THRESHOLDS = np.ceil(_POISSON1_CDF * 2.0**53).astype(np.uint64)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+# Peak bytes per (row, replicate) weight: the uint64 hash block and its
+# shift scratch, then the hash block, searchsorted's indices and the uint8
+# result; the float copy made by ``PoissonBootstrap.update`` comes after
+POISSON_WEIGHT_BYTES = 17
+
+
+def _splitmix64(x: NDArray[np.uint64]) -> NDArray[np.uint64]:
+    """SplitMix64 finalizer in place: a fast, well-mixed uint64 -> uint64 hash."""
+    scratch = np.empty_like(x)
+    with np.errstate(over="ignore"):
+        x += _GOLDEN
+        for shift, multiplier in ((30, 0xBF58476D1CE4E5B9), (27, 0x94D049BB133111EB)):
+            np.right_shift(x, np.uint64(shift), out=scratch)
+            x ^= scratch
+            x *= np.uint64(multiplier)
+        np.right_shift(x, np.uint64(31), out=scratch)
+        x ^= scratch
+    return x
+
+
+def poisson_weights(keys: Any, n_boot: int, seed: int = 0) -> NDArray[np.uint8]:
+    """
+    Poisson(1) bootstrap weights of shape (len(keys), n_boot).
+
+    Weights are a pure function of (key, replicate, seed): the same user gets
+    the same weights in every chunk, file or process, so partial results can
+    be merged, and repeated rows of a user are resampled together. The hash
+    block is transformed in place, so memory peaks at
+    ``POISSON_WEIGHT_BYTES`` per weight.
+    """
+    hashed = pd.util.hash_array(np.asarray(keys, dtype=object)).astype(np.uint64)
+    replicate = np.arange(n_boot, dtype=np.uint64) * _GOLDEN
+    mixed = _splitmix64(hashed ^ _splitmix64(np.array([seed], dtype=np.uint64)))
+    bits = np.bitwise_xor(mixed[:, None], replicate[None, :])
+    _splitmix64(bits)
+    # The top 53 bits index the uniform draw
+    bits >>= np.uint64(11)
+    return np.searchsorted(_POISSON1_THRESHOLDS, bits, side="right").astype(np.uint8)
+
+
+class PoissonBootstrap:
+    """
+    Mergeable Poisson bootstrap accumulator for streaming or distributed data.
+
+    Per replicate and arm it keeps only weighted sufficient statistics
+    (sum of weights, weighted metric sum and, for ratios, weighted denominator
+    sum), so chunks can be folded in one at a time with ``update`` or built in
+    separate processes and combined with ``merge``.
+
+    metric: "mean_diff", "sum" or "ratio" (requires ``denominator_col``)
+    """
+
+    METRICS = ("mean_diff", "sum", "ratio")
+
+    def __init__(
+        self,
+        n_boot: int = 1_000,
+        metric: str = "mean_diff",
+        seed: int = 0,
+        control_label: str = "control",
+        treatment_label: str = "treatment",
+    ):
+        if metric not in self.METRICS:
+            raise ValueError(f"metric must be one of {self.METRICS}")
+        self.n_boot = n_boot
+        self.metric = metric
+        self.seed = seed
+        self.labels = (control_label, treatment_label)
+        # rows: control, treatment; columns: replicate; slot 0 holds the unweighted totals
+        self.weight_sum = np.zeros((2, n_boot + 1))
+        self.value_sum = np.zeros((2, n_boot + 1))
+        self.denominator_sum = np.zeros((2, n_boot + 1))
+
+    def update(
+        self,
+        df: pd.DataFrame,
+        metric_col: str,
+        group_col: str = "group",
+        user_col: str = "user_id",
+        denominator_col: str | None = None,
+    ) -> "PoissonBootstrap":
+        """Fold one chunk of rows into the per-replicate statistics."""
+        if self.metric == "ratio" and not denominator_col:
+            raise ValueError("denominator_col required for ratio metric")
+        labels = df[group_col].to_numpy()
+        # Rows with a missing metric or denominator are skipped, as in pandas
+        present = df[metric_col].notna().to_numpy()
+        if denominator_col:
+            present &= df[denominator_col].notna().to_numpy()
+        # Bound the (rows x replicates) weight block by the chunk memory budget
+        block = max(1, CHUNK_BYTES // (POISSON_WEIGHT_BYTES * self.n_boot))
+        for arm, label in enumerate(self.labels):
+            mask = present & (labels == label)
+            if not mask.any():
+                continue
+            values = df.loc[mask, metric_col].to_numpy(dtype=float)
+            users = df.loc[mask, user_col].to_numpy()
+            den = (
+                df.loc[mask, denominator_col].to_numpy(dtype=float)
+                if denominator_col
+                else None
+            )
+            self.weight_sum[arm, 0] += len(values)
+            self.value_sum[arm, 0] += values.sum()
+            if den is not None:
+                self.denominator_sum[arm, 0] += den.sum()
+            for start in range(0, len(values), block):
+                stop = start + block
+                w = poisson_weights(users[start:stop], self.n_boot, self.seed).astype(
+                    float
+                )
+                self.weight_sum[arm, 1:] += w.sum(axis=0)
+                self.value_sum[arm, 1:] += values[start:stop] @ w
+                if den is not None:
+                    self.denominator_sum[arm, 1:] += den[start:stop] @ w
+                # Free this block before the next one is drawn
+                del w
+        return self
+
+    def merge(self, other: "PoissonBootstrap") -> "PoissonBootstrap":
+        """Add the statistics of an accumulator built on disjoint rows."""
+        if (other.n_boot, other.metric, other.seed, other.labels) != (
+            self.n_boot,
+            self.metric,
+            self.seed,
+            self.labels,
+        ):
+            raise ValueError("Cannot merge bootstraps with different settings")
+        self.weight_sum += other.weight_sum
+        self.value_sum += other.value_sum
+        self.denominator_sum += other.denominator_sum
+        return self
+
+    def _statistic(self) -> NDArray[np.float64]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.metric == "mean_diff":
+                per_arm = self.value_sum / self.weight_sum
+            elif self.metric == "ratio":
+                per_arm = self.value_sum / self.denominator_sum
+            else:
+                per_arm = self.value_sum
+        return np.asarray(per_arm[1] - per_arm[0])
+
+    @property
+    def estimate(self) -> float:
+        """Metric on the data seen so far (unweighted)."""
+        return float(self._statistic()[0])
+
+    @property
+    def replicates(self) -> NDArray[np.float64]:
+        return self._statistic()[1:]
+
+    def result(self, alpha: float = 0.05) -> dict[str, Any]:
+        """Percentile CI in the same shape as ``bootstrap_ci``."""
+        boot = self.replicates
+        ci_lower = float(np.nanpercentile(boot, (alpha / 2) * 100))
+        ci_upper = float(np.nanpercentile(boot, (1 - alpha / 2) * 100))
+        result = {
+            "method": "poisson_bootstrap",
+            "metric": self.metric,
+            "estimate": self.estimate,
+            "ci_95": [ci_lower, ci_upper],
+            "n_boot": self.n_boot,
+            "n_control": int(self.weight_sum[0, 0]),
+            "n_treatment": int(self.weight_sum[1, 0]),
+            "significant": (ci_lower > 0) or (ci_upper < 0),
+        }
+        logger.info(
+            f"Poisson bootstrap ({self.metric}): estimate={result['estimate']:.3f}, "
+            f"CI=[{ci_lower:.3f}, {ci_upper:.3f}]"
+        )
+        return result
+
+
+def poisson_bootstrap_ci(
+    chunks: Iterable[pd.DataFrame],
+    metric_col: str,
+    group_col: str = "group",
+    user_col: str = "user_id",
+    n_boot: int = 1_000,
+    alpha: float = 0.05,
+    metric: str = "mean_diff",
+    denominator_col: str | None = None,
+    seed: int = 0,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> dict[str, Any]:
+    """
+    Poisson bootstrap CI over an iterable of DataFrame chunks (e.g. from
+    ``data.io.read_chunks``), never materializing the full dataset.
+    """
+    accumulator = PoissonBootstrap(n_boot, metric, seed, control_label, treatment_label)
+    for chunk in chunks:
+        accumulator.update(chunk, metric_col, group_col, user_col, denominator_col)
+    return accumulator.result(alpha)
@@ -6,6 +6,8 @@ from loguru import logger
 from numpy.typing import NDArray
 from sklearn.ensemble import RandomForestRegressor
 
+from .summary import welch_moments
+
 
 def subgroup_analysis(
     df: pd.DataFrame, metric_col: str, group_col: str, subgroups: list[str]
@@ -13,22 +15,128 @@ def subgroup_analysis(
     """
     Estimate treatment effect per subgroup.
     """
+    cube = segment_cube(df, [metric_col], group_col, subgroups, include_total=False)
     results = {}
-    for col in subgroups:
-        for val in df[col].unique():
-            subset = df[df[col] == val]
-            if len(subset) < 10:
-                continue
-            effect = (
-                subset[subset[group_col] == "treatment"][metric_col].mean()
-                - subset[subset[group_col] == "control"][metric_col].mean()
-            )
-            key = f"{col}={val}"
-            results[key] = float(effect)
+    for row in cube.itertuples(index=False):
+        if pd.isna(row.segment) or row.n_control + row.n_treatment < 10:
+            continue
+        results[f"{row.dimension}={row.segment}"] = float(row.effect)
     logger.info(f"Subgroup analysis: {len(results)} subgroups")
     return results
 
 
+def segment_cube(
+    df: pd.DataFrame,
+    metric_cols: list[str],
+    group_col: str,
+    dimensions: list[str],
+    rollups: list[tuple[str, ...]] | None = None,
+    include_total: bool = True,
+    alpha: float = 0.05,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+) -> pd.DataFrame:
+    """
+    Treatment effects for every segment of every dimension and every metric.
+
+    Per-cell sufficient statistics (n, sum, sum of squares) are computed with a
+    single grouped aggregation over all dimensions and the group column. Each
+    dimension, each requested rollup (tuple of dimensions), and the overall
+    total are then marginalized from those cells, so the raw rows are scanned
+    once regardless of how many segments there are.
+
+    Returns:
+        Long DataFrame with one row per (dimension, segment, metric) holding
+        group sizes, means, effect, Welch std_error/df, CI and p_value.
+    """
+    if not dimensions:
+        raise ValueError("At least one dimension required")
+
+    values = df[metric_cols].astype(float)
+    shift = values.mean()  # centering keeps sum-of-squares numerically stable
+    centered = values - shift
+    stats_frame = pd.concat(
+        {"n": values.notna().astype(float), "sum": centered, "sumsq": centered**2},
+        axis=1,
+    )
+    keys = [df[col] for col in dimensions] + [df[group_col]]
+    cells = stats_frame.groupby(keys, observed=True, dropna=False, sort=False).sum()
+    cells.index.names = list(dimensions) + [group_col]
+
+    slices: list[tuple[str, ...]] = [(col,) for col in dimensions] + list(rollups or [])
+    if include_total:
+        slices.append(())
+
+    frames = []
+    for dims in slices:
+        levels = list(dims) + [group_col]
+        agg = cells.groupby(level=levels, dropna=False, sort=False).sum()
+        by_group = agg.unstack(group_col)
+        if not dims:  # total: unstacking the only level yields a Series
+            by_group = by_group.to_frame().T
+        frames.append(
+            _segment_effects(
+                by_group,
+                dims,
+                metric_cols,
+                shift,
+                alpha,
+                control_label,
+                treatment_label,
+            )
+        )
+
+    cube = pd.concat(frames, ignore_index=True)
+    logger.info(
+        f"Segment cube: {len(cube)} rows over {len(slices)} slices and {len(metric_cols)} metrics"
+    )
+    return cube
+
+
+def _segment_effects(
+    by_group: pd.DataFrame,
+    dims: tuple[str, ...],
+    metric_cols: list[str],
+    shift: pd.Series,
+    alpha: float,
+    control_label: str,
+    treatment_label: str,
+) -> pd.DataFrame:
+    """Welch effects for every segment of one slice, vectorized over metrics."""
+
+    def _block(stat: str, label: str) -> NDArray[np.float64]:
+        cols = [(stat, metric, label) for metric in metric_cols]
+        block = by_group.reindex(columns=cols).fillna(0.0)
+        return np.asarray(block, dtype=np.float64)
+
+    n_c, n_t = _block("n", control_label), _block("n", treatment_label)
+    s_c, s_t = _block("sum", control_label), _block("sum", treatment_label)
+    q_c, q_t = _block("sumsq", control_label), _block("sumsq", treatment_label)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_c, mean_t = s_c / n_c, s_t / n_t
+        var_c = (q_c - s_c * mean_c) / (n_c - 1)
+        var_t = (q_t - s_t * mean_t) / (n_t - 1)
+    effects = welch_moments(n_c, mean_c, var_c, n_t, mean_t, var_t, alpha)
+
+    n_seg, n_met = n_c.shape
+    segments = np.empty(n_seg, dtype=object)  # rollup segments are tuples
+    segments[:] = list(by_group.index) if dims else ["ALL"] * n_seg
+    offsets = shift.reindex(metric_cols).to_numpy()
+    return pd.DataFrame(
+        {
+            "dimension": " x ".join(dims) if dims else "total",
+            "segment": np.repeat(segments, n_met),
+            "metric": np.tile(metric_cols, n_seg),
+            "n_control": n_c.ravel().astype(int),
+            "n_treatment": n_t.ravel().astype(int),
+            "mean_control": (mean_c + offsets).ravel(),
+            "mean_treatment": (mean_t + offsets).ravel(),
+            **{k: v.ravel() for k, v in effects.items()},
+        }
+    )
+
+
 def causal_forest_effect(
     df: pd.DataFrame, treatment_col: str, outcome_col: str, feature_cols: list[str]
  ) -> NDArray[Any]:
@@ -3,56 +3,112 @@ from typing import Any
 import numpy as np
 import pandas as pd
 from loguru import logger
-from scipy import stats
+from numpy.typing import ArrayLike
 
 from ..metrics.registry import registry as metric_registry
+from .bootstrap import (
+    acceleration,
+    array_std_error,
+    bca_interval,
+    bootstrap_distribution,
+    jackknife_values,
+    split_groups,
+    studentized_interval,
+)
+from .permutation import count_extreme, permutation_distribution
+from .summary import arm_statistics, welch_from_stats
+from .summary import welch_moments as welch_moments  # re-exported
 
 
 def welch_ttest(
-    df: pd.DataFrame, metric_col: str, group_col: str = "group"
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+    alpha: float = 0.05,
 ) -> dict[str, Any]:
     """
     Welch's t-test for unequal variances.
-    Returns full result dictionary.
+    Returns full result dictionary (see ``stats.summary.welch_from_stats``
+    for the same test on pre-aggregated statistics).
     """
-    control = df[df[group_col] == "control"][metric_col].dropna()
-    treatment = df[df[group_col] == "treatment"][metric_col].dropna()
+    arms = arm_statistics(df, metric_col, group_col, [control_label, treatment_label])
+    control, treatment = arms.loc[control_label], arms.loc[treatment_label]
 
-    if len(control) < 2 or len(treatment) < 2:
+    if not (control["n"] >= 2 and treatment["n"] >= 2):
         logger.warning("Insufficient sample size for t-test")
         return {"error": "n < 2 in one group"}
 
-    t_stat, p_value = stats.ttest_ind(
-        treatment, control, equal_var=False, nan_policy="omit"
-    )
-    mean_diff = treatment.mean() - control.mean()
-
-    # Degrees of freedom (Welch-Satterthwaite)
-    se_control = control.std() / np.sqrt(len(control))
-    se_treatment = treatment.std() / np.sqrt(len(treatment))
-    se_diff = np.sqrt(se_control**2 + se_treatment**2)
-    df_welch = (se_control**2 + se_treatment**2) ** 2 / (
-        (se_control**4 / (len(control) - 1)) + (se_treatment**4 / (len(treatment) - 1))
+    result = welch_from_stats(control, treatment, alpha)
+    logger.info(
+        f"Welch t-test: t={result['t_statistic']:.3f}, p={result['p_value']:.3f}, "
+        f"diff={result['mean_diff']:.3f}"
     )
+    return result
 
-    # Confidence interval
-    t_crit = stats.t.ppf(0.975, df_welch)
-    ci = (mean_diff - t_crit * se_diff, mean_diff + t_crit * se_diff)
 
-    result = {
-        "method": "Welch's t-test",
-        "t_statistic": float(t_stat),
-        "p_value": float(p_value),
-        "df": float(df_welch),
-        "mean_control": float(control.mean()),
-        "mean_treatment": float(treatment.mean()),
-        "mean_diff": float(mean_diff),
-        "ci_95": [float(ci[0]), float(ci[1])],
-        "significant": p_value < 0.05,
-        "n_control": len(control),
-        "n_treatment": len(treatment),
-    }
-    logger.info(f"Welch t-test: t={t_stat:.3f}, p={p_value:.3f}, diff={mean_diff:.3f}")
+def welch_ttest_batch(
+    values: pd.DataFrame | ArrayLike,
+    groups: ArrayLike,
+    control_label: Any = "control",
+    treatment_label: Any = "treatment",
+    alpha: float = 0.05,
+    metric_names: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Welch's t-test for many metrics at once.
+
+    ``values`` is an (n x k) array or DataFrame of metric columns and
+    ``groups`` the per-row group label or code. Per-group counts, sums and
+    centered sums of squares come from two indicator-matrix products
+    (NaNs are skipped per metric), and every test statistic is computed as
+    an array operation.
+
+    Returns:
+        DataFrame indexed by metric with n, means, effect, std_error, df,
+        t_statistic, CI, p_value and significant columns.
+    """
+    if isinstance(values, pd.DataFrame):
+        metric_names = metric_names or [str(col) for col in values.columns]
+        data = values.to_numpy(dtype=float)
+    else:
+        data = np.asarray(values, dtype=float)
+    data = data.reshape(len(data), -1)
+    metric_names = metric_names or [f"metric_{i}" for i in range(data.shape[1])]
+
+    labels = np.asarray(groups)
+    indicator = np.stack([labels == control_label, labels == treatment_label]).astype(
+        float
+    )
+    observed = ~np.isnan(data)
+    filled = np.where(observed, data, 0.0)
+
+    counts = indicator @ observed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = (indicator @ filled) / counts
+        # Centered second pass: each row minus the mean of its own group
+        row_means = indicator.T @ np.nan_to_num(means)
+        deviations = np.where(observed, data - row_means, 0.0)
+        variances = (indicator @ deviations**2) / (counts - 1)
+
+    effects = welch_moments(
+        counts[0], means[0], variances[0], counts[1], means[1], variances[1], alpha
+    )
+    result = pd.DataFrame(
+        {
+            "n_control": counts[0].astype(int),
+            "n_treatment": counts[1].astype(int),
+            "mean_control": means[0],
+            "mean_treatment": means[1],
+            **effects,
+        },
+        index=pd.Index(metric_names, name="metric"),
+    )
+    result["significant"] = result["p_value"] < alpha
+    logger.info(
+        f"Batched Welch t-test: {int(result['significant'].sum())}/{len(result)} metrics significant"
+    )
     return result
 
 
@@ -62,61 +118,117 @@ def bootstrap_ci(
     group_col: str = "group",
     n_boot: int = 10_000,
     alpha: float = 0.05,
+    metric: str = "mean_diff",
+    ci_method: str = "percentile",
+    chunk_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
+    **params: Any,
 ) -> dict[str, Any]:
     """
-    Percentile bootstrap confidence interval for mean difference.
-    """
-    control = df[df[group_col] == "control"][metric_col].values
-    treatment = df[df[group_col] == "treatment"][metric_col].values
+    Bootstrap confidence interval for any registered metric (mean difference
+    by default). See ``stats.bootstrap.bootstrap_distribution``.
 
-    def boot_diff() -> float:
-        c_sample = np.random.choice(control, size=len(control), replace=True)
-        t_sample = np.random.choice(treatment, size=len(treatment), replace=True)
-        return float(t_sample.mean() - c_sample.mean())
-
-    boot_diffs = np.array([boot_diff() for _ in range(n_boot)])
-    ci_lower = np.percentile(boot_diffs, (alpha / 2) * 100)
-    ci_upper = np.percentile(boot_diffs, (1 - alpha / 2) * 100)
+    ci_method: "percentile", "bca" (bias-corrected and accelerated, with the
+    acceleration from a closed-form jackknife where available) or "t"
+    (studentized; metrics with an analytic SE such as mean_diff and sum)
+    """
+    if ci_method not in ("percentile", "bca", "t"):
+        raise ValueError("ci_method must be 'percentile', 'bca' or 't'")
+    labelled = {"control_label": control_label, "treatment_label": treatment_label}
+    estimate, boot_diffs = bootstrap_distribution(
+        df,
+        metric_col,
+        group_col,
+        metric=metric,
+        n_boot=n_boot,
+        chunk_size=chunk_size,
+        n_jobs=n_jobs,
+        seed=seed,
+        studentized=ci_method == "t",
+        **labelled,
+        **params,
+    )
+    if ci_method == "bca":
+        jackknife = jackknife_values(
+            df, metric_col, group_col, metric, **labelled, **params
+        )
+        ci_lower, ci_upper = bca_interval(
+            estimate, boot_diffs, acceleration(jackknife), alpha
+        )
+    elif ci_method == "t":
+        name = metric_registry.resolve(metric)
+        control, treatment = split_groups(df, metric_col, group_col, **labelled)
+        std_error = float(array_std_error(name)(control, treatment))  # type: ignore[misc]
+        ci_lower, ci_upper = studentized_interval(
+            estimate, std_error, boot_diffs, alpha
+        )
+    else:
+        ci_lower = float(np.percentile(boot_diffs, (alpha / 2) * 100))
+        ci_upper = float(np.percentile(boot_diffs, (1 - alpha / 2) * 100))
 
     result = {
         "method": "bootstrap",
-        "mean_diff": float(treatment.mean() - control.mean()),
+        "metric": metric,
+        "ci_method": ci_method,
+        "estimate": estimate,
         "ci_95": [float(ci_lower), float(ci_upper)],
         "n_boot": n_boot,
-        "significant": (ci_lower > 0) or (ci_upper < 0),
+        "significant": bool((ci_lower > 0) or (ci_upper < 0)),
     }
+    if metric_registry.resolve(metric) == "mean_diff":
+        result["mean_diff"] = estimate
     logger.info(
-        f"Bootstrap: diff={result['mean_diff']:.3f}, CI=[{ci_lower:.3f}, {ci_upper:.3f}]"
+        f"Bootstrap ({metric}, {ci_method}): estimate={estimate:.3f}, "
+        f"CI=[{ci_lower:.3f}, {ci_upper:.3f}]"
     )
     return result
 
 
 def permutation_test(
-    df: pd.DataFrame, metric_col: str, group_col: str = "group", n_perm: int = 5_000
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    n_perm: int = 5_000,
+    alpha: float = 0.05,
+    early_stop: bool = True,
+    chunk_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    control_label: str = "control",
+    treatment_label: str = "treatment",
 ) -> dict[str, Any]:
     """
     Permutation test for difference in means.
+    Batched and optionally parallel (see ``stats.permutation``); with
+    ``early_stop`` fewer than ``n_perm`` permutations are drawn once the
+    p-value is clearly above or below ``alpha``. The input is not modified.
     """
-    observed = metric_registry.call("mean", df, group_col, metric_col)
-    combined = df[metric_col].values
-    group_labels = df[group_col].values
-    sum(group_labels == "treatment")
-
-    perm_diffs = []
-    for _ in range(n_perm):
-        np.random.shuffle(group_labels)
-        perm_treat = combined[group_labels == "treatment"]
-        perm_control = combined[group_labels == "control"]
-        perm_diffs.append(perm_treat.mean() - perm_control.mean())
-
-    p_value = (np.abs(perm_diffs) >= np.abs(observed)).mean()
+    labels = df[group_col].to_numpy()
+    values = df[metric_col].to_numpy(dtype=float)
+    keep = np.isin(labels, [control_label, treatment_label]) & ~np.isnan(values)
+
+    observed, perm_diffs = permutation_distribution(
+        values[keep],
+        labels[keep] == treatment_label,
+        n_perm=n_perm,
+        chunk_size=chunk_size,
+        n_jobs=n_jobs,
+        seed=seed,
+        alpha=alpha if early_stop else None,
+    )
+    p_value = float(count_extreme(perm_diffs, observed)[0]) / len(perm_diffs)
 
     result = {
         "method": "permutation_test",
-        "observed_diff": float(observed),
-        "p_value": float(p_value),
-        "n_perm": n_perm,
-        "significant": p_value < 0.05,
+        "observed_diff": float(observed[0]),
+        "p_value": p_value,
+        "n_perm": len(perm_diffs),
+        "significant": p_value < alpha,
     }
-    logger.info(f"Permutation test: obs={observed:.3f}, p={p_value:.3f}")
+    logger.info(
+        f"Permutation test: obs={observed[0]:.3f}, p={p_value:.3f} ({len(perm_diffs)} permutations)"
+    )
     return result
@@ -1,68 +1,384 @@
+from collections.abc import Iterable
 from typing import Any
 
+import numpy as np
 import pandas as pd
-import statsmodels.formula.api as smf
+import statsmodels.api as sm
 from loguru import logger
 from numpy.linalg import LinAlgError
+from numpy.typing import ArrayLike, NDArray
+from scipy import linalg, stats
 
+COV_TYPES = ("nonrobust", "HC0", "HC1", "HC2", "HC3")
+# Smallest |R_jj| relative to the largest before a design counts as rank deficient
+RANK_TOL = 1e-10
 
-def ancova(
-    df: pd.DataFrame, outcome_col: str, baseline_col: str, group_col: str = "group"
-) -> dict[str, Any]:
+
+def ols_fit(X: ArrayLike, y: ArrayLike, cov_type: str = "nonrobust") -> dict[str, Any]:
     """
-    Analysis of Covariance (ANCOVA) with baseline as covariate.
+    Least squares through a thin QR decomposition X = QR, without formulas.
+
+    (X'X)^-1 is R^-1 R^-T, so the classical covariance never forms X'X, and
+    the robust (sandwich) ones only need Q: HC0 uses the squared residuals,
+    HC1 scales HC0 by n / (n - k), HC2 and HC3 divide the squared residuals
+    by (1 - h) and (1 - h)^2 with leverages h = row sums of Q^2.
     """
-    df = df.copy()
-    df["treatment"] = (df[group_col] == "treatment").astype(int)
+    if cov_type not in COV_TYPES:
+        raise ValueError(f"cov_type must be one of {COV_TYPES}")
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, k = X.shape
+    if n <= k:
+        raise ValueError("More observations than coefficients required")
 
-    formula = f"{outcome_col} ~ treatment + {baseline_col}"
-    model = smf.ols(formula, data=df).fit()
+    q, r = np.linalg.qr(X)
+    diag = np.abs(np.diag(r))
+    if diag.min() <= RANK_TOL * diag.max():
+        raise ValueError("Design matrix is rank deficient")
+    params = linalg.solve_triangular(r, q.T @ y)
+    resid = y - X @ params
+    r_inv = linalg.solve_triangular(r, np.eye(k))
+    dof = n - k
 
-    coef = model.params["treatment"]
-    se = model.bse["treatment"]
-    p_value = model.pvalues["treatment"]
-    ci = model.conf_int().loc["treatment"].tolist()
+    if cov_type == "nonrobust":
+        cov = r_inv @ r_inv.T * (resid @ resid) / dof
+    else:
+        weights = resid**2
+        if cov_type in ("HC2", "HC3"):
+            leverage = np.einsum("ij,ij->i", q, q)
+            weights = weights / (1 - leverage) ** (2 if cov_type == "HC3" else 1)
+        cov = r_inv @ ((q.T * weights) @ q) @ r_inv.T
+        if cov_type == "HC1":
+            cov *= n / dof
 
-    result = {
+    centered = y - y.mean()
+    r_squared = 1 - (resid @ resid) / (centered @ centered)
+    return {
+        "params": np.asarray(params),
+        "std_errors": np.sqrt(np.diag(cov)),
+        "cov": np.asarray(cov),
+        "df_resid": dof,
+        "r_squared": float(r_squared),
+        "adj_r_squared": float(1 - (n - 1) / dof * (1 - r_squared)),
+    }
+
+
+def _coefficient_tests(
+    fit: dict[str, Any], alpha: float = 0.05
+) -> dict[str, NDArray[np.float64]]:
+    """t-statistics, p-values and CI bounds of every coefficient of ``ols_fit``."""
+    params, se, dof = fit["params"], fit["std_errors"], fit["df_resid"]
+    t_stat = params / se
+    crit = stats.t.ppf(1 - alpha / 2, dof)
+    return {
+        "t_statistic": t_stat,
+        "p_value": 2 * stats.t.sf(np.abs(t_stat), dof),
+        "ci_lower": params - crit * se,
+        "ci_upper": params + crit * se,
+    }
+
+
+def _treatment_result(fit: dict[str, Any], cov_type: str) -> dict[str, Any]:
+    """ANCOVA result for the treatment coefficient (column 1) of a fit."""
+    tests = _coefficient_tests(fit)
+    p_value = tests["p_value"][1]
+    return {
         "method": "ANCOVA",
-        "coefficient": float(coef),
-        "std_error": float(se),
+        "coefficient": float(fit["params"][1]),
+        "std_error": float(fit["std_errors"][1]),
         "p_value": float(p_value),
-        "ci_95": [float(ci[0]), float(ci[1])],
-        "r_squared": float(model.rsquared),
+        "ci_95": [float(tests["ci_lower"][1]), float(tests["ci_upper"][1])],
+        "r_squared": fit["r_squared"],
+        "cov_type": cov_type,
         "significant": p_value < 0.05,
     }
-    logger.info(f"ANCOVA: β={coef:.4f}, p={p_value:.3f}, R²={model.rsquared:.3f}")
+
+
+def design_matrix(
+    df: pd.DataFrame,
+    outcome_col: str,
+    predictors: list[str],
+    group_col: str = "group",
+    treatment_label: str = "treatment",
+) -> tuple[NDArray[np.float64], NDArray[np.float64], list[str]]:
+    """
+    Outcome vector, design matrix and column names for an intercept, a
+    treatment indicator and ``predictors``, straight from the DataFrame
+    columns. Non-numeric predictors get treatment-coded dummies named
+    ``col[T.level]`` as in formulas; rows with missing values are dropped.
+    """
+    y = df[outcome_col].to_numpy(dtype=float)
+    complete = ~np.isnan(y)
+    columns = [np.ones(len(df)), (df[group_col] == treatment_label).to_numpy()]
+    names = ["Intercept", "treatment"]
+    for col in predictors:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values
+        ):
+            x = values.to_numpy(dtype=float)
+            complete &= ~np.isnan(x)
+            columns.append(x)
+            names.append(col)
+            continue
+        categories = pd.Categorical(values)
+        complete &= categories.codes >= 0
+        for code, level in enumerate(categories.categories[1:], start=1):
+            columns.append(categories.codes == code)
+            names.append(f"{col}[T.{level}]")
+
+    X = np.empty((len(df), len(columns)))
+    for j, column in enumerate(columns):
+        X[:, j] = column
+    if not complete.all():
+        X, y = X[complete], y[complete]
+    return y, X, names
+
+
+def ancova(
+    df: pd.DataFrame,
+    outcome_col: str,
+    baseline_col: str,
+    group_col: str = "group",
+    cov_type: str = "nonrobust",
+    treatment_label: str = "treatment",
+) -> dict[str, Any]:
+    """
+    Analysis of Covariance (ANCOVA) with baseline as covariate.
+    ``cov_type`` selects classical or heteroskedasticity-robust (HC0-HC3)
+    standard errors.
+    """
+    y, X, _ = design_matrix(df, outcome_col, [baseline_col], group_col, treatment_label)
+    result = _treatment_result(ols_fit(X, y, cov_type), cov_type)
+    logger.info(
+        f"ANCOVA: β={result['coefficient']:.4f}, p={result['p_value']:.3f}, "
+        f"R²={result['r_squared']:.3f}"
+    )
     return result
 
 
 def ols_regression(
-    df: pd.DataFrame, outcome_col: str, predictors: list[str], group_col: str = "group"
+    df: pd.DataFrame,
+    outcome_col: str,
+    predictors: list[str],
+    group_col: str = "group",
+    cov_type: str = "nonrobust",
+    summary: bool = False,
+    treatment_label: str = "treatment",
 ) -> dict[str, Any]:
     """
-    General OLS with treatment and covariates.
+    General OLS with treatment and covariates (see ``ols_fit``).
+    The statsmodels summary table is only built when ``summary`` is set.
     """
-    df = df.copy()
-    df["treatment"] = (df[group_col] == "treatment").astype(int)
-    predictors = ["treatment"] + [p for p in predictors if p != group_col]
-
-    formula = f"{outcome_col} ~ " + " + ".join(predictors)
-    model = smf.ols(formula, data=df).fit()
+    predictors = [p for p in predictors if p != group_col]
+    y, X, names = design_matrix(df, outcome_col, predictors, group_col, treatment_label)
+    fit = ols_fit(X, y, cov_type)
+    tests = _coefficient_tests(fit)
 
     result = {
         "method": "OLS",
-        "coefficients": {k: float(v) for k, v in model.params.items()},
-        "p_values": {k: float(v) for k, v in model.pvalues.items()},
-        "r_squared": float(model.rsquared),
-        "adj_r_squared": float(model.rsquared_adj),
-        "summary": model.summary().as_text(),
+        "coefficients": dict(zip(names, fit["params"].tolist(), strict=True)),
+        "std_errors": dict(zip(names, fit["std_errors"].tolist(), strict=True)),
+        "p_values": dict(zip(names, tests["p_value"].tolist(), strict=True)),
+        "r_squared": fit["r_squared"],
+        "adj_r_squared": fit["adj_r_squared"],
+        "cov_type": cov_type,
     }
+    if summary:
+        model = sm.OLS(y, pd.DataFrame(X, columns=names))
+        result["summary"] = model.fit(cov_type=cov_type, use_t=True).summary().as_text()
     logger.info(
-        f"OLS: R²={model.rsquared:.3f}, treatment p={model.pvalues['treatment']:.3f}"
+        f"OLS: R²={fit['r_squared']:.3f}, "
+        f"treatment p={result['p_values']['treatment']:.3f}"
     )
     return result
 
 
+class StreamingOLS:
+    """
+    Mergeable least-squares accumulator for data that does not fit in memory.
+
+    The first chunk fixes a reference frame: column means of the design of
+    ``design_matrix`` (intercept, treatment, numeric ``predictors``) and of
+    the outcome, and that chunk's least-squares fit. Every row then adds the
+    cross products of z = (shifted design, residual from the reference fit),
+    so nothing is summed around large raw values and the remaining solve
+    (Cholesky of the centered Gram matrix) is only a small correction.
+    With ``robust`` the fourth-order cross products of z are kept as well,
+    which give the sandwich meat sum e^2 xx' exactly for any final fit, so
+    HC0 and HC1 need one pass. HC2 and HC3 need every row's leverage and are
+    not available.
+
+    Chunks are folded in with ``update``; accumulators built in separate
+    processes are combined with ``merge``, which maps the other's moments
+    into this frame (z transforms linearly between frames).
+    """
+
+    COV_TYPES = ("nonrobust", "HC0", "HC1")
+
+    def __init__(
+        self,
+        outcome_col: str,
+        predictors: list[str],
+        group_col: str = "group",
+        treatment_label: str = "treatment",
+        robust: bool = True,
+    ):
+        self.outcome_col = outcome_col
+        self.predictors = list(predictors)
+        self.group_col = group_col
+        self.treatment_label = treatment_label
+        self.robust = robust
+        self.names = ["Intercept", "treatment", *self.predictors]
+        k = len(self.names)
+        # Reference frame, set by the first non-empty chunk
+        self.shift: NDArray[np.float64] | None = None
+        self.y_shift = 0.0
+        self.reference = np.zeros(k)
+        # sum z z' and, flattened over pairs, sum (z z')(z z')'
+        self.moments = np.zeros((k + 1, k + 1))
+        self.fourth = np.zeros(((k + 1) ** 2, (k + 1) ** 2))
+
+    @property
+    def n(self) -> int:
+        # z[0] is the intercept, so sum z z'[0, 0] counts the rows
+        return int(round(self.moments[0, 0]))
+
+    def update(self, df: pd.DataFrame) -> "StreamingOLS":
+        """Fold one chunk of rows into the accumulated moments."""
+        y, X, names = design_matrix(
+            df, self.outcome_col, self.predictors, self.group_col, self.treatment_label
+        )
+        if names != self.names:
+            raise ValueError("StreamingOLS supports numeric predictors only")
+        if not len(y):
+            return self
+        if self.shift is None:
+            self.shift = X.mean(axis=0)
+            self.shift[0] = 0.0
+            self.y_shift = float(y.mean())
+            self.reference = np.linalg.lstsq(
+                X - self.shift, y - self.y_shift, rcond=None
+            )[0]
+        centered = X - self.shift
+        z = np.column_stack([centered, y - self.y_shift - centered @ self.reference])
+        self.moments += z.T @ z
+        if self.robust:
+            pairs = (z[:, :, None] * z[:, None, :]).reshape(len(z), -1)
+            self.fourth += pairs.T @ pairs
+        return self
+
+    def merge(self, other: "StreamingOLS") -> "StreamingOLS":
+        """Add the moments of an accumulator built on disjoint rows."""
+        settings = ("names", "outcome_col", "group_col", "treatment_label", "robust")
+        if any(getattr(other, attr) != getattr(self, attr) for attr in settings):
+            raise ValueError("Cannot merge regressions with different settings")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+            self.y_shift = other.y_shift
+            self.reference = other.reference.copy()
+        # other's z to this z: shifted columns differ by a multiple of the
+        # intercept, and the residuals by a linear function of the design
+        k = len(self.names)
+        to_design = np.eye(k)
+        to_design[:, 0] += other.shift - self.shift
+        transform = np.eye(k + 1)
+        transform[:k, :k] = to_design
+        transform[k, :k] = other.reference - to_design.T @ self.reference
+        transform[k, 0] += other.y_shift - self.y_shift
+        self.moments += transform @ other.moments @ transform.T
+        if self.robust:
+            pairs = np.kron(transform, transform)
+            self.fourth += pairs @ other.fourth @ pairs.T
+        return self
+
+    def fit(self, cov_type: str = "nonrobust") -> dict[str, Any]:
+        """Coefficients and covariance in the shape of ``ols_fit``."""
+        if cov_type not in self.COV_TYPES:
+            raise ValueError(f"cov_type must be one of {self.COV_TYPES}")
+        if cov_type != "nonrobust" and not self.robust:
+            raise ValueError(f"{cov_type} requires an accumulator with robust=True")
+        k, n = len(self.names), self.n
+        if self.shift is None or n <= k:
+            raise ValueError("More observations than coefficients required")
+        gram, cross = self.moments[:k, :k], self.moments[:k, k]
+        try:
+            factor = linalg.cho_factor(gram)
+        except LinAlgError as e:
+            raise ValueError("Design matrix is rank deficient") from e
+        # Correction to the reference fit, and the residual sum of squares
+        delta = linalg.cho_solve(factor, cross)
+        ssr = self.moments[k, k] - delta @ cross
+        bread = linalg.cho_solve(factor, np.eye(k))
+        dof = n - k
+
+        if cov_type == "nonrobust":
+            cov = bread * ssr / dof
+        else:
+            # The final residual is w'z with w = (-delta, 1)
+            w = np.append(-delta, 1.0)
+            meat = (self.fourth @ np.kron(w, w)).reshape(k + 1, k + 1)[:k, :k]
+            cov = bread @ meat @ bread
+            if cov_type == "HC1":
+                cov *= n / dof
+
+        # Back from shifted columns: only the intercept changes
+        to_original = np.eye(k)
+        to_original[0, 1:] = -self.shift[1:]
+        params = to_original @ (self.reference + delta)
+        params[0] += self.y_shift
+        cov = to_original @ cov @ to_original.T
+
+        # y - y_shift = v'z with v = (reference, 1)
+        v = np.append(self.reference, 1.0)
+        tss = v @ self.moments @ v - (v @ self.moments[:, 0]) ** 2 / n
+        r_squared = 1 - ssr / tss
+        return {
+            "params": np.asarray(params),
+            "std_errors": np.sqrt(np.diag(cov)),
+            "cov": np.asarray(cov),
+            "df_resid": dof,
+            "r_squared": float(r_squared),
+            "adj_r_squared": float(1 - (n - 1) / dof * (1 - r_squared)),
+        }
+
+    def result(self, cov_type: str = "nonrobust") -> dict[str, Any]:
+        """Treatment effect in the same shape as ``ancova``."""
+        result = _treatment_result(self.fit(cov_type), cov_type)
+        logger.info(
+            f"Streaming OLS ({self.n:,} rows): β={result['coefficient']:.4f}, "
+            f"p={result['p_value']:.3f}"
+        )
+        return result
+
+
+def streaming_ancova(
+    chunks: Iterable[pd.DataFrame],
+    outcome_col: str,
+    baseline_col: str,
+    group_col: str = "group",
+    cov_type: str = "nonrobust",
+    treatment_label: str = "treatment",
+) -> dict[str, Any]:
+    """
+    ANCOVA over an iterable of DataFrame chunks (e.g. from
+    ``data.io.read_chunks``), never materializing the full dataset; the
+    result equals ``ancova`` on the concatenated rows.
+    """
+    accumulator = StreamingOLS(
+        outcome_col,
+        [baseline_col],
+        group_col,
+        treatment_label,
+        robust=cov_type != "nonrobust",
+    )
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.result(cov_type)
+
+
 def mixed_effects(
     df: pd.DataFrame,
     outcome_col: str,
@@ -0,0 +1,80 @@
+from typing import Any
+
+import pandas as pd
+from loguru import logger
+
+from .adjustments import adjust_p_values
+from .summary import arm_statistics, welch_moments
+
+
+def multi_arm_test(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    control_label: str = "control",
+    treatment_labels: list[str] | None = None,
+    alpha: float = 0.05,
+    correction: str = "holm",
+) -> dict[str, Any]:
+    """
+    Welch's t-test of every treatment arm against control.
+
+    Per-arm statistics are computed once; all arm-vs-control contrasts are then
+    formed as vectorized operations and their p-values adjusted for multiple
+    comparisons (``correction``: holm, bonferroni, hochberg, bh, by, hommel or none).
+    """
+    arm_stats = arm_statistics(df, metric_col, group_col)
+    if treatment_labels is None:
+        treatment_labels = [str(arm) for arm in arm_stats.index if arm != control_label]
+    if control_label not in arm_stats.index:
+        raise ValueError(f"Control arm '{control_label}' not found in {group_col}")
+    missing = [arm for arm in treatment_labels if arm not in arm_stats.index]
+    if missing:
+        raise ValueError(f"Treatment arms not found in {group_col}: {missing}")
+
+    control = arm_stats.loc[control_label]
+    treated = arm_stats.loc[treatment_labels]
+    effects = welch_moments(
+        control["n"],
+        control["mean"],
+        control["var"],
+        treated["n"],
+        treated["mean"],
+        treated["var"],
+        alpha,
+    )
+    p_values = effects["p_value"]
+    if correction == "none":
+        adjusted = p_values
+    else:
+        adjusted = adjust_p_values(p_values, correction)
+
+    comparisons: list[dict[str, Any]] = [
+        {
+            "arm": arm,
+            "t_statistic": float(effects["t_statistic"][i]),
+            "p_value": float(p_values[i]),
+            "p_value_adjusted": float(adjusted[i]),
+            "df": float(effects["df"][i]),
+            "mean_control": float(control["mean"]),
+            "mean_treatment": float(treated["mean"].iloc[i]),
+            "mean_diff": float(effects["effect"][i]),
+            "ci_95": [float(effects["ci_lower"][i]), float(effects["ci_upper"][i])],
+            "significant": bool(adjusted[i] < alpha),
+            "n_control": int(control["n"]),
+            "n_treatment": int(treated["n"].iloc[i]),
+        }
+        for i, arm in enumerate(treatment_labels)
+    ]
+    result = {
+        "method": "Multi-arm Welch's t-test",
+        "control": control_label,
+        "correction": correction,
+        "alpha": alpha,
+        "comparisons": comparisons,
+    }
+    logger.info(
+        f"Multi-arm test: {sum(c['significant'] for c in comparisons)}/{len(comparisons)} "
+        f"arms significant ({correction})"
+    )
+    return result
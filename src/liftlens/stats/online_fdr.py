@@ -0,0 +1,274 @@
+from abc import ABC, abstractmethod
+from typing import Any, Self
+
+import numpy as np
+from loguru import logger
+from numpy.typing import ArrayLike, NDArray
+from scipy import special
+
+from ..core.registry import ExperimentRegistry
+from ..core.registry import registry as exp_registry
+
+# Normalizing constant of the LORD++ default sequence (as in onlineFDR)
+LORD_GAMMA_SCALE = 0.07720838
+# SAFFRON spends gamma_j proportional to j^-1.6
+SAFFRON_GAMMA_EXPONENT = 1.6
+
+
+def lord_gamma(j: ArrayLike) -> NDArray[np.float64]:
+    """LORD++ spending sequence gamma_j = c log(max(j, 2)) / (j exp(sqrt(log j)))."""
+    j = np.asarray(j, dtype=float)
+    return np.asarray(
+        LORD_GAMMA_SCALE * np.log(np.maximum(j, 2)) / (j * np.exp(np.sqrt(np.log(j))))
+    )
+
+
+def saffron_gamma(j: ArrayLike) -> NDArray[np.float64]:
+    """SAFFRON spending sequence gamma_j = j^-1.6 / zeta(1.6)."""
+    j = np.asarray(j, dtype=float)
+    return np.asarray(j**-SAFFRON_GAMMA_EXPONENT / special.zeta(SAFFRON_GAMMA_EXPONENT))
+
+
+class _OnlineFDR(ABC):
+    """
+    Online FDR procedure over a stream of tests, e.g. one per experiment as
+    its result arrives. Every test gets its level from the state alone (test
+    count, rejection times and the procedure's wealth), never from earlier
+    p-values, and the state is saved in the registry under ``key``.
+    """
+
+    KIND = ""
+    METHOD = ""
+
+    def __init__(
+        self,
+        key: str,
+        alpha: float = 0.05,
+        w0: float | None = None,
+        registry: ExperimentRegistry | None = None,
+    ):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.key = key
+        self.alpha = alpha
+        self.w0 = self._default_w0() if w0 is None else w0
+        if not 0 < self.w0 <= alpha:
+            raise ValueError("w0 must be positive and at most alpha")
+        self.n_tests = 0
+        # 1-based positions of the rejected tests
+        self.rejections: list[int] = []
+        self.registry = registry or exp_registry
+
+    def _default_w0(self) -> float:
+        return self.alpha / 2
+
+    @abstractmethod
+    def level(self) -> float:
+        """Significance level of the next test."""
+
+    def _record(self, p_value: float, level: float, rejected: bool) -> None:  # noqa: B027
+        """Hook run after every test, before the state is saved."""
+
+    def test(self, p_value: float, name: str | None = None) -> dict[str, Any]:
+        """Test the next hypothesis at the current level and update the state."""
+        if not 0 <= p_value <= 1:
+            raise ValueError("p_value must lie in [0, 1]")
+        level = self.level()
+        rejected = bool(p_value <= level)
+        self.n_tests += 1
+        if rejected:
+            self.rejections.append(self.n_tests)
+        self._record(p_value, level, rejected)
+        self.save()
+        logger.debug(
+            f"{self.METHOD} {self.key} test {self.n_tests}: p={p_value:.4g}, "
+            f"level={level:.4g}, rejected={rejected}"
+        )
+        return {
+            "method": self.METHOD,
+            "test": self.n_tests,
+            "name": name,
+            "p_value": float(p_value),
+            "level": level,
+            "rejected": rejected,
+            "n_rejections": len(self.rejections),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "alpha": self.alpha,
+            "w0": self.w0,
+            "n_tests": self.n_tests,
+            "rejections": self.rejections,
+        }
+
+    def save(self) -> None:
+        self.registry.save_state(self.key, self.KIND, self.to_dict())
+
+    @classmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> Self:
+        return cls(key, state["alpha"], state["w0"], registry=registry)
+
+    @classmethod
+    def load(cls, key: str, registry: ExperimentRegistry | None = None) -> Self | None:
+        """Procedure saved under ``key``, or None if there is none yet."""
+        registry = registry or exp_registry
+        state = registry.load_state(key, cls.KIND)
+        if state is None:
+            return None
+        procedure = cls._from_state(key, state, registry)
+        procedure.n_tests = int(state["n_tests"])
+        procedure.rejections = [int(t) for t in state["rejections"]]
+        return procedure
+
+
+class LordPlusPlus(_OnlineFDR):
+    """
+    LORD++ (Ramdas et al., 2017): FDR control under independence.
+
+    alpha_t = gamma_t w0 + (alpha - w0) gamma_{t - tau_1}
+    + alpha sum_{j >= 2} gamma_{t - tau_j} over the rejection times tau_j,
+    so a level costs one pass over the rejections, not over past tests.
+    """
+
+    KIND = "lord_pp"
+    METHOD = "LORD++"
+
+    def _default_w0(self) -> float:
+        return self.alpha / 10
+
+    def level(self) -> float:
+        t = self.n_tests + 1
+        level = self.w0 * lord_gamma(t)
+        if self.rejections:
+            since = t - np.asarray(self.rejections)
+            weights = np.full(len(since), self.alpha)
+            weights[0] -= self.w0
+            level += weights @ lord_gamma(since)
+        return float(level)
+
+
+class Saffron(_OnlineFDR):
+    """
+    SAFFRON (Ramdas et al., 2018): adaptive online FDR control.
+
+    Tests with p <= ``candidate_level`` (lambda in the paper) are candidates,
+    and the spending clock only advances on non-candidates, which pays off
+    when many hypotheses are non-null. w0 must be at most
+    (1 - candidate_level) alpha.
+    """
+
+    KIND = "saffron"
+    METHOD = "SAFFRON"
+
+    def __init__(
+        self,
+        key: str,
+        alpha: float = 0.05,
+        w0: float | None = None,
+        candidate_level: float = 0.5,
+        registry: ExperimentRegistry | None = None,
+    ):
+        if not 0 < candidate_level < 1:
+            raise ValueError("candidate_level must be between 0 and 1")
+        self.candidate_level = candidate_level
+        super().__init__(key, alpha, w0, registry)
+        if self.w0 > (1 - candidate_level) * alpha:
+            raise ValueError("w0 must be at most (1 - candidate_level) * alpha")
+        self.n_candidates = 0
+        # Candidates up to and including each rejection
+        self.candidates_at: list[int] = []
+
+    def _default_w0(self) -> float:
+        return (1 - self.candidate_level) * self.alpha / 2
+
+    def level(self) -> float:
+        t = self.n_tests + 1
+        budget = (1 - self.candidate_level) * self.alpha
+        level = self.w0 * saffron_gamma(t - self.n_candidates)
+        if self.rejections:
+            # Time since each rejection, not counting the candidates since
+            since = (
+                t
+                - np.asarray(self.rejections)
+                - (self.n_candidates - np.asarray(self.candidates_at))
+            )
+            weights = np.full(len(since), budget)
+            weights[0] -= self.w0
+            level += weights @ saffron_gamma(since)
+        return float(np.minimum(self.candidate_level, level))
+
+    def _record(self, p_value: float, level: float, rejected: bool) -> None:
+        if p_value <= self.candidate_level:
+            self.n_candidates += 1
+        if rejected:
+            self.candidates_at.append(self.n_candidates)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "candidate_level": self.candidate_level,
+            "n_candidates": self.n_candidates,
+            "candidates_at": self.candidates_at,
+        }
+
+    @classmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> "Saffron":
+        procedure = cls(
+            key, state["alpha"], state["w0"], state["candidate_level"], registry
+        )
+        procedure.n_candidates = int(state["n_candidates"])
+        procedure.candidates_at = [int(c) for c in state["candidates_at"]]
+        return procedure
+
+
+class AlphaInvesting(_OnlineFDR):
+    """
+    Alpha-investing (Foster and Stine, 2008): mFDR control with O(1) updates.
+
+    The next test spends wealth / (1 + t - k) of the current wealth, with k
+    the last rejection; a non-rejection costs level / (1 - level) and a
+    rejection earns ``payout`` (alpha by default).
+    """
+
+    KIND = "alpha_investing"
+    METHOD = "Alpha-investing"
+
+    def __init__(
+        self,
+        key: str,
+        alpha: float = 0.05,
+        w0: float | None = None,
+        payout: float | None = None,
+        registry: ExperimentRegistry | None = None,
+    ):
+        super().__init__(key, alpha, w0, registry)
+        self.payout = alpha if payout is None else payout
+        if not 0 < self.payout <= alpha:
+            raise ValueError("payout must be positive and at most alpha")
+        self.wealth = self.w0
+
+    def level(self) -> float:
+        last = self.rejections[-1] if self.rejections else 0
+        return float(self.wealth / (1 + self.n_tests + 1 - last))
+
+    def _record(self, p_value: float, level: float, rejected: bool) -> None:
+        if rejected:
+            self.wealth += self.payout
+        else:
+            self.wealth -= level / (1 - level)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**super().to_dict(), "payout": self.payout, "wealth": self.wealth}
+
+    @classmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> "AlphaInvesting":
+        procedure = cls(key, state["alpha"], state["w0"], state["payout"], registry)
+        procedure.wealth = float(state["wealth"])
+        return procedure
@@ -0,0 +1,121 @@
+from functools import partial
+
+import numpy as np
+from loguru import logger
+from numpy.typing import ArrayLike, NDArray
+from scipy import stats
+
+from ..engine.parallel import map_batches, spawn_seeds, split_batches, worker_count
+from .bootstrap import CHUNK_BYTES
+
+# Minimum number of permutations between two early-stopping checks
+CHECK_EVERY = 500
+
+
+def _permutation_chunk(
+    task: tuple[int, np.random.SeedSequence],
+    values: NDArray[np.float64],
+    n_treatment: int,
+) -> NDArray[np.float64]:
+    """
+    Mean differences of ``size`` label permutations for every column of
+    ``values`` (n x k): one (size x n) assignment matrix times the data.
+    """
+    size, seed = task
+    rng = np.random.default_rng(seed)
+    n = len(values)
+    assignment = np.zeros((size, n))
+    assignment[:, :n_treatment] = 1.0
+    assignment = rng.permuted(assignment, axis=1)
+    treatment_sum = assignment @ values
+    control_sum = values.sum(axis=0) - treatment_sum
+    return np.asarray(treatment_sum / n_treatment - control_sum / (n - n_treatment))
+
+
+def count_extreme(
+    perm_diffs: NDArray[np.float64], observed: NDArray[np.float64]
+) -> NDArray[np.int64]:
+    """Per column, permutations at least as extreme as observed (two-sided)."""
+    # Relative tolerance so exact ties are not lost to summation-order rounding
+    threshold = np.abs(observed) * (1 - 1e-9)
+    return np.asarray((np.abs(perm_diffs) >= threshold).sum(axis=0), dtype=np.int64)
+
+
+def _decided(
+    exceed: NDArray[np.int64], done: int, alpha: float, confidence: float
+) -> bool:
+    """True when a Clopper-Pearson interval on every p-value excludes ``alpha``."""
+    tail = (1 - confidence) / 2
+    lower = np.where(exceed > 0, stats.beta.ppf(tail, exceed, done - exceed + 1), 0.0)
+    upper = np.where(
+        exceed < done, stats.beta.ppf(1 - tail, exceed + 1, done - exceed), 1.0
+    )
+    return bool(np.all((upper < alpha) | (lower > alpha)))
+
+
+def permutation_distribution(
+    values: ArrayLike,
+    is_treatment: ArrayLike,
+    n_perm: int = 5_000,
+    chunk_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    alpha: float | None = None,
+    confidence: float = 0.999,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Null distribution of treatment-minus-control mean differences under
+    random relabelling.
+
+    Permutations are generated in memory-bounded chunks (one independent RNG
+    stream per chunk, optionally spread over ``n_jobs`` workers); the input
+    arrays are never modified. ``values`` may be 2-D (n x k) to permute k
+    metrics jointly. When ``alpha`` is given, sampling stops early once a
+    ``confidence``-level interval on every p-value lies entirely above or
+    below ``alpha``.
+
+    Returns:
+        (observed differences of shape (k,), permuted differences (m x k))
+    """
+    data = np.asarray(values, dtype=float)
+    data = data.reshape(len(data), -1)
+    treated = np.asarray(is_treatment, dtype=bool)
+    n_treatment = int(treated.sum())
+    if n_treatment == 0 or n_treatment == len(data):
+        raise ValueError("Both groups need at least one observation")
+
+    # Centering keeps the sums well conditioned without changing the differences
+    data = data - data.mean(axis=0)
+    observed = data[treated].mean(axis=0) - data[~treated].mean(axis=0)
+
+    # Chunks within the memory budget and no larger than one check interval.
+    # The size does not depend on n_jobs, so neither do the random streams.
+    size = chunk_size or min(CHECK_EVERY, max(1, CHUNK_BYTES // (8 * len(data))))
+    sizes = split_batches(n_perm, size)
+    tasks = list(zip(sizes, spawn_seeds(seed, len(sizes)), strict=True))
+    # Without early stopping everything goes out at once; otherwise each round
+    # covers CHECK_EVERY permutations and keeps every worker busy
+    if alpha is None:
+        per_round = max(1, len(tasks))
+    else:
+        per_round = max(worker_count(n_jobs), -(-CHECK_EVERY // size))
+    worker = partial(_permutation_chunk, values=data, n_treatment=n_treatment)
+
+    batches: list[NDArray[np.float64]] = []
+    exceed = np.zeros(data.shape[1], dtype=np.int64)
+    done = 0
+    for start in range(0, len(tasks), per_round):
+        for batch in map_batches(
+            worker, tasks[start : start + per_round], n_jobs=n_jobs
+        ):
+            batches.append(batch)
+            exceed += count_extreme(batch, observed)
+            done += len(batch)
+        if (
+            alpha is not None
+            and done < n_perm
+            and _decided(exceed, done, alpha, confidence)
+        ):
+            logger.debug(f"Permutation test stopped early after {done} permutations")
+            break
+    return observed, np.concatenate(batches)
@@ -1,11 +1,49 @@
+import inspect
 from collections.abc import Callable
+from functools import lru_cache, partial
 from typing import Any
 
 import numpy as np
 from loguru import logger
+from numpy.typing import ArrayLike, NDArray
 from scipy import stats
 
+from ..engine.parallel import map_batches, spawn_seeds, split_batches, worker_count
+from .bootstrap import CHUNK_BYTES
 from .inference import welch_ttest
+from .summary import welch_moments
+
+# Simulations between two Monte Carlo standard-error checks
+CHECK_EVERY = 1_000
+
+# Doublings of the sample-size search step before giving up (n ~ 2**60)
+MAX_DOUBLINGS = 60
+
+BatchGenerator = Callable[
+    [int, int, float, np.random.Generator],
+    tuple[NDArray[np.float64], NDArray[np.float64]],
+]
+
+
+def power_grid(
+    effect_size: ArrayLike,
+    n_control: ArrayLike,
+    n_treatment: ArrayLike | None = None,
+    alpha: ArrayLike = 0.05,
+    two_tailed: bool = True,
+) -> NDArray[np.float64]:
+    """
+    Analytical power of the two-sample t-test (equal variance) over broadcast
+    arrays of effect sizes, group sizes and alphas.
+    """
+    d = np.asarray(effect_size, dtype=float)
+    n_c = np.asarray(n_control, dtype=float)
+    n_t = n_c if n_treatment is None else np.asarray(n_treatment, dtype=float)
+    level = np.asarray(alpha, dtype=float) / (2 if two_tailed else 1)
+    df = n_c + n_t - 2
+    ncp = d * np.sqrt(n_c * n_t / (n_c + n_t))
+    crit = stats.t.ppf(1 - level, df)
+    return np.asarray(stats.nct.sf(crit, df, ncp), dtype=float)
 
 
 def analytical_power(
@@ -19,14 +57,82 @@ def analytical_power(
     Analytical power for two-sample t-test (equal variance assumption).
     """
     n_treatment = n_treatment or n_control
-    df = n_control + n_treatment - 2
-    ncp = effect_size * np.sqrt((n_control * n_treatment) / (n_control + n_treatment))
-    crit = stats.t.ppf(1 - alpha / (1 if not two_tailed else 2), df)
-    power = 1 - stats.nct.cdf(crit, df, ncp)
+    power = float(power_grid(effect_size, n_control, n_treatment, alpha, two_tailed))
     logger.debug(
         f"Analytical power: {power:.3f} (d={effect_size}, n1={n_control}, n2={n_treatment})"
     )
-    return float(power)
+    return power
+
+
+@lru_cache(maxsize=256)
+def _solve_sample_sizes(
+    effect_size: tuple[float, ...],
+    power: tuple[float, ...],
+    alpha: tuple[float, ...],
+    ratio: tuple[float, ...],
+) -> tuple[int, ...]:
+    """
+    Smallest n per control group reaching ``power`` for flattened grid points.
+    Starts from the normal approximation, then steps all points at once until
+    n is the first integer whose t-test power reaches the target.
+    """
+    d = np.abs(np.asarray(effect_size))
+    target = np.asarray(power)
+    level = np.asarray(alpha)
+    r = np.asarray(ratio)
+    z = stats.norm.ppf(1 - level / 2) + stats.norm.ppf(target)
+    n = np.maximum(np.ceil(z**2 * (1 + 1 / r) / d**2), 2.0)
+
+    def reaches(size: NDArray[np.float64]) -> NDArray[np.bool_]:
+        n_t = np.maximum(np.floor(size * r), 1.0)
+        return power_grid(d, size, n_t, level) >= target
+
+    # Grow where the t-test falls short, then shrink while one less still suffices
+    step = np.ones_like(n)
+    short = ~reaches(n)
+    for _ in range(MAX_DOUBLINGS):
+        if not short.any():
+            break
+        n = np.where(short, n + step, n)
+        step = np.where(short, step * 2, step)
+        short = ~reaches(n)
+    if short.any():
+        raise RuntimeError("Sample size search did not converge")
+    low = n - step
+    high = n
+    while np.any(high - low > 1):
+        mid = np.floor((low + high) / 2)
+        ok = reaches(np.maximum(mid, 2.0)) | (mid < 2)
+        high = np.where(ok, mid, high)
+        low = np.where(ok, low, mid)
+    return tuple(int(v) for v in np.maximum(high, 2.0))
+
+
+def sample_size_grid(
+    effect_size: ArrayLike,
+    power: ArrayLike = 0.8,
+    alpha: ArrayLike = 0.05,
+    ratio: ArrayLike = 1.0,
+) -> NDArray[np.int64]:
+    """
+    Minimum sample size per control group over broadcast grids of effect size,
+    power, alpha and allocation ratio (n_treatment = n_control * ratio).
+    Results are cached for recently solved grids.
+    """
+    grids = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (effect_size, power, alpha, ratio))
+    )
+    d, target, level, r = grids
+    if not np.all(np.isfinite(d) & (d != 0)):
+        raise ValueError("effect_size must be finite and non-zero")
+    if not np.all((target > 0) & (target < 1)):
+        raise ValueError("power must be between 0 and 1")
+    if not np.all((level > 0) & (level < 1)):
+        raise ValueError("alpha must be between 0 and 1")
+    if not np.all(np.isfinite(r) & (r > 0)):
+        raise ValueError("ratio must be finite and positive")
+    sizes = _solve_sample_sizes(*(tuple(g.ravel().tolist()) for g in grids))
+    return np.asarray(sizes, dtype=np.int64).reshape(grids[0].shape)
 
 
 def sample_size_for_power(
@@ -35,31 +141,161 @@ def sample_size_for_power(
     """
     Minimum sample size per group for desired power.
     """
-    from scipy.optimize import root_scalar
-
-    def power_diff(n: float) -> float:
-        return analytical_power(effect_size, int(n), int(n * ratio), alpha) - power
-
-    result = root_scalar(power_diff, bracket=[10, 1_000_000])
-    n = int(np.ceil(result.root))
+    n = int(sample_size_grid(effect_size, power, alpha, ratio))
     logger.info(f"Required n={n} per control group for power={power}, d={effect_size}")
     return n
 
 
+def _simulate_once(
+    seed: np.random.SeedSequence,
+    generate_data: Callable[..., Any],
+    effect_size: float,
+    n_per_group: int,
+    alpha: float,
+    pass_rng: bool,
+) -> bool:
+    """One simulated experiment on its own random stream."""
+    if pass_rng:
+        df = generate_data(n_per_group, effect_size, rng=np.random.default_rng(seed))
+    else:
+        # Legacy generators draw from the global state: reseed it per simulation
+        # and hand the caller's state back afterwards
+        state = np.random.get_state()
+        np.random.seed(int(seed.generate_state(1)[0]))
+        try:
+            df = generate_data(n_per_group, effect_size)
+        finally:
+            np.random.set_state(state)
+    result = welch_ttest(df, "outcome", "group", alpha=alpha)
+    return bool(result.get("significant", False))
+
+
 def simulation_power(
-    generate_data: Callable[[int, float], Any],
+    generate_data: Callable[..., Any],
     effect_size: float,
     n_per_group: int,
     n_sim: int = 1000,
     alpha: float = 0.05,
+    seed: int | None = None,
+    n_jobs: int = 1,
 ) -> float:
-    """Monte Carlo power estimation."""
-    significant = 0
-    for _ in range(n_sim):
-        df = generate_data(n_per_group, effect_size)
-        result = welch_ttest(df, "outcome", "group")
-        if result.get("significant", False):
-            significant += 1
+    """
+    Monte Carlo power estimation.
+    Every simulation gets its own seed sequence, passed as ``rng=`` when
+    ``generate_data`` accepts it, so results do not depend on ``n_jobs``.
+    """
+    pass_rng = "rng" in inspect.signature(generate_data).parameters
+    simulate = partial(
+        _simulate_once,
+        generate_data=generate_data,
+        effect_size=effect_size,
+        n_per_group=n_per_group,
+        alpha=alpha,
+        pass_rng=pass_rng,
+    )
+    significant = sum(map_batches(simulate, spawn_seeds(seed, n_sim), n_jobs=n_jobs))
     power = significant / n_sim
     logger.info(f"Simulation power: {power:.3f} ({n_sim} sims, n={n_per_group})")
     return float(power)
+
+
+def normal_batch(
+    n_sims: int, n_per_group: int, effect_size: float, rng: np.random.Generator
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Default batch generator: unit-variance normal outcomes shifted by ``effect_size``."""
+    control = rng.standard_normal((n_sims, n_per_group))
+    treatment = rng.standard_normal((n_sims, n_per_group)) + effect_size
+    return control, treatment
+
+
+def _simulate_batch(
+    task: tuple[int, np.random.SeedSequence],
+    generate_batch: BatchGenerator,
+    effect_size: float,
+    n_per_group: int,
+    alpha: float,
+) -> int:
+    """Number of significant Welch tests in one batch of simulated experiments."""
+    size, seed = task
+    control, treatment = generate_batch(
+        size, n_per_group, effect_size, np.random.default_rng(seed)
+    )
+    result = welch_moments(
+        np.sum(~np.isnan(control), axis=1),
+        np.nanmean(control, axis=1),
+        np.nanvar(control, axis=1, ddof=1),
+        np.sum(~np.isnan(treatment), axis=1),
+        np.nanmean(treatment, axis=1),
+        np.nanvar(treatment, axis=1, ddof=1),
+        alpha,
+    )
+    return int(np.sum(result["p_value"] < alpha))
+
+
+def simulation_power_batch(
+    effect_size: float,
+    n_per_group: int,
+    generate_batch: BatchGenerator | None = None,
+    n_sim: int = 10_000,
+    alpha: float = 0.05,
+    batch_size: int | None = None,
+    n_jobs: int = 1,
+    seed: int | None = None,
+    target_se: float | None = None,
+) -> dict[str, Any]:
+    """
+    Vectorized Monte Carlo power of Welch's t-test.
+
+    ``generate_batch(n_sims, n_per_group, effect_size, rng)`` returns (control,
+    treatment) arrays of shape (n_sims, n); each batch is tested with row-wise
+    reductions. Batches have independent RNG streams and can run on ``n_jobs``
+    workers. With ``target_se``, simulation stops once the Monte Carlo
+    standard error of the power estimate falls below it.
+    """
+    if n_sim < 1:
+        raise ValueError("n_sim must be positive")
+    if n_per_group < 2:
+        raise ValueError("n_per_group must be at least 2")
+    generate_batch = generate_batch or normal_batch
+    size = batch_size or max(1, CHUNK_BYTES // (16 * n_per_group))
+    size = min(size, CHECK_EVERY)
+    sizes = split_batches(n_sim, size)
+    tasks = list(zip(sizes, spawn_seeds(seed, len(sizes)), strict=True))
+    # Without a target every batch goes out at once; otherwise each round
+    # covers CHECK_EVERY simulations and keeps every worker busy
+    if target_se is None:
+        per_round = len(tasks)
+    else:
+        per_round = max(worker_count(n_jobs), -(-CHECK_EVERY // size))
+    simulate = partial(
+        _simulate_batch,
+        generate_batch=generate_batch,
+        effect_size=effect_size,
+        n_per_group=n_per_group,
+        alpha=alpha,
+    )
+
+    significant = done = 0
+    mc_se = np.nan
+    for start in range(0, len(tasks), per_round):
+        batch = tasks[start : start + per_round]
+        significant += sum(map_batches(simulate, batch, n_jobs=n_jobs))
+        done += sum(task_size for task_size, _ in batch)
+        power = significant / done
+        mc_se = float(np.sqrt(max(power * (1 - power), 1 / done) / done))
+        if target_se is not None and mc_se < target_se:
+            break
+
+    result = {
+        "method": "simulation",
+        "power": float(power),
+        "mc_std_error": mc_se,
+        "ci_95": [max(0.0, power - 1.96 * mc_se), min(1.0, power + 1.96 * mc_se)],
+        "n_sim": done,
+        "n_per_group": n_per_group,
+        "effect_size": effect_size,
+    }
+    logger.info(
+        f"Simulation power: {power:.3f} ± {mc_se:.4f} ({done} sims, n={n_per_group})"
+    )
+    return result
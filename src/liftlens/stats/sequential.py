@@ -1,13 +1,135 @@
-from typing import Any
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Self
 
 import numpy as np
+import pandas as pd
 from loguru import logger
-from scipy import stats
+from numpy.typing import ArrayLike, NDArray
+from scipy import optimize, stats
+
+from ..core.registry import ExperimentRegistry
+from ..core.registry import registry as exp_registry
+from ..core.session import session
+from .bayesian import beta_superiority
+from .summary import ArmStats
+
+# Lan-DeMets integration: Simpson grid points per look, and the |z| beyond
+# which the continuation density is treated as zero
+GRID_POINTS = 401
+Z_MAX = 8.0
+
+
+def obf_spending(t: ArrayLike, alpha: float) -> NDArray[np.float64]:
+    """O'Brien-Fleming-type spending function 2 - 2 * Phi(z_{alpha/2} / sqrt(t))."""
+    z = stats.norm.ppf(1 - alpha / 2) / np.sqrt(np.asarray(t, dtype=float))
+    return np.asarray(2 - 2 * stats.norm.cdf(z))
+
+
+def pocock_spending(t: ArrayLike, alpha: float) -> NDArray[np.float64]:
+    """Pocock-type spending function alpha * log(1 + (e - 1) * t)."""
+    return np.asarray(alpha * np.log1p((np.e - 1) * np.asarray(t, dtype=float)))
+
+
+SPENDING_FUNCTIONS: dict[str, Callable[[ArrayLike, float], NDArray[np.float64]]] = {
+    "obf": obf_spending,
+    "pocock": pocock_spending,
+}
+
+
+def _simpson_weights(x: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Composite Simpson weights for an odd number of equally spaced points."""
+    weights = np.ones(len(x))
+    weights[1:-1:2] = 4.0
+    weights[2:-1:2] = 2.0
+    return np.asarray(weights * (x[1] - x[0]) / 3)
+
+
+def _crossing(
+    bound: float,
+    root_t: float,
+    shift: NDArray[np.float64],
+    scale: float,
+    mass: NDArray[np.float64],
+    budget: float = 0.0,
+) -> float:
+    """
+    Probability of continuing to the previous look and then |Z| >= bound,
+    less ``budget`` (the root is the boundary spending exactly the budget).
+    """
+    upper = stats.norm.sf((bound * root_t - shift) / scale)
+    lower = stats.norm.cdf((-bound * root_t - shift) / scale)
+    return float(mass @ (upper + lower)) - budget
+
+
+@lru_cache(maxsize=256)
+def _lan_demets(
+    spending: str, alpha: float, fractions: tuple[float, ...]
+) -> tuple[float, ...]:
+    """
+    Two-sided boundaries spending ``alpha`` at the given information fractions.
+
+    The sub-density of Z on the continuation region is carried from look to
+    look on a Simpson grid (Armitage-McPherson-Rowe recursion), and each
+    boundary is solved so that the probability of first crossing there equals
+    that look's share of the spending function.
+    """
+    t = np.asarray(fractions)
+    budgets = np.diff(SPENDING_FUNCTIONS[spending](t, alpha), prepend=0.0)
+    # Before the first look the score sum is exactly zero
+    z, mass, t_prev = np.zeros(1), np.ones(1), 0.0
+    bounds = []
+    for t_k, budget in zip(t, budgets, strict=True):
+        root_t, scale = np.sqrt(t_k), np.sqrt(t_k - t_prev)
+        shift = z * np.sqrt(t_prev)
+        args = (root_t, shift, scale, mass)
+        if budget <= 0 or _crossing(Z_MAX, *args) >= budget:
+            bound = np.inf
+        elif _crossing(0.0, *args) <= budget:
+            bound = 0.0
+        else:
+            bound = optimize.brentq(
+                _crossing, 0.0, Z_MAX, args=(*args, budget), xtol=1e-10
+            )
+        bounds.append(float(bound))
+
+        edge = max(min(bound, Z_MAX), 1e-8)
+        x = np.linspace(-edge, edge, GRID_POINTS)
+        kernel = stats.norm.pdf((x[:, None] * root_t - shift) / scale) * root_t / scale
+        z, mass, t_prev = x, _simpson_weights(x) * (kernel @ mass), t_k
+    return tuple(bounds)
+
+
+def lan_demets_boundaries(
+    fractions: ArrayLike, alpha: float = 0.05, spending: str = "obf"
+) -> NDArray[np.float64]:
+    """
+    Exact group-sequential z boundaries from a Lan-DeMets spending function.
+
+    Unlike the closed-form OBF and Pocock approximations, these account for
+    the correlation between looks, so the overall two-sided type I error is
+    ``alpha``. Boundaries are cached by (spending function, alpha, fractions),
+    as experiments sharing a look schedule need only one integration.
+
+    Args:
+        fractions: Strictly increasing information fractions in (0, 1]
+        spending: "obf" (O'Brien-Fleming-type) or "pocock" (Pocock-type)
+    """
+    t = np.asarray(fractions, dtype=float).ravel()
+    if spending not in SPENDING_FUNCTIONS:
+        raise ValueError(f"spending must be one of {list(SPENDING_FUNCTIONS)}")
+    if len(t) == 0 or t[0] <= 0 or t[-1] > 1 or np.any(np.diff(t) <= 0):
+        raise ValueError("fractions must be strictly increasing in (0, 1]")
+    return np.array(_lan_demets(spending, float(alpha), tuple(t.tolist())))
 
 
 class SequentialTest:
     """
     Sequential testing with alpha-spending (OBF, Pocock) or Bayesian monitoring.
+
+    method: "obf" or "pocock" for the closed-form per-look approximations, or
+        "ld_obf" / "ld_pocock" for exact Lan-DeMets spending boundaries
     """
 
     def __init__(self, method: str = "obf", alpha: float = 0.05, power: float = 0.9):
@@ -28,16 +150,19 @@ class SequentialTest:
         if self.stopped:
             raise ValueError("Test already stopped")
 
-        self.look_times.append(look_time)
-        self.z_scores.append(z_score)
-
+        # Work out the boundary before touching any state, so a rejected look
+        # leaves the test as it was
         if self.method == "obf":
             boundary = self._obf_boundary(look_time)
         elif self.method == "pocock":
-            boundary = self._pocock_boundary(len(self.look_times))
+            boundary = self._pocock_boundary(len(self.look_times) + 1)
+        elif self.method in ("ld_obf", "ld_pocock"):
+            boundary = self._lan_demets_boundary(look_time)
         else:
-            raise ValueError("Method must be 'obf' or 'pocock'")
+            raise ValueError("Method must be 'obf', 'pocock', 'ld_obf' or 'ld_pocock'")
 
+        self.look_times.append(look_time)
+        self.z_scores.append(z_score)
         self.boundaries.append(boundary)
 
         crossed = abs(z_score) > boundary
@@ -59,6 +184,23 @@ class SequentialTest:
         )
         return result
 
+    def _lan_demets_boundary(self, t: float) -> float:
+        """
+        Lan-DeMets boundary of a look at fraction ``t``. A look at the same
+        fraction as the last one (e.g. repeated once the planned sample is
+        reached) carries no new information, so it spends no more alpha and
+        keeps the last boundary.
+        """
+        if not 0 < t <= 1:
+            raise ValueError("look_time must be in (0, 1]")
+        if self.look_times and t < self.look_times[-1]:
+            raise ValueError("look_time must not decrease between looks")
+        if self.look_times and t == self.look_times[-1]:
+            return self.boundaries[-1]
+        # Repeated looks appear once in the spending schedule
+        fractions = [*dict.fromkeys(self.look_times), t]
+        return float(lan_demets_boundaries(fractions, self.alpha, self.method[3:])[-1])
+
     def _obf_boundary(self, t: float) -> float:
         """O'Brien-Fleming boundary."""
         if t <= 0 or t > 1:
@@ -78,6 +220,302 @@ class SequentialTest:
             result["decision"] = "fail_to_reject"
         return result
 
+    def to_dict(self) -> dict[str, Any]:
+        """Settings and looks so far, as JSON-serializable state."""
+        return {
+            "method": self.method,
+            "alpha": self.alpha,
+            "power": self.power,
+            "look_times": self.look_times,
+            "z_scores": self.z_scores,
+            "boundaries": self.boundaries,
+            "stopped": self.stopped,
+            "decision": self.decision,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "SequentialTest":
+        """Rebuild a test from ``to_dict`` output."""
+        test = cls(state["method"], state["alpha"], state["power"])
+        test.look_times = list(state["look_times"])
+        test.z_scores = list(state["z_scores"])
+        test.boundaries = list(state["boundaries"])
+        test.stopped = bool(state["stopped"])
+        test.decision = state["decision"]
+        return test
+
+
+def _merge_moments(
+    moments: NDArray[np.float64], other: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Combine two (n, mean, sum of squared deviations) summaries."""
+    n_a, mean_a, m2_a = moments
+    n_b, mean_b, m2_b = other
+    n = n_a + n_b
+    if n == 0:
+        return np.array(moments, dtype=float)
+    delta = mean_b - mean_a
+    return np.array(
+        [n, mean_a + delta * n_b / n, m2_a + m2_b + delta**2 * n_a * n_b / n]
+    )
+
+
+class _StreamingArms(ABC):
+    """
+    Running per-arm count, mean and sum of squared deviations of one metric,
+    saved in the registry under ``key`` after every update.
+    """
+
+    KIND = ""
+
+    def __init__(
+        self,
+        key: str,
+        control_label: str = "control",
+        treatment_label: str = "treatment",
+        registry: ExperimentRegistry | None = None,
+    ):
+        self.key = key
+        self.labels = (control_label, treatment_label)
+        # rows: control, treatment; columns: n, mean, sum of squared deviations
+        self.moments = np.zeros((2, 3))
+        self.registry = registry or exp_registry
+
+    def update(
+        self, df: pd.DataFrame, metric_col: str, group_col: str = "group"
+    ) -> Self:
+        """Fold one batch of rows into the running per-arm moments: O(batch)."""
+        values = df[metric_col].to_numpy(dtype=float)
+        labels = df[group_col].to_numpy()
+        for arm, label in enumerate(self.labels):
+            batch = values[(labels == label) & ~np.isnan(values)]
+            if len(batch):
+                mean = batch.mean()
+                summary = np.array([len(batch), mean, np.square(batch - mean).sum()])
+                self.moments[arm] = _merge_moments(self.moments[arm], summary)
+        self._refresh()
+        self.save()
+        return self
+
+    def update_stats(self, control: ArmStats, treatment: ArmStats) -> Self:
+        """Fold pre-aggregated batch moments ("n", "mean", "var") per arm: O(1)."""
+        for arm, batch in enumerate((control, treatment)):
+            n = batch["n"]
+            summary = np.array([n, batch["mean"], batch["var"] * max(n - 1, 0)])
+            self.moments[arm] = _merge_moments(self.moments[arm], summary)
+        self._refresh()
+        self.save()
+        return self
+
+    def _refresh(self) -> None:  # noqa: B027
+        """Hook run after every update, before the state is saved."""
+
+    def _welch(self) -> tuple[float, float]:
+        """Difference in means and its (Welch) variance for the data so far."""
+        n, mean, m2 = self.moments.T
+        if np.any(n < 2):
+            raise ValueError("At least two observations per arm required")
+        return float(mean[1] - mean[0]), float(np.sum(m2 / (n - 1) / n))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"labels": list(self.labels), "moments": self.moments.tolist()}
+
+    def save(self) -> None:
+        self.registry.save_state(self.key, self.KIND, self.to_dict())
+
+    @classmethod
+    @abstractmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> Self:
+        """Instance with the settings in ``state``; ``load`` restores the moments."""
+
+    @classmethod
+    def load(cls, key: str, registry: ExperimentRegistry | None = None) -> Self | None:
+        """Monitor saved under ``key``, or None if there is none yet."""
+        registry = registry or exp_registry
+        state = registry.load_state(key, cls.KIND)
+        if state is None:
+            return None
+        monitor = cls._from_state(key, state, registry)
+        monitor.moments = np.asarray(state["moments"], dtype=float)
+        return monitor
+
+
+class SequentialMonitor(_StreamingArms):
+    """
+    Incremental sequential test over a stream of data batches.
+
+    Keeps running per-arm count, mean and sum of squared deviations, so an
+    ``update`` costs O(batch) and a look never revisits earlier data. The
+    moments and the ``SequentialTest`` looks are saved in the registry under
+    ``key`` after every update and look; ``load`` picks the monitor up again.
+
+    max_n: planned total sample size over both arms; a look's information
+        fraction is the users seen so far over ``max_n``
+    """
+
+    KIND = "sequential"
+
+    def __init__(
+        self,
+        key: str,
+        max_n: int,
+        method: str = "obf",
+        alpha: float = 0.05,
+        power: float = 0.9,
+        control_label: str = "control",
+        treatment_label: str = "treatment",
+        registry: ExperimentRegistry | None = None,
+    ):
+        if max_n <= 0:
+            raise ValueError("max_n must be positive")
+        super().__init__(key, control_label, treatment_label, registry)
+        self.max_n = max_n
+        self.test = SequentialTest(method, alpha, power)
+
+    def z_score(self) -> float:
+        """Welch z-statistic of the data seen so far."""
+        diff, var = self._welch()
+        return float(diff / np.sqrt(var))
+
+    def look(self) -> dict[str, Any]:
+        """Interim analysis of the data seen so far against the boundary."""
+        n = self.moments[:, 0]
+        result = self.test.add_interim(self.z_score(), min(1.0, n.sum() / self.max_n))
+        result["n_control"], result["n_treatment"] = int(n[0]), int(n[1])
+        self.save()
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "max_n": self.max_n,
+            "test": self.test.to_dict(),
+        }
+
+    @classmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> "SequentialMonitor":
+        control_label, treatment_label = state["labels"]
+        monitor = cls(
+            key,
+            state["max_n"],
+            control_label=control_label,
+            treatment_label=treatment_label,
+            registry=registry,
+        )
+        monitor.test = SequentialTest.from_dict(state["test"])
+        return monitor
+
+
+class ConfidenceSequence(_StreamingArms):
+    """
+    Always-valid confidence sequence for the difference in means (mSPRT).
+
+    Uses the normal-mixture martingale with a N(0, tau^2) mixing distribution
+    over the effect, where tau is ``mixture_sd`` pooled standard deviations.
+    The interval and p-value hold simultaneously over every look, so the
+    results may be checked after any batch without inflating the error rate.
+    Only running per-arm moments are kept; each update is O(1) beyond
+    summarizing the batch, and the state is saved in the registry under ``key``.
+    """
+
+    KIND = "confidence_sequence"
+
+    def __init__(
+        self,
+        key: str,
+        alpha: float = 0.05,
+        mixture_sd: float = 0.1,
+        control_label: str = "control",
+        treatment_label: str = "treatment",
+        registry: ExperimentRegistry | None = None,
+    ):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        if mixture_sd <= 0:
+            raise ValueError("mixture_sd must be positive")
+        super().__init__(key, control_label, treatment_label, registry)
+        self.alpha = alpha
+        self.mixture_sd = mixture_sd
+        # Running intersection of the intervals and minimum of the p-values
+        self.bounds = [-np.inf, np.inf]
+        self.p_value = 1.0
+
+    def _mixture_var(self) -> float:
+        n, _, m2 = self.moments.T
+        return float((self.mixture_sd**2) * m2.sum() / (n.sum() - 2))
+
+    def _refresh(self) -> None:
+        n = self.moments[:, 0]
+        if np.any(n < 2):
+            return
+        diff, var = self._welch()
+        tau_sq = self._mixture_var()
+        if var <= 0 or tau_sq <= 0:
+            return
+        ratio = (var + tau_sq) / var
+        # Normal-mixture boundary: |d| <= sqrt(2 V (V + tau^2) / tau^2
+        # * (log(1 / alpha) + log((V + tau^2) / V) / 2)) for estimate variance V
+        log_term = np.log(1 / self.alpha) + 0.5 * np.log(ratio)
+        half_width = np.sqrt(2 * var * (var + tau_sq) / tau_sq * log_term)
+        self.bounds = [
+            max(self.bounds[0], diff - half_width),
+            min(self.bounds[1], diff + half_width),
+        ]
+        # Mixture likelihood ratio against an effect of zero
+        log_lr = -0.5 * np.log(ratio) + tau_sq * diff**2 / (2 * var * (var + tau_sq))
+        self.p_value = float(min(self.p_value, np.exp(-log_lr), 1.0))
+
+    def result(self) -> dict[str, Any]:
+        """Current estimate with the always-valid interval and p-value."""
+        diff, var = self._welch()
+        n = self.moments[:, 0]
+        result = {
+            "method": "mSPRT confidence sequence",
+            "estimate": diff,
+            "std_error": float(np.sqrt(var)),
+            "ci_95": [float(self.bounds[0]), float(self.bounds[1])],
+            "p_value": self.p_value,
+            "alpha": self.alpha,
+            "significant": self.p_value < self.alpha,
+            "n_control": int(n[0]),
+            "n_treatment": int(n[1]),
+        }
+        logger.debug(
+            f"Confidence sequence {self.key}: {diff:.4f} "
+            f"[{self.bounds[0]:.4f}, {self.bounds[1]:.4f}], p={self.p_value:.4f}"
+        )
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "alpha": self.alpha,
+            "mixture_sd": self.mixture_sd,
+            "bounds": self.bounds,
+            "p_value": self.p_value,
+        }
+
+    @classmethod
+    def _from_state(
+        cls, key: str, state: dict[str, Any], registry: ExperimentRegistry
+    ) -> "ConfidenceSequence":
+        control_label, treatment_label = state["labels"]
+        monitor = cls(
+            key,
+            state["alpha"],
+            state["mixture_sd"],
+            control_label=control_label,
+            treatment_label=treatment_label,
+            registry=registry,
+        )
+        monitor.bounds = [float(b) for b in state["bounds"]]
+        monitor.p_value = float(state["p_value"])
+        return monitor
+
 
 def bayesian_monitoring(
     prior_alpha: float = 1.0,
@@ -87,26 +525,47 @@ def bayesian_monitoring(
     control_n: int = 1,
     treatment_n: int = 1,
     threshold: float = 0.95,
+    seed: int | None = None,
+    method: str = "exact",
+    samples: int = 100_000,
 ) -> dict[str, Any]:
     """
     Bayesian A/B testing: P(treatment > control) > threshold
+    method: "exact" integrates the Beta posteriors numerically
+        (``beta_superiority``); "monte_carlo" compares ``samples`` posterior
+        draws, which use ``seed`` or a fresh child stream of the session.
     """
     post_alpha_c = prior_alpha + control_conversions
     post_beta_c = prior_beta + (control_n - control_conversions)
     post_alpha_t = prior_alpha + treatment_conversions
     post_beta_t = prior_beta + (treatment_n - treatment_conversions)
 
-    # Monte Carlo estimate
-    samples = 100_000
-    control_samples = np.random.beta(post_alpha_c, post_beta_c, samples)
-    treatment_samples = np.random.beta(post_alpha_t, post_beta_t, samples)
-    prob_superior = (treatment_samples > control_samples).mean()
+    if method == "exact":
+        posterior = beta_superiority(
+            post_alpha_c, post_beta_c, post_alpha_t, post_beta_t
+        )
+        prob_superior = float(posterior["prob_treatment_better"])
+        loss_treatment = float(posterior["expected_loss_treatment"])
+        loss_control = float(posterior["expected_loss_control"])
+    elif method == "monte_carlo":
+        rng = session.rng(seed)
+        control_samples = rng.beta(post_alpha_c, post_beta_c, samples)
+        treatment_samples = rng.beta(post_alpha_t, post_beta_t, samples)
+        prob_superior = float((treatment_samples > control_samples).mean())
+        loss_treatment = float(
+            np.maximum(control_samples - treatment_samples, 0).mean()
+        )
+        loss_control = float(np.maximum(treatment_samples - control_samples, 0).mean())
+    else:
+        raise ValueError("method must be 'exact' or 'monte_carlo'")
 
     result = {
         "method": "Bayesian",
         "control_rate": control_conversions / control_n,
         "treatment_rate": treatment_conversions / treatment_n,
-        "prob_treatment_better": float(prob_superior),
+        "prob_treatment_better": prob_superior,
+        "expected_loss_treatment": loss_treatment,
+        "expected_loss_control": loss_control,
         "stop_early": prob_superior > threshold or prob_superior < (1 - threshold),
         "recommendation": "treatment"
         if prob_superior > threshold
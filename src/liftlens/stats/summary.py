@@ -0,0 +1,253 @@
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.typing import ArrayLike, NDArray
+from scipy import stats
+
+# Per-arm sufficient statistics, e.g. a row of ``arm_statistics`` or a warehouse
+# extract: {"n": ..., "mean": ..., "var": ...} (+ "mean_x", "var_x", "cov_xy"
+# for CUPED, or "mean_den", "var_den", "cov" for delta-method ratios)
+ArmStats = Mapping[str, float]
+
+
+def arm_statistics(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    labels: list[str] | None = None,
+) -> pd.DataFrame:
+    """Per-arm n, mean and variance (ddof=1) from a single grouped aggregation."""
+    grouped = df.groupby(group_col, observed=True)[metric_col].agg(
+        ["count", "mean", "var"]
+    )
+    grouped = grouped.rename(columns={"count": "n"})
+    if labels is not None:
+        grouped = grouped.reindex(labels)
+    return grouped
+
+
+def welch_moments(
+    n_c: ArrayLike,
+    mean_c: ArrayLike,
+    var_c: ArrayLike,
+    n_t: ArrayLike,
+    mean_t: ArrayLike,
+    var_t: ArrayLike,
+    alpha: float = 0.05,
+) -> dict[str, NDArray[np.float64]]:
+    """
+    Element-wise Welch t-test from per-group n, mean and (ddof=1) variance.
+    Inputs broadcast, so one call covers any number of segments, arms or metrics.
+    """
+    n_c, mean_c, var_c, n_t, mean_t, var_t = (
+        np.asarray(x, dtype=float) for x in (n_c, mean_c, var_c, n_t, mean_t, var_t)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v_c, v_t = var_c / n_c, var_t / n_t
+        se = np.sqrt(v_c + v_t)
+        effect = mean_t - mean_c
+        dof = (v_c + v_t) ** 2 / (v_c**2 / (n_c - 1) + v_t**2 / (n_t - 1))
+        t_stat = effect / se
+    t_crit = stats.t.ppf(1 - alpha / 2, dof)
+    return {
+        "effect": effect,
+        "std_error": se,
+        "df": dof,
+        "t_statistic": t_stat,
+        "ci_lower": effect - t_crit * se,
+        "ci_upper": effect + t_crit * se,
+        "p_value": 2 * stats.t.sf(np.abs(t_stat), dof),
+    }
+
+
+def _result(
+    method: str,
+    mean_control: float,
+    mean_treatment: float,
+    se: float,
+    n_control: float,
+    n_treatment: float,
+    alpha: float,
+    dof: float | None = None,
+    test_se: float | None = None,
+) -> dict[str, Any]:
+    """
+    Result dict in the ``welch_ttest`` shape. ``dof=None`` means a z-test
+    (``z_statistic``, no ``df``); ``test_se`` overrides the SE of the test
+    statistic (e.g. pooled under H0) while the CI keeps ``se``.
+    """
+    diff = mean_treatment - mean_control
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistic = diff / (se if test_se is None else test_se)
+    if dof is None:
+        crit = stats.norm.ppf(1 - alpha / 2)
+        p_value = 2 * stats.norm.sf(abs(statistic))
+    else:
+        crit = stats.t.ppf(1 - alpha / 2, dof)
+        p_value = 2 * stats.t.sf(abs(statistic), dof)
+
+    result: dict[str, Any] = {"method": method}
+    if dof is None:
+        result["z_statistic"] = float(statistic)
+    else:
+        result["t_statistic"] = float(statistic)
+    result["p_value"] = float(p_value)
+    if dof is not None:
+        result["df"] = float(dof)
+    result.update(
+        {
+            "mean_control": float(mean_control),
+            "mean_treatment": float(mean_treatment),
+            "mean_diff": float(diff),
+            "std_error": float(se),
+            "ci_95": [float(diff - crit * se), float(diff + crit * se)],
+            "significant": bool(p_value < alpha),
+            "n_control": int(n_control),
+            "n_treatment": int(n_treatment),
+        }
+    )
+    return result
+
+
+def welch_from_stats(
+    control: ArmStats, treatment: ArmStats, alpha: float = 0.05
+) -> dict[str, Any]:
+    """Welch's t-test from per-arm n, mean and variance."""
+    moments = welch_moments(
+        control["n"],
+        control["mean"],
+        control["var"],
+        treatment["n"],
+        treatment["mean"],
+        treatment["var"],
+        alpha,
+    )
+    return _result(
+        "Welch's t-test",
+        control["mean"],
+        treatment["mean"],
+        float(moments["std_error"]),
+        control["n"],
+        treatment["n"],
+        alpha,
+        dof=float(moments["df"]),
+    )
+
+
+def student_from_stats(
+    control: ArmStats, treatment: ArmStats, alpha: float = 0.05
+) -> dict[str, Any]:
+    """Student's t-test (pooled variance) from per-arm n, mean and variance."""
+    n_c, n_t = control["n"], treatment["n"]
+    dof = n_c + n_t - 2
+    pooled = ((n_c - 1) * control["var"] + (n_t - 1) * treatment["var"]) / dof
+    se = float(np.sqrt(pooled * (1 / n_c + 1 / n_t)))
+    return _result(
+        "Student's t-test",
+        control["mean"],
+        treatment["mean"],
+        se,
+        n_c,
+        n_t,
+        alpha,
+        dof=dof,
+    )
+
+
+def proportions_from_stats(
+    control: ArmStats, treatment: ArmStats, alpha: float = 0.05
+) -> dict[str, Any]:
+    """
+    Two-proportion z-test from per-arm n and conversion rate ("mean").
+    The test uses the pooled rate under H0; the CI uses unpooled variances.
+    """
+    n_c, n_t = control["n"], treatment["n"]
+    p_c, p_t = control["mean"], treatment["mean"]
+    se = float(np.sqrt(p_c * (1 - p_c) / n_c + p_t * (1 - p_t) / n_t))
+    pooled = (p_c * n_c + p_t * n_t) / (n_c + n_t)
+    test_se = float(np.sqrt(pooled * (1 - pooled) * (1 / n_c + 1 / n_t)))
+    return _result(
+        "Two-proportion z-test", p_c, p_t, se, n_c, n_t, alpha, test_se=test_se
+    )
+
+
+def _ratio_moments(arm: ArmStats) -> tuple[float, float]:
+    """Ratio of means and its delta-method variance for one arm."""
+    mean_num, mean_den = arm["mean"], arm["mean_den"]
+    ratio = mean_num / mean_den
+    var = (
+        arm["var"] / mean_den**2
+        - 2 * mean_num * arm["cov"] / mean_den**3
+        + mean_num**2 * arm["var_den"] / mean_den**4
+    ) / arm["n"]
+    return ratio, var
+
+
+def ratio_from_stats(
+    control: ArmStats, treatment: ArmStats, alpha: float = 0.05
+) -> dict[str, Any]:
+    """
+    Delta-method z-test for a ratio metric sum(num) / sum(den).
+    Each arm needs n, numerator mean/var ("mean", "var"), denominator
+    mean/var ("mean_den", "var_den") and their covariance ("cov").
+    """
+    ratio_c, var_c = _ratio_moments(control)
+    ratio_t, var_t = _ratio_moments(treatment)
+    se = float(np.sqrt(var_c + var_t))
+    return _result(
+        "Delta-method ratio", ratio_c, ratio_t, se, control["n"], treatment["n"], alpha
+    )
+
+
+def cuped_adjust(
+    control: ArmStats, treatment: ArmStats
+) -> tuple[dict[str, float], dict[str, float], float]:
+    """
+    Per-arm n, mean and variance of the CUPED-adjusted metric, from moments
+    of the metric ("mean", "var") and pre-period covariate ("mean_x",
+    "var_x", "cov_xy"), plus theta.
+    theta is the total-sample covariance over covariate variance (within-arm
+    moments plus the between-arm spread of means), as in ``apply_cuped``.
+    """
+    arms = (control, treatment)
+    n = control["n"] + treatment["n"]
+    mean_x = sum(arm["n"] * arm["mean_x"] for arm in arms) / n
+    mean_y = sum(arm["n"] * arm["mean"] for arm in arms) / n
+    cov_xy = sum(
+        (arm["n"] - 1) * arm["cov_xy"]
+        + arm["n"] * (arm["mean_x"] - mean_x) * (arm["mean"] - mean_y)
+        for arm in arms
+    ) / (n - 1)
+    var_x = sum(
+        (arm["n"] - 1) * arm["var_x"] + arm["n"] * (arm["mean_x"] - mean_x) ** 2
+        for arm in arms
+    ) / (n - 1)
+    theta = cov_xy / var_x if var_x > 0 else 0.0
+
+    def adjust(arm: ArmStats) -> dict[str, float]:
+        return {
+            "n": arm["n"],
+            "mean": arm["mean"] - theta * (arm["mean_x"] - mean_x),
+            "var": arm["var"] - 2 * theta * arm["cov_xy"] + theta**2 * arm["var_x"],
+        }
+
+    return adjust(control), adjust(treatment), float(theta)
+
+
+def cuped_from_stats(
+    control: ArmStats, treatment: ArmStats, alpha: float = 0.05
+) -> dict[str, Any]:
+    """
+    CUPED-adjusted Welch t-test from per-arm moments of the metric and
+    pre-period covariate (see ``cuped_adjust``); the result equals a Welch
+    test on the ``apply_cuped`` column.
+    """
+    adjusted_c, adjusted_t, theta = cuped_adjust(control, treatment)
+    result = welch_from_stats(adjusted_c, adjusted_t, alpha)
+    result["method"] = "CUPED"
+    result["theta"] = theta
+    logger.debug(f"CUPED from stats: theta={theta:.4f}")
+    return result
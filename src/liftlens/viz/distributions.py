@@ -13,16 +13,17 @@ def histogram(
     group_col: str = "group",
     bins: int = 50,
     opacity: float = 0.6,
+    labels: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Overlaid histogram with KDE."""
+    """Overlaid histogram with KDE (one trace per arm)."""
     fig = go.Figure()
 
-    for group in ["control", "treatment"]:
+    for group in labels or _group_labels(df, group_col):
         data = df[df[group_col] == group][metric_col]
         fig.add_trace(
             go.Histogram(
                 x=data,
-                name=group.capitalize(),
+                name=str(group).capitalize(),
                 nbinsx=bins,
                 opacity=opacity,
                 histnorm="probability density",
@@ -48,11 +49,13 @@ def kde_plot(
     metric_col: str,
     group_col: str = "group",
     bandwidth: float | None = None,
+    labels: list[str] | None = None,
 ) -> dict[str, Any]:
     """Kernel Density Estimate overlay."""
     fig = go.Figure()
 
-    for group in ["control", "treatment"]:
+    labels = labels or _group_labels(df, group_col)
+    for group in labels:
         data = df[df[group_col] == group][metric_col].dropna()
         if len(data) == 0:
             continue
@@ -64,8 +67,8 @@ def kde_plot(
                 x=x,
                 y=y,
                 mode="lines",
-                name=group.capitalize(),
-                fill="tozeroy" if group == "treatment" else None,
+                name=str(group).capitalize(),
+                fill="tozeroy" if group != labels[0] else None,
             )
         )
 
@@ -79,15 +82,20 @@ def kde_plot(
 
 
 def ecdf_plot(
-    df: pd.DataFrame, metric_col: str, group_col: str = "group"
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    labels: list[str] | None = None,
 ) -> dict[str, Any]:
     """Empirical Cumulative Distribution Function."""
     fig = go.Figure()
 
-    for group in ["control", "treatment"]:
+    for group in labels or _group_labels(df, group_col):
         data = np.sort(df[df[group_col] == group][metric_col])
         y = np.arange(1, len(data) + 1) / len(data)
-        fig.add_trace(go.Scatter(x=data, y=y, mode="lines", name=group.capitalize()))
+        fig.add_trace(
+            go.Scatter(x=data, y=y, mode="lines", name=str(group).capitalize())
+        )
 
     fig.update_layout(
         title=f"ECDF of {metric_col}",
@@ -98,3 +106,8 @@ def ecdf_plot(
     from typing import cast
 
     return cast(dict[str, Any], fig.to_dict())
+
+
+def _group_labels(df: pd.DataFrame, group_col: str) -> list[str]:
+    """Arms present in the data, in sorted order (control before treatment)."""
+    return sorted(df[group_col].dropna().unique().tolist(), key=str)
@@ -12,8 +12,9 @@ from ..data.validator import check_balance, check_srm
 from ..metrics import ensure_metrics_registered
 from ..metrics.registry import registry as metric_registry
 from ..report.builder import ReportBuilder
-from ..stats.inference import welch_ttest
+from ..stats.multiarm import multi_arm_test
 from ..viz.distributions import histogram
+from .planner import metric_moments
 
 
 def run_pipeline(
@@ -38,41 +39,93 @@ def run_pipeline(
             config = _default_config()
 
     # Load data
-    df = load_data(config.data)
+    df = load_data(config.data, config.arms)
 
     # allow input_path override
     if input_path is not None:
         # if user explicitly provides data path, override config.data.path
-        df = load_data(config.data.model_copy(update={"path": Path(input_path)}))
+        df = load_data(
+            config.data.model_copy(update={"path": Path(input_path)}), config.arms
+        )
 
     # Validate
     srm_result = check_srm(df, config.group_col)
-    balance_result = check_balance(df, config.baseline_col, config.group_col)
+    balance_by_arm = {
+        arm: check_balance(
+            df,
+            config.baseline_col,
+            config.group_col,
+            control_label=config.control_label,
+            treatment_label=arm,
+        )
+        for arm in config.treatment_arms
+    }
+    multi_arm = len(config.treatment_arms) > 1
+    if multi_arm:
+        balance_result = {
+            "arms": balance_by_arm,
+            "is_imbalanced": any(b["is_imbalanced"] for b in balance_by_arm.values()),
+        }
+    else:
+        balance_result = balance_by_arm[config.treatment_label]
+
+    # Planning history: raw control-arm moments, logged once the run is registered.
+    # The input has no timestamps, so no run length (days) is recorded.
+    planning_stats = metric_moments(
+        df,
+        config.outcome_col,
+        config.group_col,
+        control_label=config.control_label,
+        covariate_col=config.baseline_col,
+    )
 
     # Transform
     df = apply_transforms(df, config, config.baseline_col, config.outcome_col)
 
     # Register run
     run_id = exp_registry.start_run(config.name, config.model_dump())
+    exp_registry.log_metric_stats(run_id, config.outcome_col, **planning_stats)
+
+    # Analyze: per-arm statistics once, all arm-vs-control contrasts together
+    comparisons = {
+        c["arm"]: c
+        for c in multi_arm_test(
+            df,
+            config.outcome_col,
+            config.group_col,
+            control_label=config.control_label,
+            treatment_labels=config.treatment_arms,
+            alpha=config.stats.alpha,
+            correction=config.stats.correction,
+        )["comparisons"]
+    }
+    plot = histogram(df, config.outcome_col, config.group_col, labels=config.arms)
 
-    # Analyze
     metrics_results = []
     plots = []
     for metric in config.metrics:
-        value = metric_registry.call(
-            metric.func, df, config.group_col, config.outcome_col, **metric.params
-        )
-        ttest = welch_ttest(df, config.outcome_col, config.group_col)
-        metrics_results.append(
-            {
-                "name": metric.name,
-                "value": value,
-                "p_value": ttest["p_value"],
-                "significant": ttest["significant"],
-            }
-        )
-        plot = histogram(df, config.outcome_col, config.group_col)
-        plots.append(plot)
+        for arm in config.treatment_arms:
+            value = metric_registry.call(
+                metric.func,
+                df,
+                config.group_col,
+                config.outcome_col,
+                control_label=config.control_label,
+                treatment_label=arm,
+                **metric.params,
+            )
+            ttest = comparisons[arm]
+            metrics_results.append(
+                {
+                    "name": f"{metric.name} ({arm})" if multi_arm else metric.name,
+                    "arm": arm,
+                    "value": value,
+                    "p_value": ttest["p_value_adjusted"],
+                    "p_value_unadjusted": ttest["p_value"],
+                    "significant": ttest["significant"],
+                }
+            )
+            plots.append(plot)
 
     # Build report
     builder = ReportBuilder()
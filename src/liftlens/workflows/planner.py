@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..core.registry import ExperimentRegistry
+from ..core.registry import registry as exp_registry
+from ..stats.power import sample_size_grid
+
+# Cap on the CUPED variance reduction: a recorded |rho| of 1 would otherwise
+# shrink the adjusted standard deviation to zero
+MAX_RHO_SQ = 0.99
+
+
+def metric_moments(
+    df: pd.DataFrame,
+    metric_col: str,
+    group_col: str = "group",
+    control_label: str = "control",
+    covariate_col: str | None = None,
+) -> dict[str, Any]:
+    """
+    Control-arm n, mean, variance and covariate correlation of one metric:
+    the statistics the planner needs from a run.
+    """
+    control = df.loc[df[group_col] == control_label]
+    values = control[metric_col].astype(float)
+    corr = None
+    if covariate_col and covariate_col in control:
+        corr = control[metric_col].corr(control[covariate_col].astype(float))
+        corr = None if pd.isna(corr) else float(corr)
+    return {
+        "n": int(values.count()),
+        "mean": float(values.mean()),
+        "var": float(values.var()),
+        "covariate_corr": corr,
+    }
+
+
+def record_metric_stats(
+    run_id: str,
+    df: pd.DataFrame,
+    metric_cols: list[str],
+    group_col: str = "group",
+    control_label: str = "control",
+    covariate_col: str | None = None,
+    days: float | None = None,
+    registry: ExperimentRegistry | None = None,
+) -> None:
+    """Store the planning statistics of each metric for a registered run."""
+    registry = registry or exp_registry
+    for metric_col in metric_cols:
+        moments = metric_moments(
+            df, metric_col, group_col, control_label, covariate_col
+        )
+        registry.log_metric_stats(run_id, metric_col, days=days, **moments)
+    logger.debug(f"Recorded planning statistics for {len(metric_cols)} metrics")
+
+
+def metric_history(
+    metrics: list[str] | None = None,
+    registry: ExperimentRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    Pooled per-metric history from the registry: total n, pooled mean and
+    variance (within-run variances plus between-run spread of means), the
+    n-weighted covariate correlation and daily traffic where run lengths are known.
+    """
+    registry = registry or exp_registry
+    rows = pd.DataFrame(registry.get_metric_stats(metrics))
+    if rows.empty:
+        raise ValueError("No metric statistics recorded in the registry")
+    if metrics is not None:
+        missing = sorted(set(metrics) - set(rows["metric_name"]))
+        if missing:
+            raise ValueError(f"No recorded statistics for metrics: {missing}")
+
+    # All-NULL columns come back as object dtype
+    numeric = ["n", "mean", "var", "covariate_corr", "days"]
+    rows[numeric] = rows[numeric].astype(float)
+    rows["sum"] = rows["n"] * rows["mean"]
+    rows["sumsq"] = (rows["n"] - 1) * rows["var"] + rows["n"] * rows["mean"] ** 2
+    rows["corr_n"] = rows["covariate_corr"].notna() * rows["n"]
+    rows["corr_sum"] = rows["covariate_corr"].fillna(0.0) * rows["corr_n"]
+    rows["dated_n"] = rows["days"].notna() * rows["n"]
+    grouped = rows.groupby("metric_name").agg(
+        runs=("run_id", "nunique"),
+        n=("n", "sum"),
+        total=("sum", "sum"),
+        total_sq=("sumsq", "sum"),
+        corr_n=("corr_n", "sum"),
+        corr_sum=("corr_sum", "sum"),
+        dated_n=("dated_n", "sum"),
+        days=("days", "sum"),
+    )
+    history = pd.DataFrame(index=grouped.index)
+    history["runs"] = grouped["runs"]
+    history["n"] = grouped["n"].astype(int)
+    history["mean"] = grouped["total"] / grouped["n"]
+    history["var"] = (grouped["total_sq"] - grouped["n"] * history["mean"] ** 2) / (
+        grouped["n"] - 1
+    )
+    history["covariate_corr"] = (grouped["corr_sum"] / grouped["corr_n"]).where(
+        grouped["corr_n"] > 0
+    )
+    # Control-arm users per day; planner assumes equal daily traffic per arm
+    history["daily_users"] = (grouped["dated_n"] / grouped["days"]).where(
+        grouped["days"] > 0
+    )
+    history.index.name = "metric"
+    return history
+
+
+def _per_metric(
+    value: float | dict[str, float], index: pd.Index, name: str
+) -> pd.Series:
+    """Broadcast a shared value or a per-metric dict onto the planned metrics."""
+    if isinstance(value, dict):
+        missing = sorted(set(index) - set(value))
+        if missing:
+            raise ValueError(f"No {name} given for metrics: {missing}")
+    return pd.Series(value, index=index, dtype=float)
+
+
+def plan_experiments(
+    mde: float | dict[str, float],
+    metrics: list[str] | None = None,
+    relative: bool = False,
+    alpha: float = 0.05,
+    power: float = 0.8,
+    ratio: float = 1.0,
+    cuped: bool = True,
+    daily_users: float | dict[str, float] | None = None,
+    registry: ExperimentRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    Sample size and duration for many metrics in one call, from the variance
+    history in the registry (no raw data is read).
+
+    Args:
+        mde: Minimum detectable effect, per metric or shared; absolute units,
+            or a fraction of the historical mean when ``relative``
+        cuped: Shrink the variance by (1 - rho^2) using the recorded
+            covariate correlation
+        daily_users: Users per day entering the experiment (all arms);
+            defaults to the traffic seen in past runs. Runs logged by
+            ``run_pipeline`` carry no duration, so pass this unless the
+            history was recorded with ``days``.
+
+    Returns:
+        DataFrame indexed by metric with the planning inputs, n per arm,
+        total users and days. Metrics whose effect size is not finite and
+        non-zero (e.g. no variance history yet) get missing sample sizes.
+    """
+    history = metric_history(metrics, registry)
+    plan = history[["mean", "var", "covariate_corr"]].copy()
+    plan["std"] = np.sqrt(plan["var"])
+
+    mdes = _per_metric(mde, plan.index, "mde")
+    plan["mde"] = mdes * plan["mean"].abs() if relative else mdes
+    rho_sq = plan["covariate_corr"].fillna(0.0) ** 2 if cuped else 0.0
+    plan["std_adjusted"] = plan["std"] * np.sqrt(1 - np.minimum(rho_sq, MAX_RHO_SQ))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plan["effect_size"] = plan["mde"] / plan["std_adjusted"]
+
+    effect = plan["effect_size"].to_numpy()
+    valid = np.isfinite(effect) & (effect != 0)
+    if not valid.all():
+        logger.warning(
+            f"No finite, non-zero effect size for {list(plan.index[~valid])}; "
+            "leaving their sample sizes empty"
+        )
+    n_control = np.full(len(plan), np.nan)
+    if valid.any():
+        n_control[valid] = sample_size_grid(effect[valid], power, alpha, ratio)
+    plan["n_control"] = n_control
+    plan["n_treatment"] = np.floor(plan["n_control"] * ratio)
+    plan["total_users"] = plan["n_control"] + plan["n_treatment"]
+    sizes = ["n_control", "n_treatment", "total_users"]
+    plan[sizes] = plan[sizes].astype("Int64")
+
+    if daily_users is None:
+        traffic = history["daily_users"] * (1 + ratio)
+        if traffic.isna().any():
+            logger.warning(
+                "No run durations recorded for "
+                f"{list(plan.index[traffic.isna()])}; pass daily_users to get days"
+            )
+    else:
+        traffic = _per_metric(daily_users, plan.index, "daily_users")
+    plan["daily_users"] = traffic
+    plan["days"] = np.ceil(plan["total_users"] / traffic)
+    logger.info(
+        f"Planned {len(plan)} metrics (alpha={alpha}, power={power}, cuped={cuped})"
+    )
+    return plan.drop(columns="var")
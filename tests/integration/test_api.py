@@ -33,3 +33,17 @@ def test_run_experiment(tmp_path, sample_data_path):
     result = client.get(f"/results/{run_id}")
     assert result.status_code == 200
     assert "results_json" in result.json()
+
+
+def test_confidence_sequence_monitor():
+    batch = {
+        "control": {"n": 500, "mean": 10.0, "var": 4.0},
+        "treatment": {"n": 500, "mean": 10.5, "var": 4.0},
+    }
+    assert client.get("/monitors/api_cs_missing").status_code == 404
+    for _ in range(2):
+        response = client.post("/monitors/api_cs", json=batch)
+        assert response.status_code == 200
+    result = client.get("/monitors/api_cs").json()
+    assert result["n_control"] == 1000
+    assert result["ci_95"][0] < 0.5 < result["ci_95"][1]
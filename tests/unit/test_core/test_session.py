@@ -0,0 +1,21 @@
+import numpy as np
+
+from liftlens.core.session import Session
+from liftlens.engine.parallel import parallel_apply
+
+
+def test_session_spawns_reproducible_independent_streams(tmp_path):
+    first = Session(seed=11, temp_dir=tmp_path / "a")
+    second = Session(seed=11, temp_dir=tmp_path / "b")
+    draws = [first.rng().random(3) for _ in range(2)]
+    assert not np.allclose(draws[0], draws[1])
+    np.testing.assert_allclose(second.rng().random(3), draws[0])
+
+
+def test_parallel_apply_with_rng_matches_serial():
+    def draw(item: int, rng: np.random.Generator) -> float:
+        return item + rng.random()
+
+    serial = parallel_apply(draw, [1, 2, 3], n_jobs=1, with_rng=True, seed=4)
+    parallel = parallel_apply(draw, [1, 2, 3], n_jobs=2, with_rng=True, seed=4)
+    assert serial == parallel
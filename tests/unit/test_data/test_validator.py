@@ -7,6 +7,14 @@ def test_check_srm(sample_data):
     assert not result["is_srm"]  # balanced
 
 
+def test_check_srm_ignores_untested_arms(sample_data):
+    df = sample_data.copy()
+    df.loc[df.index[:50], "group"] = "holdout"
+    result = check_srm(df, expected_ratios={"control": 1, "treatment": 1})
+    assert set(result["observed"]) == {"control", "treatment"}
+    assert sum(result["expected"].values()) == len(df) - 50
+
+
 def test_check_balance(sample_data):
     result = check_balance(sample_data, "baseline")
     assert abs(result["smd"]) < 0.1
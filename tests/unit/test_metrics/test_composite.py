@@ -0,0 +1,50 @@
+import numpy as np
+
+from liftlens.metrics.composite import composite_index, weighted_index
+
+
+def test_weighted_index(sample_data):
+    df = sample_data.copy()
+    diff = weighted_index(df, "group", "outcome", submetrics=["outcome", "baseline"])
+    z = (df[["outcome", "baseline"]] - df[["outcome", "baseline"]].mean()) / df[
+        ["outcome", "baseline"]
+    ].std()
+    index = z.mean(axis=1)
+    expected = (
+        index[df["group"] == "treatment"].mean()
+        - index[df["group"] == "control"].mean()
+    )
+    assert np.isclose(diff, expected)
+
+
+def test_composite_index_ci(sample_data):
+    result = composite_index(
+        sample_data,
+        "group",
+        ["outcome", "baseline"],
+        weights={"outcome": 3, "baseline": 1},
+    )
+    assert result["weights"] == {"outcome": 0.75, "baseline": 0.25}
+    assert result["std_error"] > 0
+    assert result["ci_95"][0] < result["mean_diff"] < result["ci_95"][1]
+    assert result["significant"]
+
+
+def test_composite_index_drops_incomplete_rows(sample_data):
+    df = sample_data.copy()
+    df.loc[df.index[:10], "baseline"] = np.nan
+    result = composite_index(df, "group", ["outcome", "baseline"])
+    assert np.isfinite(result["mean_diff"]) and result["std_error"] > 0
+    assert result["n_control"] + result["n_treatment"] == len(df) - 10
+    expected = weighted_index(
+        df, "group", "outcome", submetrics=["outcome", "baseline"]
+    )
+    z = (df[["outcome", "baseline"]] - df[["outcome", "baseline"]].mean()) / df[
+        ["outcome", "baseline"]
+    ].std()
+    index = z.mean(axis=1, skipna=False)
+    assert np.isclose(
+        expected,
+        index[df["group"] == "treatment"].mean()
+        - index[df["group"] == "control"].mean(),
+    )
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from liftlens.metrics.drift import HistogramMonitor
+from liftlens.metrics.monitoring import psi
+
+
+def test_histogram_monitor_matches_psi(sample_data):
+    monitor = HistogramMonitor.from_reference(sample_data["baseline"])
+    monitor.update(sample_data["baseline"], window="pre")
+    monitor.update(sample_data["outcome"][:500], window="post")
+    monitor.update(sample_data["outcome"][500:], window="post")
+    result = monitor.compare("pre", "post")
+    assert (
+        abs(result["psi"] - psi(sample_data["baseline"], sample_data["outcome"])) < 0.01
+    )
+    assert result["n_current"] == 1000
+
+
+def test_update_frame_detects_drift():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "hour": np.repeat(["h0", "h1", "h2"], 2000),
+            "group": np.tile(["control", "treatment"], 3000),
+            "value": np.concatenate(
+                [
+                    rng.normal(0, 1, 2000),
+                    rng.normal(0, 1, 2000),
+                    rng.normal(0.5, 1, 2000),
+                ]
+            ),
+        }
+    )
+    monitor = HistogramMonitor.uniform(-4, 4, bins=80)
+    monitor.update_frame(df, "value", "hour", "group")
+    report = monitor.drift_report("h0").set_index("window")
+    assert report.loc["h1", "ks_p_value"] > 0.01
+    assert report.loc["h2", "ks_p_value"] < 0.001
+    assert report.loc["h2", "cvm_p_value"] < 0.001
+
+    restored = HistogramMonitor.from_dict(monitor.to_dict())
+    assert (
+        restored.histogram("h1", "control") == monitor.histogram("h1", "control")
+    ).all()
@@ -0,0 +1,21 @@
+import numpy as np
+
+from liftlens.metrics.quantile import quantile_diff, quantile_effects
+
+
+def test_quantile_diff(sample_data):
+    diff = quantile_diff(sample_data, "group", "outcome", q=0.5)
+    control = sample_data[sample_data["group"] == "control"]["outcome"]
+    treatment = sample_data[sample_data["group"] == "treatment"]["outcome"]
+    assert np.isclose(diff, treatment.median() - control.median())
+
+
+def test_quantile_effects(sample_data):
+    result = quantile_effects(
+        sample_data, "group", "outcome", quantiles=[0.1, 0.5, 0.9]
+    )
+    assert list(result.index) == [0.1, 0.5, 0.9]
+    # Median SE for N(100, 15) with n=500 per group is ~1.19
+    assert 0.8 < result.loc[0.5, "std_error"] < 1.6
+    assert (result["ci_lower"] < result["diff"]).all()
+    assert result.loc[0.5, "p_value"] < 0.05
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.stats.multitest import multipletests
+
+from liftlens.stats.adjustments import (
+    METHODS,
+    adjust_p_values,
+    closed_testing,
+    holm_bonferroni,
+    westfall_young,
+)
+
+_STATSMODELS = {
+    "bonferroni": "bonferroni",
+    "holm": "holm",
+    "hochberg": "simes-hochberg",
+    "bh": "fdr_bh",
+    "by": "fdr_by",
+    "hommel": "hommel",
+}
+
+
+def _p_values(shape: tuple[int, ...]) -> np.ndarray:
+    rng = np.random.default_rng(11)
+    # A mix of null and non-null p-values, with ties
+    p = np.where(rng.random(shape) < 0.3, rng.beta(0.2, 5, shape), rng.random(shape))
+    p = np.round(p, 3)
+    p.flat[:2] = 0.0
+    return p
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_adjust_matches_statsmodels(method):
+    p = _p_values((40,))
+    expected = multipletests(p, method=_STATSMODELS[method])[1]
+    assert np.allclose(adjust_p_values(p, method), expected)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_adjust_batches_rows_and_skips_nan(method):
+    p = _p_values((5, 30))
+    p[1, [3, 17]] = np.nan
+    adjusted = adjust_p_values(p, method)
+    assert adjusted.shape == p.shape
+    for row, result in zip(p, adjusted, strict=True):
+        finite = ~np.isnan(row)
+        expected = multipletests(row[finite], method=_STATSMODELS[method])[1]
+        assert np.allclose(result[finite], expected)
+        assert np.isnan(result[~finite]).all()
+
+
+def test_holm_keeps_input_order():
+    p_values = [0.04, 0.001, 0.03, 0.5]
+    result = holm_bonferroni(p_values, alpha=0.05)
+    assert result["significant"] == [False, True, False, False]
+    assert np.allclose(result["p_values_adjusted"], [0.09, 0.004, 0.09, 0.5])
+
+
+def test_closed_testing_shortcuts():
+    p_values = [0.01, 0.02, 0.04, 0.045]
+    simes = closed_testing(p_values, alpha=0.05)
+    bonferroni = closed_testing(p_values, alpha=0.05, local_test="bonferroni")
+    assert simes["significant"] == [True] * 4
+    assert bonferroni["significant"] == [True, False, False, False]
+
+
+def test_adjust_rejects_invalid_input():
+    with pytest.raises(ValueError, match="Unknown correction"):
+        adjust_p_values([0.1], "sidak")
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        adjust_p_values([0.1, 1.5])
+
+
+def _scorecard(n: int = 400, k: int = 6) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    group = np.where(np.arange(n) % 2 == 0, "control", "treatment")
+    common = rng.normal(size=n)
+    # Highly correlated null metrics plus one with a real effect
+    metrics = {f"m{j}": common + 0.3 * rng.normal(size=n) for j in range(k)}
+    metrics["lift"] = rng.normal(size=n) + (group == "treatment")
+    return pd.DataFrame({"group": group, **metrics})
+
+
+def test_westfall_young_identical_metrics_need_no_adjustment():
+    df = _scorecard()
+    copies = pd.DataFrame(
+        {"group": df["group"], "a": df["m0"], "b": df["m0"], "c": 2 * df["m0"]}
+    )
+    result = westfall_young(copies, ["a", "b", "c"], n_perm=500, seed=1)
+    assert np.allclose(result["p_values_adjusted"], result["p_values"])
+
+
+def test_westfall_young_less_conservative_than_holm():
+    df = _scorecard()
+    metrics = [c for c in df.columns if c != "group"]
+    result = westfall_young(df, metrics, n_perm=1_000, seed=2)
+    raw = np.array(result["p_values"])
+    adjusted = np.array(result["p_values_adjusted"])
+    assert np.all(adjusted >= raw)
+    assert np.all(adjusted <= adjust_p_values(raw, "holm") + 1e-12)
+    assert result["significant"] == [False] * (len(metrics) - 1) + [True]
+
+
+def test_westfall_young_reproducible_across_jobs():
+    df = _scorecard()
+    metrics = ["m0", "m1", "lift"]
+    serial = westfall_young(df, metrics, n_perm=300, chunk_size=64, seed=4)
+    parallel = westfall_young(df, metrics, n_perm=300, chunk_size=64, seed=4, n_jobs=2)
+    assert serial["p_values_adjusted"] == parallel["p_values_adjusted"]
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import special
+
+from liftlens.stats.bayesian import (
+    bayesian_monitoring_batch,
+    bayesian_scorecard,
+    beta_superiority,
+    normal_from_stats,
+)
+from liftlens.stats.inference import welch_ttest
+from liftlens.stats.sequential import bayesian_monitoring
+
+
+def _exact_prob(a_c: int, b_c: int, a_t: int, b_t: int) -> float:
+    """Closed-form P(T > C) for integer treatment parameters (sum of a_t terms)."""
+    total = 0.0
+    for i in range(a_t):
+        # B(a_c + i, b_c + b_t) / B(a_c, b_c) as rising factorials, which stay
+        # exact where a difference of betaln values would cancel
+        log_ratio = (
+            np.log(a_c + np.arange(i)).sum()
+            + np.log(b_c + np.arange(b_t)).sum()
+            - np.log(a_c + b_c + np.arange(i + b_t)).sum()
+        )
+        total += np.exp(log_ratio - np.log(b_t + i) - special.betaln(1 + i, b_t))
+    return float(total)
+
+
+def test_beta_superiority_matches_closed_form() -> None:
+    cases = [
+        (11, 91, 16, 86),
+        (101, 901, 131, 871),
+        # Control posterior far narrower than treatment's
+        (1_000_001, 9_000_000, 3, 9),
+    ]
+    for a_c, b_c, a_t, b_t in cases:
+        posterior = beta_superiority(a_c, b_c, a_t, b_t)
+        expected = _exact_prob(a_c, b_c, a_t, b_t)
+        assert posterior["prob_treatment_better"] == pytest.approx(expected, abs=1e-9)
+    # Symmetric posteriors: even odds and equal losses
+    even = beta_superiority(1, 1, 1, 1)
+    assert even["prob_treatment_better"] == pytest.approx(0.5)
+    assert even["expected_loss_treatment"] == pytest.approx(1 / 6)
+
+
+def test_batch_matches_single_and_monte_carlo() -> None:
+    table = bayesian_monitoring_batch([100, 50], [1000, 1000], [130, 52], [1000, 1000])
+    single = bayesian_monitoring(
+        control_conversions=100,
+        treatment_conversions=130,
+        control_n=1000,
+        treatment_n=1000,
+    )
+    assert table.loc[0, "prob_treatment_better"] == pytest.approx(
+        single["prob_treatment_better"]
+    )
+    assert list(table["recommendation"]) == ["treatment", "continue"]
+
+    sampled = bayesian_monitoring(
+        control_conversions=100,
+        treatment_conversions=130,
+        control_n=1000,
+        treatment_n=1000,
+        method="monte_carlo",
+        seed=0,
+    )
+    assert sampled["prob_treatment_better"] == pytest.approx(
+        single["prob_treatment_better"], abs=0.005
+    )
+    assert sampled["expected_loss_control"] == pytest.approx(
+        single["expected_loss_control"], rel=0.05
+    )
+
+
+def test_normal_scorecard_matches_flat_prior_and_cuped(sample_data) -> None:
+    card = bayesian_scorecard(sample_data, ["outcome", "baseline"])
+    welch = welch_ttest(sample_data, "outcome")
+    row = card.loc["outcome"]
+    # Flat prior: the posterior mean and sd are the estimate and its SE
+    assert row["effect"] == pytest.approx(welch["mean_diff"])
+    assert row["effect_sd"] == pytest.approx(welch["std_error"])
+    assert row["prob_treatment_better"] > 0.99
+
+    def moments(label: str) -> dict[str, float]:
+        arm = sample_data[sample_data["group"] == label]
+        cov = np.cov(arm["outcome"], arm["baseline"])
+        return {
+            "n": len(arm),
+            "mean": arm["outcome"].mean(),
+            "var": cov[0, 0],
+            "mean_x": arm["baseline"].mean(),
+            "var_x": cov[1, 1],
+            "cov_xy": cov[0, 1],
+        }
+
+    adjusted = bayesian_scorecard(
+        sample_data, ["outcome"], covariate_col="baseline"
+    ).loc["outcome"]
+    from_stats = normal_from_stats(moments("control"), moments("treatment"))
+    assert adjusted["effect"] == pytest.approx(from_stats["effect"])
+    assert adjusted["effect_sd"] == pytest.approx(from_stats["effect_sd"])
+    assert adjusted["effect_sd"] < row["effect_sd"]
+
+
+def test_lognormal_scorecard_recovers_lift() -> None:
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame(
+        {
+            "group": np.repeat(["control", "treatment"], n),
+            "revenue": np.exp(rng.normal(np.repeat([0.0, 0.05], n), 1.0)),
+        }
+    )
+    row = bayesian_scorecard(df, ["revenue"], model="lognormal").loc["revenue"]
+    assert row["ci_lower"] < np.expm1(0.05) < row["ci_upper"]
+    assert row["prob_treatment_better"] > 0.95
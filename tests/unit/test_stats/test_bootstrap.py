@@ -0,0 +1,94 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from liftlens.data.io import read_chunks
+from liftlens.stats import bootstrap
+from liftlens.stats.bootstrap import (
+    PoissonBootstrap,
+    bca_interval,
+    jackknife_values,
+    poisson_bootstrap_ci,
+)
+from liftlens.stats.inference import bootstrap_ci
+
+
+def test_poisson_bootstrap_merge_matches_single_pass(sample_data):
+    full = PoissonBootstrap(n_boot=300, seed=7).update(sample_data, "outcome")
+    left = PoissonBootstrap(n_boot=300, seed=7).update(
+        sample_data.iloc[:400], "outcome"
+    )
+    right = PoissonBootstrap(n_boot=300, seed=7).update(
+        sample_data.iloc[400:], "outcome"
+    )
+    merged = left.merge(right)
+    np.testing.assert_allclose(merged.replicates, full.replicates)
+    assert merged.result()["significant"]
+
+
+def test_poisson_bootstrap_skips_missing_values(sample_data):
+    df = sample_data.copy()
+    df.loc[df.index[:20], "outcome"] = np.nan
+    boot = PoissonBootstrap(n_boot=300, seed=7).update(df, "outcome")
+    complete = PoissonBootstrap(n_boot=300, seed=7).update(df.dropna(), "outcome")
+    assert np.isfinite(boot.replicates).all()
+    np.testing.assert_allclose(boot.replicates, complete.replicates)
+
+
+def test_poisson_bootstrap_update_stays_within_chunk_budget(monkeypatch, sample_data):
+    budget = 2**20
+    monkeypatch.setattr(bootstrap, "CHUNK_BYTES", budget)
+    small = PoissonBootstrap(n_boot=200, seed=7)
+    tracemalloc.start()
+    try:
+        small.update(sample_data, "outcome")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1.25 * budget
+    # Block size only changes memory, never the replicates
+    monkeypatch.undo()
+    full = PoissonBootstrap(n_boot=200, seed=7).update(sample_data, "outcome")
+    np.testing.assert_allclose(small.replicates, full.replicates)
+
+
+def test_poisson_bootstrap_from_file_chunks(tmp_path, sample_data):
+    path = tmp_path / "data.csv"
+    sample_data.to_csv(path, index=False)
+    result = poisson_bootstrap_ci(
+        read_chunks(path, chunksize=250), "outcome", n_boot=300
+    )
+    assert result["n_control"] + result["n_treatment"] == len(sample_data)
+    assert result["ci_95"][0] > 0
+
+
+@pytest.mark.parametrize("metric", ["mean_diff", "p90"])
+def test_closed_form_jackknife_matches_refits(sample_data, metric):
+    small = sample_data.groupby("group").head(30)
+    control_jack, _ = jackknife_values(small, "outcome", metric=metric)
+    control = small[small["group"] == "control"]
+    treatment = small[small["group"] == "treatment"]
+    q = 0.9 if metric == "p90" else None
+    refits = []
+    for i in range(len(control)):
+        rest = control["outcome"].drop(control.index[i])
+        stat = np.quantile if q else (lambda x, _: np.mean(x))
+        refits.append(stat(treatment["outcome"], q) - stat(rest, q))
+    np.testing.assert_allclose(np.sort(control_jack), np.sort(refits))
+
+
+@pytest.mark.parametrize("ci_method", ["bca", "t"])
+def test_bootstrap_ci_methods(sample_data, ci_method):
+    result = bootstrap_ci(
+        sample_data, "outcome", n_boot=1_000, ci_method=ci_method, seed=0
+    )
+    lower, upper = result["ci_95"]
+    assert lower < result["estimate"] < upper
+    assert result["significant"]
+
+
+def test_bca_interval_with_one_sided_replicates():
+    replicates = np.linspace(1.0, 2.0, 200)
+    lower, upper = bca_interval(0.5, replicates, accel=0.0)
+    assert 1.0 <= lower < upper <= 2.0
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy import stats
+
+from liftlens.stats.heterogeneity import segment_cube, subgroup_analysis
+
+
+def test_segment_cube_matches_welch(sample_data):
+    df = sample_data.copy()
+    df["segment"] = np.where(np.arange(len(df)) % 3 == 0, "a", "b")
+    cube = segment_cube(df, ["outcome", "baseline"], "group", ["segment"])
+    row = cube[(cube["segment"] == "a") & (cube["metric"] == "outcome")].iloc[0]
+    sub = df[df["segment"] == "a"]
+    expected = stats.ttest_ind(
+        sub[sub["group"] == "treatment"]["outcome"],
+        sub[sub["group"] == "control"]["outcome"],
+        equal_var=False,
+    )
+    assert np.isclose(row["p_value"], expected.pvalue)
+    assert set(cube["dimension"]) == {"segment", "total"}
+
+
+def test_subgroup_analysis(sample_data):
+    df = sample_data.copy()
+    df["segment"] = np.where(np.arange(len(df)) % 2 == 0, "even", "odd")
+    result = subgroup_analysis(df, "outcome", "group", ["segment"])
+    assert set(result) == {"segment=even", "segment=odd"}
+    assert all(5 < effect < 11 for effect in result.values())
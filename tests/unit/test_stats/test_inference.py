@@ -1,4 +1,6 @@
-from liftlens.stats.inference import bootstrap_ci, welch_ttest
+import pytest
+
+from liftlens.stats.inference import bootstrap_ci, welch_ttest, welch_ttest_batch
 
 
 def test_welch_ttest(sample_data):
@@ -11,3 +13,29 @@ def test_bootstrap_ci(sample_data):
     result = bootstrap_ci(sample_data, "outcome")
     assert result["ci_95"][0] > 5.0
     assert result["significant"]
+
+
+def test_bootstrap_ci_reproducible_across_jobs(sample_data):
+    serial = bootstrap_ci(sample_data, "outcome", n_boot=400, chunk_size=50, seed=1)
+    parallel = bootstrap_ci(
+        sample_data, "outcome", n_boot=400, chunk_size=50, seed=1, n_jobs=2
+    )
+    assert serial["ci_95"] == parallel["ci_95"]
+
+
+def test_bootstrap_ci_registry_metrics(sample_data):
+    median = bootstrap_ci(sample_data, "outcome", n_boot=500, metric="p50", seed=3)
+    assert median["ci_95"][0] < median["estimate"] < median["ci_95"][1]
+    # huber_mean has no array form and goes through the per-replicate path
+    huber = bootstrap_ci(sample_data, "outcome", n_boot=20, metric="huber_mean", seed=3)
+    assert huber["ci_95"][0] > 0
+
+
+def test_welch_ttest_batch_matches_single_tests(sample_data):
+    frame = sample_data[["outcome", "baseline"]].copy()
+    frame.loc[::7, "baseline"] = float("nan")
+    table = welch_ttest_batch(frame, sample_data["group"])
+    assert list(table.index) == ["outcome", "baseline"]
+    single = welch_ttest(sample_data.assign(baseline=frame["baseline"]), "baseline")
+    assert table.loc["baseline", "p_value"] == pytest.approx(single["p_value"])
+    assert table.loc["outcome", "significant"]
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.formula.api as smf
+
+from liftlens.stats.modeling import (
+    COV_TYPES,
+    StreamingOLS,
+    ancova,
+    ols_fit,
+    ols_regression,
+    streaming_ancova,
+)
+
+
+def _regression_data(n: int = 600) -> pd.DataFrame:
+    rng = np.random.default_rng(8)
+    group = np.where(rng.random(n) < 0.5, "control", "treatment")
+    baseline = rng.gamma(2.0, 10.0, n)
+    # Heteroskedastic noise, so the robust covariances differ
+    noise = rng.normal(size=n) * (1 + baseline / 10)
+    outcome = 5 + 0.8 * baseline + 2.0 * (group == "treatment") + noise
+    df = pd.DataFrame(
+        {
+            "group": group,
+            "baseline": baseline,
+            "outcome": outcome,
+            "platform": rng.choice(["android", "ios", "web"], n),
+        }
+    )
+    df.loc[[3, 50], "baseline"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("cov_type", COV_TYPES)
+def test_ancova_matches_statsmodels(cov_type):
+    df = _regression_data()
+    result = ancova(df, "outcome", "baseline", cov_type=cov_type)
+    data = df.assign(treatment=(df["group"] == "treatment").astype(int))
+    model = smf.ols("outcome ~ treatment + baseline", data=data).fit(
+        cov_type=cov_type, use_t=True
+    )
+    assert result["coefficient"] == pytest.approx(model.params["treatment"])
+    assert result["std_error"] == pytest.approx(model.bse["treatment"])
+    assert result["p_value"] == pytest.approx(model.pvalues["treatment"])
+    assert result["ci_95"] == pytest.approx(model.conf_int().loc["treatment"].tolist())
+    assert result["r_squared"] == pytest.approx(model.rsquared)
+
+
+def test_ols_regression_encodes_categories_and_skips_summary():
+    df = _regression_data()
+    result = ols_regression(df, "outcome", ["baseline", "platform"], cov_type="HC1")
+    assert "summary" not in result
+    data = df.assign(treatment=(df["group"] == "treatment").astype(int))
+    model = smf.ols("outcome ~ treatment + baseline + platform", data=data).fit(
+        cov_type="HC1", use_t=True
+    )
+    assert set(result["coefficients"]) == set(model.params.index)
+    for name, value in model.params.items():
+        assert result["coefficients"][name] == pytest.approx(value)
+        assert result["std_errors"][name] == pytest.approx(model.bse[name])
+    assert result["adj_r_squared"] == pytest.approx(model.rsquared_adj)
+
+    with_summary = ols_regression(df, "outcome", ["baseline"], summary=True)
+    assert "OLS Regression Results" in with_summary["summary"]
+
+
+def test_ols_fit_rejects_rank_deficient_design():
+    x = np.arange(10.0)
+    with pytest.raises(ValueError, match="rank deficient"):
+        ols_fit(np.column_stack([np.ones(10), x, 2 * x]), x)
+    with pytest.raises(ValueError, match="cov_type"):
+        ols_fit(np.column_stack([np.ones(10), x]), x, cov_type="HC4")
+
+
+@pytest.mark.parametrize("cov_type", StreamingOLS.COV_TYPES)
+def test_streaming_ancova_matches_in_memory(cov_type):
+    df = _regression_data()
+    chunks = [df.iloc[start : start + 128] for start in range(0, len(df), 128)]
+    streamed = streaming_ancova(chunks, "outcome", "baseline", cov_type=cov_type)
+    in_memory = ancova(df, "outcome", "baseline", cov_type=cov_type)
+    assert streamed.keys() == in_memory.keys()
+    for key in ("coefficient", "std_error", "p_value", "r_squared"):
+        assert streamed[key] == pytest.approx(in_memory[key], rel=1e-9)
+    assert streamed["ci_95"] == pytest.approx(in_memory["ci_95"], rel=1e-9)
+
+
+@pytest.mark.parametrize("cov_type", ["nonrobust", "HC1"])
+def test_streaming_ancova_handles_large_offsets(cov_type):
+    rng = np.random.default_rng(5)
+    n = 200_000
+    baseline = 1e6 + rng.normal(0, 100, n)
+    group = np.where(rng.random(n) < 0.5, "control", "treatment")
+    outcome = baseline + 0.02 * (group == "treatment") + rng.normal(size=n)
+    df = pd.DataFrame({"group": group, "baseline": baseline, "outcome": outcome})
+    chunks = [df.iloc[start : start + 30_000] for start in range(0, n, 30_000)]
+    streamed = streaming_ancova(chunks, "outcome", "baseline", cov_type=cov_type)
+    in_memory = ancova(df, "outcome", "baseline", cov_type=cov_type)
+    assert streamed["std_error"] == pytest.approx(in_memory["std_error"], rel=1e-9)
+    assert streamed["coefficient"] == pytest.approx(
+        in_memory["coefficient"], abs=1e-6 * in_memory["std_error"]
+    )
+
+
+def test_streaming_ols_merges_partial_accumulators():
+    df = _regression_data()
+    first, second = df.iloc[:250], df.iloc[250:]
+    merged = StreamingOLS("outcome", ["baseline"]).update(first)
+    merged.merge(StreamingOLS("outcome", ["baseline"]).update(second))
+    whole = StreamingOLS("outcome", ["baseline"]).update(df)
+    np.testing.assert_allclose(merged.fit("HC1")["cov"], whole.fit("HC1")["cov"])
+    assert merged.n == whole.n == len(df) - 2
+
+    with pytest.raises(ValueError, match="different settings"):
+        merged.merge(StreamingOLS("outcome", ["baseline"], robust=False))
+    with pytest.raises(ValueError, match="cov_type"):
+        whole.fit("HC3")
+    with pytest.raises(ValueError, match="numeric predictors"):
+        StreamingOLS("outcome", ["platform"]).update(df)
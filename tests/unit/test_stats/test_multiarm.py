@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from liftlens.stats.inference import welch_ttest
+from liftlens.stats.multiarm import multi_arm_test
+
+
+def _three_arm_data() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    n = 600
+    return pd.DataFrame(
+        {
+            "group": np.repeat(["control", "b", "c"], n),
+            "outcome": np.concatenate(
+                [rng.normal(100, 15, n), rng.normal(100, 15, n), rng.normal(106, 15, n)]
+            ),
+        }
+    )
+
+
+def test_multi_arm_matches_pairwise_welch():
+    df = _three_arm_data()
+    result = multi_arm_test(df, "outcome", correction="none")
+    by_arm = {c["arm"]: c for c in result["comparisons"]}
+    assert set(by_arm) == {"b", "c"}
+    pairwise = welch_ttest(df, "outcome", control_label="control", treatment_label="c")
+    assert np.isclose(by_arm["c"]["p_value"], pairwise["p_value"])
+    assert np.allclose(by_arm["c"]["ci_95"], pairwise["ci_95"])
+
+
+def test_multi_arm_correction():
+    df = _three_arm_data()
+    result = multi_arm_test(
+        df, "outcome", treatment_labels=["b", "c"], correction="bonferroni"
+    )
+    for comparison in result["comparisons"]:
+        assert np.isclose(
+            comparison["p_value_adjusted"], min(1.0, 2 * comparison["p_value"])
+        )
+    assert [c["significant"] for c in result["comparisons"]] == [False, True]
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from liftlens.core.registry import ExperimentRegistry
+from liftlens.stats.online_fdr import (
+    AlphaInvesting,
+    LordPlusPlus,
+    Saffron,
+    lord_gamma,
+    saffron_gamma,
+)
+
+
+def _stream(n: int = 400, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    non_null = rng.random(n) < 0.2
+    return np.where(non_null, 2e-6 * rng.random(n), rng.random(n)), non_null
+
+
+def test_spending_sequences_never_exceed_one():
+    j = np.arange(1, 2_000_000)
+    gamma = lord_gamma(j)
+    assert np.all(np.diff(gamma[1:]) < 0)
+    assert gamma.sum() < 1.0
+    assert saffron_gamma(j).sum() == pytest.approx(1.0, abs=1e-3)
+
+
+def test_lord_levels_follow_rejection_times(tmp_path):
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    lord = LordPlusPlus("stream", alpha=0.05, registry=registry)
+    assert lord.level() == pytest.approx(0.005 * lord_gamma(1))
+    lord.test(1e-9)
+    lord.test(0.9)
+    lord.test(1e-9)
+    expected = (
+        0.005 * lord_gamma(4) + 0.045 * lord_gamma(4 - 1) + 0.05 * lord_gamma(4 - 3)
+    )
+    assert lord.rejections == [1, 3]
+    assert lord.level() == pytest.approx(float(expected))
+
+
+@pytest.mark.parametrize("procedure", [LordPlusPlus, Saffron, AlphaInvesting])
+def test_online_fdr_resumes_from_registry(tmp_path, procedure):
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    p_values, _ = _stream(60)
+    continuous = procedure("continuous", registry=registry)
+    expected = [continuous.test(p)["level"] for p in p_values]
+
+    levels = []
+    for p in p_values:
+        resumed = procedure.load("resumed", registry=registry) or procedure(
+            "resumed", registry=registry
+        )
+        levels.append(resumed.test(p)["level"])
+    assert levels == pytest.approx(expected)
+    assert registry.list_states(procedure.KIND)
+
+
+@pytest.mark.parametrize("procedure", [LordPlusPlus, Saffron, AlphaInvesting])
+def test_online_fdr_controls_false_discoveries(tmp_path, procedure):
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    fdp = []
+    for seed in range(10):
+        p_values, non_null = _stream(200, seed=seed)
+        stream = procedure(f"run-{seed}", registry=registry)
+        rejected = np.array([stream.test(p)["rejected"] for p in p_values])
+        assert rejected[non_null].mean() > 0.5
+        fdp.append((rejected & ~non_null).sum() / max(rejected.sum(), 1))
+    # Averaged over 200 streams the FDR is below alpha; 10 give a noisy check
+    assert np.mean(fdp) <= 0.1
+
+
+def test_alpha_investing_wealth_stays_positive(tmp_path):
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    investing = AlphaInvesting("nulls", registry=registry)
+    for p in np.random.default_rng(1).random(500):
+        investing.test(p)
+    assert investing.wealth > 0
+    assert investing.level() < 1e-3
+
+
+def test_online_fdr_validates_inputs(tmp_path):
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    with pytest.raises(ValueError, match="w0"):
+        Saffron("s", alpha=0.05, w0=0.04, registry=registry)
+    with pytest.raises(ValueError, match="p_value"):
+        LordPlusPlus("l", registry=registry).test(1.5)
+    LordPlusPlus("kind", registry=registry).test(0.5)
+    with pytest.raises(ValueError, match="lord_pp"):
+        Saffron.load("kind", registry=registry)
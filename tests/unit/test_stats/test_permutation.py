@@ -0,0 +1,48 @@
+import numpy as np
+
+from liftlens.stats.inference import permutation_test
+from liftlens.stats.permutation import permutation_distribution
+
+
+def test_permutation_test_leaves_input_untouched(sample_data):
+    before = sample_data.copy()
+    result = permutation_test(sample_data, "outcome", n_perm=2_000, seed=0)
+    assert sample_data.equals(before)
+    assert result["significant"]
+    # Clearly significant: early stopping needs far fewer than n_perm
+    assert result["n_perm"] < 2_000
+
+
+def test_permutation_distribution_reproducible_across_jobs():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(200, 3))
+    treated = np.arange(200) < 80
+    obs, serial = permutation_distribution(
+        values, treated, n_perm=300, chunk_size=64, seed=5
+    )
+    _, parallel = permutation_distribution(
+        values, treated, n_perm=300, chunk_size=64, seed=5, n_jobs=2
+    )
+    assert serial.shape == (300, 3)
+    np.testing.assert_allclose(serial, parallel)
+    np.testing.assert_allclose(serial.mean(axis=0), 0, atol=0.1)
+
+
+def test_permutation_rounds_feed_every_worker(monkeypatch):
+    from liftlens.stats import permutation
+
+    dispatched: list[int] = []
+
+    def spy(func, items, n_jobs=1):
+        dispatched.append(len(items))
+        return [func(item) for item in items]
+
+    monkeypatch.setattr(permutation, "map_batches", spy)
+    rng = np.random.default_rng(0)
+    values, treated = rng.normal(size=1_000), np.arange(1_000) < 500
+    permutation_distribution(values, treated, n_perm=4_000, n_jobs=4)
+    assert dispatched == [8]
+
+    dispatched.clear()
+    permutation_distribution(values, treated, n_perm=4_000, n_jobs=4, alpha=1e-9)
+    assert dispatched[0] == 4
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from liftlens.stats.power import (
+    analytical_power,
+    power_grid,
+    sample_size_for_power,
+    sample_size_grid,
+    simulation_power,
+    simulation_power_batch,
+)
+
+
+def test_simulation_power_restores_global_rng(sample_data):
+    def legacy(n_per_group, effect_size):
+        return sample_data.sample(2 * n_per_group)
+
+    np.random.seed(123)
+    expected = np.random.random_sample()
+    np.random.seed(123)
+    simulation_power(legacy, 0.5, 50, n_sim=3, seed=1)
+    assert np.random.random_sample() == expected
+
+
+def test_simulation_power_batch_matches_analytical():
+    result = simulation_power_batch(0.3, 100, n_sim=4_000, seed=0)
+    expected = analytical_power(0.3, 100)
+    assert result["power"] == pytest.approx(expected, abs=4 * result["mc_std_error"])
+    parallel = simulation_power_batch(0.3, 100, n_sim=4_000, seed=0, n_jobs=2)
+    assert parallel["power"] == result["power"]
+
+
+def test_simulation_power_batch_dispatches_all_batches(monkeypatch):
+    from liftlens.stats import power
+
+    dispatched: list[int] = []
+
+    def spy(func, items, n_jobs=1):
+        dispatched.append(len(items))
+        return [func(item) for item in items]
+
+    monkeypatch.setattr(power, "map_batches", spy)
+    simulation_power_batch(0.3, 100, n_sim=4_000, seed=0, n_jobs=4)
+    assert dispatched == [4]
+    with pytest.raises(ValueError, match="n_sim"):
+        simulation_power_batch(0.3, 100, n_sim=0)
+
+
+def test_simulation_power_batch_stops_at_target_se():
+    result = simulation_power_batch(0.5, 50, n_sim=100_000, seed=1, target_se=0.01)
+    assert result["n_sim"] < 100_000
+    assert result["mc_std_error"] < 0.01
+
+
+def test_sample_size_grid_is_minimal_and_broadcasts():
+    grid = sample_size_grid([[0.2], [0.5]], power=[0.8, 0.9], ratio=1.0)
+    assert grid.shape == (2, 2)
+    assert grid[0, 0] == sample_size_for_power(0.2, power=0.8)
+    for d, p, n in [(0.2, 0.8, grid[0, 0]), (0.5, 0.9, grid[1, 1])]:
+        assert analytical_power(d, int(n)) >= p > analytical_power(d, int(n) - 1)
+    powers = power_grid(0.3, np.array([50, 100, 200]))
+    assert np.all(np.diff(powers) > 0)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"effect_size": np.nan},
+        {"effect_size": np.inf},
+        {"effect_size": 0.0},
+        {"effect_size": 0.3, "power": 1.0},
+        {"effect_size": 0.3, "alpha": 0.0},
+    ],
+)
+def test_sample_size_grid_rejects_invalid_inputs(kwargs):
+    with pytest.raises(ValueError):
+        sample_size_grid(**kwargs)
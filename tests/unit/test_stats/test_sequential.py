@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from liftlens.core.registry import ExperimentRegistry
+from liftlens.stats.inference import welch_ttest
+from liftlens.stats.sequential import (
+    ConfidenceSequence,
+    SequentialMonitor,
+    SequentialTest,
+    lan_demets_boundaries,
+)
+from liftlens.stats.summary import arm_statistics
+
+
+def test_monitor_matches_full_data_and_resumes(tmp_path: Path, sample_data) -> None:
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    monitor = SequentialMonitor("exp-1", max_n=2 * len(sample_data), registry=registry)
+    for batch in np.array_split(sample_data, 4):
+        monitor.update(batch, "outcome")
+    first = monitor.look()
+
+    full = welch_ttest(sample_data, "outcome")
+    assert first["z_score"] == pytest.approx(full["t_statistic"])
+    assert first["look_time"] == pytest.approx(0.5)
+
+    resumed = SequentialMonitor.load("exp-1", registry=registry)
+    assert resumed is not None
+    np.testing.assert_allclose(resumed.moments, monitor.moments)
+    assert resumed.test.z_scores == [first["z_score"]]
+    assert SequentialMonitor.load("exp-2", registry=registry) is None
+
+
+def test_lan_demets_boundaries_spend_alpha() -> None:
+    looks = np.linspace(0.2, 1.0, 5)
+    # Published Pocock-type boundaries for five equally spaced looks
+    pocock = lan_demets_boundaries(looks, 0.05, spending="pocock")
+    np.testing.assert_allclose(pocock, [2.438, 2.427, 2.410, 2.397, 2.386], atol=2e-3)
+
+    obf = lan_demets_boundaries(looks, 0.05)
+    assert obf[0] == pytest.approx(4.3826, abs=1e-3)
+    # Overall type I error of the whole schedule under H0
+    rng = np.random.default_rng(0)
+    paths = np.cumsum(rng.normal(scale=np.sqrt(0.2), size=(200_000, 5)), axis=1)
+    crossed = (np.abs(paths / np.sqrt(looks)) >= obf).any(axis=1)
+    assert crossed.mean() == pytest.approx(0.05, abs=0.003)
+
+    test = SequentialTest("ld_obf")
+    assert test.add_interim(1.0, 0.2)["boundary"] == pytest.approx(obf[0])
+    with pytest.raises(ValueError):
+        lan_demets_boundaries([0.5, 0.4])
+
+
+def test_lan_demets_repeated_final_look(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "group": np.tile(["control", "treatment"], 200),
+            "outcome": rng.normal(size=400),
+        }
+    )
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    monitor = SequentialMonitor("exp-1", max_n=200, method="ld_obf", registry=registry)
+    monitor.update(data.iloc[:100], "outcome")
+    monitor.look()
+    monitor.update(data.iloc[100:], "outcome")
+    # Both looks are past max_n, so the fraction is clamped to 1.0 twice
+    final = monitor.look()
+    again = monitor.look()
+    assert final["look_time"] == again["look_time"] == 1.0
+    assert again["boundary"] == final["boundary"]
+    assert monitor.test.look_times == [0.5, 1.0, 1.0]
+
+    test = SequentialTest("ld_obf")
+    test.add_interim(0.5, 0.5)
+    with pytest.raises(ValueError):
+        test.add_interim(0.5, 0.4)
+    with pytest.raises(ValueError):
+        test.add_interim(0.5, 1.2)
+    assert test.look_times == [0.5]
+    assert test.add_interim(0.5, 1.0)["boundary"] == pytest.approx(
+        lan_demets_boundaries([0.5, 1.0])[-1]
+    )
+
+
+def test_confidence_sequence_from_batches_and_moments(
+    tmp_path: Path, sample_data
+) -> None:
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    rows = ConfidenceSequence("rows", registry=registry)
+    moments = ConfidenceSequence("moments", registry=registry)
+    shuffled = sample_data.sample(frac=1, random_state=0)
+    for batch in np.array_split(shuffled, 5):
+        rows.update(batch, "outcome")
+        arms = arm_statistics(batch, "outcome")
+        moments.update_stats(arms.loc["control"], arms.loc["treatment"])
+
+    result = rows.result()
+    assert result["ci_95"] == pytest.approx(moments.result()["ci_95"])
+    full = welch_ttest(sample_data, "outcome")
+    assert result["estimate"] == pytest.approx(full["mean_diff"])
+    # Wider than the fixed-horizon interval, but still detects the effect
+    assert result["ci_95"][0] < full["ci_95"][0] < full["ci_95"][1] < result["ci_95"][1]
+    assert result["significant"] and result["p_value"] >= full["p_value"]
+
+    resumed = ConfidenceSequence.load("rows", registry=registry)
+    assert resumed is not None
+    assert resumed.result()["ci_95"] == result["ci_95"]
+    assert len(registry.list_states("confidence_sequence")) == 2
+
+
+def test_confidence_sequence_narrows_with_data(tmp_path: Path) -> None:
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    monitor = ConfidenceSequence("narrowing", registry=registry)
+    widths, p_values, seen = [], [], 0
+    # Unit variance and a modest effect of 0.05, up to 10^6 users per arm
+    for total in (100, 10_000, 1_000_000):
+        n = total - seen
+        monitor.update_stats(
+            {"n": n, "mean": 0.0, "var": 1.0}, {"n": n, "mean": 0.05, "var": 1.0}
+        )
+        seen = total
+        result = monitor.result()
+        widths.append(result["ci_95"][1] - result["ci_95"][0])
+        p_values.append(result["p_value"])
+
+    # 100x the data: about 10x narrower, less a slowly growing log factor
+    assert 5 < widths[1] / widths[2] < 10
+    assert widths[0] / widths[1] > 5
+    # z = 3.5 at 10^4 per arm: significant despite the always-valid penalty
+    assert p_values[0] > 0.05 > p_values[1] > p_values[2]
+    assert p_values[2] < 1e-10
+    lower, upper = monitor.result()["ci_95"]
+    assert 0 < lower < 0.05 < upper
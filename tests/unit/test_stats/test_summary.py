@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from liftlens.data.transform import apply_cuped
+from liftlens.stats.inference import welch_ttest
+from liftlens.stats.summary import (
+    arm_statistics,
+    cuped_from_stats,
+    proportions_from_stats,
+    student_from_stats,
+)
+
+
+def test_summary_tests_match_raw_data(sample_data):
+    arms = arm_statistics(sample_data, "outcome")
+    control, treatment = arms.loc["control"], arms.loc["treatment"]
+    raw = sample_data.groupby("group")["outcome"]
+    student = student_from_stats(control, treatment)
+    expected = stats.ttest_ind(raw.get_group("treatment"), raw.get_group("control"))
+    assert student["p_value"] == pytest.approx(expected.pvalue)
+    assert welch_ttest(sample_data, "outcome")["n_control"] == control["n"]
+
+    rates = {"n": 1000, "mean": 0.2}
+    result = proportions_from_stats(rates, {"n": 1000, "mean": 0.25})
+    assert result["significant"]
+    assert set(result) >= {"p_value", "mean_diff", "ci_95", "n_control"}
+
+
+def test_cuped_from_stats_reduces_standard_error(sample_data):
+    def moments(label: str) -> dict[str, float]:
+        arm = sample_data[sample_data["group"] == label]
+        cov = np.cov(arm["outcome"], arm["baseline"])
+        return {
+            "n": len(arm),
+            "mean": arm["outcome"].mean(),
+            "var": cov[0, 0],
+            "mean_x": arm["baseline"].mean(),
+            "var_x": cov[1, 1],
+            "cov_xy": cov[0, 1],
+        }
+
+    adjusted = cuped_from_stats(moments("control"), moments("treatment"))
+    raw = welch_ttest(sample_data, "outcome")
+    assert adjusted["std_error"] <= raw["std_error"]
+
+    cuped = apply_cuped(sample_data.copy(), "outcome", "baseline")
+    expected = welch_ttest(cuped, "outcome_cuped")
+    assert adjusted["mean_diff"] == pytest.approx(expected["mean_diff"])
+    assert adjusted["std_error"] == pytest.approx(expected["std_error"])
+    assert adjusted["p_value"] == pytest.approx(expected["p_value"])
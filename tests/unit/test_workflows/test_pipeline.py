@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
+
 from liftlens.config.schemas import DataSource, ExperimentConfig, MetricSpec
+from liftlens.data.io import save_data
 from liftlens.workflows.pipeline import run_pipeline
 
 
@@ -33,3 +36,28 @@ def test_pipeline_end_to_end(tmp_path: Path, sample_data_path: Path) -> None:
 
     html = report_path.read_text()
     assert "8." in html or "7." in html  # effect size ~8
+
+
+def test_pipeline_multi_arm(tmp_path: Path, sample_data) -> None:
+    """A/B/C test: every arm is compared against control."""
+    df = sample_data.copy()
+    df["group"] = np.resize(["control", "treatment", "variant_b"], len(df))
+    data_path = tmp_path / "multi_arm.csv"
+    save_data(df, data_path)
+
+    config = ExperimentConfig(
+        name="multi_arm_test",
+        data=DataSource(type="csv", path=str(data_path)),
+        baseline_col="baseline",
+        outcome_col="outcome",
+        group_col="group",
+        treatment_labels=["treatment", "variant_b"],
+        metrics=[MetricSpec(name="mean", type="primary", func="mean_diff")],
+    )
+    assert config.arms == ["control", "treatment", "variant_b"]
+
+    run_pipeline(config, output_dir=tmp_path)
+
+    run_dirs = list(tmp_path.glob("run_*"))
+    assert len(run_dirs) == 1
+    assert (run_dirs[0] / "report.html").exists()
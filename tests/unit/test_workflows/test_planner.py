@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from liftlens.core.registry import ExperimentRegistry
+from liftlens.stats.power import sample_size_for_power
+from liftlens.workflows.planner import (
+    metric_history,
+    plan_experiments,
+    record_metric_stats,
+)
+
+
+def test_plan_from_registry_history(tmp_path: Path, sample_data) -> None:
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    for _ in range(2):
+        run_id = registry.start_run("history", {})
+        record_metric_stats(
+            run_id,
+            sample_data,
+            ["outcome"],
+            covariate_col="baseline",
+            days=7,
+            registry=registry,
+        )
+
+    history = metric_history(registry=registry)
+    assert history.loc["outcome", "runs"] == 2
+    assert history.loc["outcome", "n"] == 2 * (sample_data["group"] == "control").sum()
+
+    plain = plan_experiments(2.0, cuped=False, registry=registry).loc["outcome"]
+    adjusted = plan_experiments(2.0, registry=registry).loc["outcome"]
+    assert plain["n_control"] == sample_size_for_power(plain["effect_size"])
+    assert adjusted["n_control"] <= plain["n_control"]
+    assert plain["days"] > 0
+
+
+def test_plan_rejects_missing_inputs(tmp_path: Path, sample_data) -> None:
+    registry = ExperimentRegistry(tmp_path / "registry.sqlite")
+    run_id = registry.start_run("history", {})
+    record_metric_stats(run_id, sample_data, ["outcome"], registry=registry)
+
+    with pytest.raises(ValueError, match="revenue"):
+        plan_experiments(2.0, metrics=["outcome", "revenue"], registry=registry)
+    with pytest.raises(ValueError, match="outcome"):
+        plan_experiments({"revenue": 2.0}, registry=registry)
+
+    # No recorded run length: sizes are planned, days need daily_users
+    plan = plan_experiments(2.0, registry=registry).loc["outcome"]
+    assert plan["n_control"] > 0
+    assert pd.isna(plan["days"])
+    plan = plan_experiments(2.0, daily_users=100, registry=registry)
+    assert plan.loc["outcome", "days"] > 0